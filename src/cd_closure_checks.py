@@ -109,16 +109,16 @@ def run_cd_mandato_closure_checks(*, start_date: str | None, end_date: str | Non
             """,
             (start_iso, start_iso, end_iso, end_iso),
         )
-        meetings = [dict(r) for r in rows]
-        stats["meetings_in_period"] = len(meetings)
-        for m in meetings:
-            meeting_id = str(m.get("id") or "")
-            mdate = str(m.get("data") or "")
-            num = str(m.get("numero_cd") or "")
-            title = str(m.get("titolo") or "").strip()
+        # Read-only pass: index the sqlite3.Row objects directly (every column is selected)
+        stats["meetings_in_period"] = len(rows)
+        for m in rows:
+            meeting_id = str(m["id"] or "")
+            mdate = str(m["data"] or "")
+            num = str(m["numero_cd"] or "")
+            title = str(m["titolo"] or "").strip()
             ref = f"Riunione #{meeting_id} {num} {mdate} {title}".strip()
 
-            verbale_path = str(m.get("verbale_path") or "").strip()
+            verbale_path = str(m["verbale_path"] or "").strip()
             if not verbale_path:
                 errors.append(CdClosureIssue("missing_meeting_verbale", ref, "Verbale non associato (campo verbale_path vuoto)."))
                 continue
@@ -187,18 +187,17 @@ def run_cd_mandato_closure_checks(*, start_date: str | None, end_date: str | Non
         """
 
         rows = fetch_all(sql, (start_iso, start_iso, end_iso, end_iso))
-        delibere = [dict(r) for r in rows]
-        stats["delibere_in_period"] = len(delibere)
-
-        for d in delibere:
-            did = str(d.get("id") or "")
-            cd_id = str(d.get("cd_id") or "")
-            numero = str(d.get("numero") or "").strip()
-            oggetto = str(d.get("oggetto") or "").strip()
-            esito = str(d.get("esito") or "").strip()
-            dv = str(d.get("data_votazione") or "").strip()
-            allegato = str(d.get("allegato_path") or "").strip()
-            data_riunione = str(d.get("data_riunione") or "").strip()
+        stats["delibere_in_period"] = len(rows)
+
+        for d in rows:
+            did = str(d["id"] or "")
+            cd_id = str(d["cd_id"] or "")
+            numero = str(d["numero"] or "").strip()
+            oggetto = str(d["oggetto"] or "").strip()
+            esito = str(d["esito"] or "").strip()
+            dv = str(d["data_votazione"] or "").strip()
+            allegato = str(d["allegato_path"] or "").strip()
+            data_riunione = str(d["data_riunione"] or "").strip()
 
             ref_date = dv or (data_riunione and f"(riunione {data_riunione})") or ""
             ref = f"Delibera #{did} (CD {cd_id}) {numero} {ref_date} {oggetto}".strip()
@@ -9,23 +9,12 @@ import sqlite3
 import csv
 import os
 
-# Leggi nominativi dal file CSV ufficiale ARI
-nominativi_ari = set()
 csv_path = 'CVS/soci_merged_import.csv'
 
 if not os.path.exists(csv_path):
     print(f"Errore: File {csv_path} non trovato")
     exit(1)
 
-with open(csv_path, 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if row['nominativo'].strip():
-            nominativi_ari.add(row['nominativo'].strip().upper())
-
-print(f'Nominativi nel file ARI ufficiale: {len(nominativi_ari)}')
-
-# Leggi nominativi dal database esistente
 db_path = 'data/soci.db'
 if not os.path.exists(db_path):
     print(f"Errore: Database {db_path} non trovato")
@@ -35,27 +24,48 @@ conn = sqlite3.connect(db_path)
 conn.row_factory = sqlite3.Row
 cursor = conn.cursor()
 
-cursor.execute("""
-    SELECT id, nominativo, nome, cognome, attivo 
-    FROM soci 
+
+def _norm_nominativo(value):
+    # Same normalization as the CSV side (str.strip/str.upper): SQLite TRIM
+    # only strips spaces and UPPER only folds ASCII.
+    return str(value).strip().upper() if value is not None else ''
+
+
+conn.create_function('norm_nominativo', 1, _norm_nominativo, deterministic=True)
+
+# Carica i nominativi del file CSV ufficiale ARI in una tabella temporanea:
+# il confronto con il database viene poi eseguito da SQLite (anti-join).
+cursor.execute("CREATE TEMP TABLE nominativi_ari(nominativo TEXT PRIMARY KEY)")
+with open(csv_path, 'r', encoding='utf-8') as f:
+    reader = csv.DictReader(f)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO nominativi_ari(nominativo) VALUES (?)",
+        ((nom,) for nom in (_norm_nominativo(row['nominativo']) for row in reader) if nom),
+    )
+
+totale_ari = cursor.execute("SELECT COUNT(*) FROM nominativi_ari").fetchone()[0]
+print(f'Nominativi nel file ARI ufficiale: {totale_ari}')
+
+totale_db = cursor.execute("""
+    SELECT COUNT(*)
+    FROM soci
     WHERE nominativo IS NOT NULL AND nominativo != ''
-""")
-soci_db = cursor.fetchall()
+""").fetchone()[0]
 
-print(f'Soci nel database con nominativo: {len(soci_db)}')
+print(f'Soci nel database con nominativo: {totale_db}')
 
 # Trova soci nel DB ma NON nel file ARI
-soci_non_in_ari = []
-for socio in soci_db:
-    nom = socio['nominativo'].strip().upper()
-    if nom and nom not in nominativi_ari:
-        soci_non_in_ari.append({
-            'id': socio['id'],
-            'nominativo': socio['nominativo'],
-            'nome': socio['nome'] or '',
-            'cognome': socio['cognome'] or '',
-            'attivo': socio['attivo']
-        })
+cursor.execute("""
+    SELECT s.id, s.nominativo, COALESCE(s.nome, '') AS nome,
+           COALESCE(s.cognome, '') AS cognome, s.attivo
+    FROM soci s
+    WHERE norm_nominativo(s.nominativo) != ''
+      AND NOT EXISTS (
+          SELECT 1 FROM nominativi_ari a WHERE a.nominativo = norm_nominativo(s.nominativo)
+      )
+    ORDER BY s.id
+""")
+soci_non_in_ari = cursor.fetchall()
 
 conn.close()
 
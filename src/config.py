@@ -6,6 +6,7 @@ Configuration and constants for GLR - Gestione Locale Radioamatori
 import os
 import sys
 from datetime import datetime
+from functools import lru_cache
 
 # --------------------------
 # Versione / Build
@@ -15,6 +16,7 @@ APP_VERSION = "0.4.6g"
 __version__ = APP_VERSION
 AUTHOR = "Michele Martino - IU2GLR"
 
+@lru_cache(maxsize=None)
 def _calc_build_from_file() -> tuple[str, str]:
     """Calculate build ID and date from file modification time."""
     try:
@@ -26,7 +28,13 @@ def _calc_build_from_file() -> tuple[str, str]:
         now = datetime.now()
         return now.strftime("%Y%m%d.%H%M"), now.strftime("%Y-%m-%d %H:%M")
 
-BUILD_ID, BUILD_DATE = _calc_build_from_file()
+def __getattr__(name: str):
+    # BUILD_ID / BUILD_DATE are computed on first access, not at import time
+    if name == "BUILD_ID":
+        return _calc_build_from_file()[0]
+    if name == "BUILD_DATE":
+        return _calc_build_from_file()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --------------------------
 # Base directories
@@ -48,9 +56,15 @@ TRASH_DIR = os.path.join(DATA_DIR, ".trash")
 SEC_DOCS = os.path.join(DATA_DIR, "section_docs")
 LOG_DIR = os.path.join(DATA_DIR, "logs")
 
+def _ensure_directories(paths) -> None:
+    """Create the given directories, skipping the ones already on disk."""
+    for p in paths:
+        # A normal start only pays a cheap isdir probe per directory
+        if not os.path.isdir(p):
+            os.makedirs(p, exist_ok=True)
+
 # Create directories if they don't exist
-for p in (DATA_DIR, BACKUP_DIR, DOCS_BASE, TRASH_DIR, SEC_DOCS, LOG_DIR):
-    os.makedirs(p, exist_ok=True)
+_ensure_directories((DATA_DIR, BACKUP_DIR, DOCS_BASE, TRASH_DIR, SEC_DOCS, LOG_DIR))
 
 # --------------------------
 # File paths
@@ -112,11 +126,16 @@ DEFAULT_CONFIG = {
 }
 
 
+@lru_cache(maxsize=None)
 def _resolve_dir(value: str) -> str:
-    """Expand/normalize a directory path."""
+    """Expand/normalize a directory path (memoized per configured string)."""
     return os.path.abspath(os.path.expanduser(os.path.expandvars(value)))
 
 
+# Backup directories already created in this process
+_prepared_backup_dirs: set[str] = set()
+
+
 def get_backup_dir() -> str:
     """Return the configured local backup directory.
 
@@ -134,10 +153,13 @@ def get_backup_dir() -> str:
         configured = ""
 
     path = _resolve_dir(configured) if configured else BACKUP_DIR
+    if path in _prepared_backup_dirs and os.path.isdir(path):
+        return path
     try:
         os.makedirs(path, exist_ok=True)
     except Exception:
         # Fallback to default if the configured path is invalid/unwritable.
         path = BACKUP_DIR
         os.makedirs(path, exist_ok=True)
+    _prepared_backup_dirs.add(path)
     return path
@@ -38,6 +38,35 @@ def load_config() -> dict:
         logger.warning("Failed to load config: %s", e)
         return _default_config.copy() if _default_config else {}
 
+# Read-only config snapshot reused while the file mtime is unchanged
+_config_cache: dict = {"path": None, "mtime": None, "data": None}
+
+
+def load_config_cached() -> dict:
+    """Return the configuration, reloading only when the file has changed.
+
+    The returned dict is shared: callers must not modify it (use load_config()
+    to get a private copy to edit and save).
+    """
+    if _config_json is None:
+        raise RuntimeError("Config paths not set. Call set_config_paths() first.")
+    try:
+        mtime = os.stat(_config_json).st_mtime_ns
+    except OSError:
+        mtime = None
+    cache = _config_cache
+    if cache["data"] is not None and cache["path"] == _config_json and cache["mtime"] == mtime:
+        return cache["data"]
+    data = load_config()
+    cache.update(path=_config_json, mtime=mtime, data=data)
+    return data
+
+
+def invalidate_config_cache():
+    """Drop the snapshot returned by load_config_cached()."""
+    _config_cache.update(path=None, mtime=None, data=None)
+
+
 def save_config(cfg: dict):
     """Save configuration to JSON file."""
     if _config_json is None:
@@ -45,6 +74,7 @@ def save_config(cfg: dict):
     os.makedirs(os.path.dirname(_config_json), exist_ok=True)
     with open(_config_json, "w", encoding="utf-8") as f:
         json.dump(cfg, f, ensure_ascii=False, indent=2)
+    invalidate_config_cache()
 
 def ensure_sec_category_dirs():
     """Ensure all section category directories exist."""
@@ -71,15 +71,21 @@ def set_presets_path(presets_json: str):
     global _presets_json
     _presets_json = presets_json
 
+def _sniff_sample(sample: str) -> str:
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
+        return dialect.delimiter or ";"
+    except Exception:
+        return ";"
+
 def sniff_delimiter(path: str) -> str:
     """Auto-detect CSV delimiter (;, , or tab)."""
     try:
         with open(path, "r", encoding="utf-8-sig") as f:
             sample = f.read(4096)
-        dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
-        return dialect.delimiter or ";"
     except Exception:
         return ";"
+    return _sniff_sample(sample)
 
 def load_presets() -> Dict[str, Dict[str, str]]:
     """Load column mapping presets from JSON."""
@@ -118,20 +124,17 @@ def auto_detect_mapping(csv_headers: Iterable[str]) -> Dict[str, Optional[str]]:
         Dictionary mapping target fields to CSV column indices or None
     """
     mapping = {}
-    headers_lower = {h.lower().strip() for h in csv_headers}
+    # Normalize each header once; the first header wins on collisions
+    headers_by_key: Dict[str, str] = {}
+    for orig_header in csv_headers:
+        headers_by_key.setdefault(orig_header.lower().strip(), orig_header)
     
     for target_field, _ in TARGET_FIELDS:
-        patterns = AUTO_GUESS.get(target_field, set())
-        for pattern in patterns:
-            if pattern in headers_lower:
-                # Find original header
-                for orig_header in csv_headers:
-                    if orig_header.lower().strip() == pattern:
-                        mapping[target_field] = orig_header
-                        break
+        mapping[target_field] = None
+        for pattern in AUTO_GUESS.get(target_field, ()):
+            if pattern in headers_by_key:
+                mapping[target_field] = headers_by_key[pattern]
                 break
-        if target_field not in mapping:
-            mapping[target_field] = None
     
     return mapping
 
@@ -147,16 +150,31 @@ def read_csv_file(path: str, delimiter: str = None, encoding: str = "utf-8-sig")
     Returns:
         Tuple of (headers, rows)
     """
-    if delimiter is None:
-        delimiter = sniff_delimiter(path)
-    
     try:
         with open(path, "r", encoding=encoding) as f:
-            reader = csv.DictReader(f, delimiter=delimiter)
-            if reader.fieldnames is None:
+            # Sniff from the same handle instead of opening the file twice
+            if delimiter is None:
+                delimiter = _sniff_sample(f.read(4096))
+                f.seek(0)
+            reader = csv.reader(f, delimiter=delimiter)
+            headers = next(reader, None)
+            if headers is None:
                 return [], []
-            headers = list(reader.fieldnames)
-            rows = list(reader)
+            # Same dicts as csv.DictReader (blank lines skipped, missing
+            # cells -> None, extra cells under the None key) without its
+            # per-row Python overhead.
+            width = len(headers)
+            rows = []
+            for values in reader:
+                if not values:
+                    continue
+                row = dict(zip(headers, values))
+                if len(values) > width:
+                    row[None] = values[width:]
+                elif len(values) < width:
+                    for key in headers[len(values):]:
+                        row[key] = None
+                rows.append(row)
         return headers, rows
     except Exception as e:
         logger.error("Failed to read CSV file: %s", e)
@@ -86,6 +86,29 @@ def fetch_all(sql: str, params=()):
     finally:
         conn.close()
 
+def fetch_all_dicts(sql: str, params=()) -> List[Dict]:
+    """
+    Execute query and return all results as plain dictionaries.
+    Rows are converted while iterating the cursor, without first
+    materializing the full list of sqlite3.Row objects.
+    
+    Raises:
+        DatabaseError: If query execution fails
+    """
+    conn = get_conn()
+    try:
+        result = [dict(row) for row in conn.execute(sql, params)]
+        conn.commit()
+        return result
+    except sqlite3.Error as e:
+        conn.rollback()
+        raise map_sqlite_exception(e)
+    except Exception as e:
+        conn.rollback()
+        raise DatabaseError(f"Query execution failed: {str(e)}", original_error=e)
+    finally:
+        conn.close()
+
 def fetch_one(sql: str, params=()):
     """
     Execute query and return first result.
@@ -434,12 +457,50 @@ CREATE TABLE IF NOT EXISTS magazzino_loans (
 )
 """
 
+# Keep magazzino_items.active_loan_id pointing at the item's open loan
+# (earliest by data_prestito, as list_items used to compute on every read).
+_MAGAZZINO_ACTIVE_LOAN_SQL = """
+    UPDATE magazzino_items
+       SET active_loan_id = (
+           SELECT ml.id FROM magazzino_loans ml
+            WHERE ml.item_id = magazzino_items.id AND ml.data_reso IS NULL
+            ORDER BY ml.data_prestito ASC, ml.id ASC
+            LIMIT 1
+       )
+"""
+
+CREATE_MAGAZZINO_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_magazzino_loans_ai
+    AFTER INSERT ON magazzino_loans
+    BEGIN
+        {_MAGAZZINO_ACTIVE_LOAN_SQL} WHERE id = NEW.item_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_magazzino_loans_au
+    AFTER UPDATE OF item_id, data_reso, data_prestito ON magazzino_loans
+    BEGIN
+        {_MAGAZZINO_ACTIVE_LOAN_SQL} WHERE id IN (OLD.item_id, NEW.item_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_magazzino_loans_ad
+    AFTER DELETE ON magazzino_loans
+    BEGIN
+        {_MAGAZZINO_ACTIVE_LOAN_SQL} WHERE id = OLD.item_id;
+    END
+    """,
+]
+
 CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_soci_attivo ON soci(attivo)",
     "CREATE INDEX IF NOT EXISTS idx_soci_deleted ON soci(deleted_at)",
     "CREATE INDEX IF NOT EXISTS idx_documenti_socio ON documenti(socio_id)",
     "CREATE INDEX IF NOT EXISTS idx_eventi_socio ON eventi_libro_soci(socio_id)",
     "CREATE UNIQUE INDEX IF NOT EXISTS ux_soci_matricola ON soci(matricola) WHERE matricola IS NOT NULL",
+    # Case-insensitive callsign lookup used by the import/update wizards
+    "CREATE INDEX IF NOT EXISTS idx_soci_nominativo_lower ON soci(LOWER(nominativo))",
     "CREATE INDEX IF NOT EXISTS idx_cd_delibere_cd ON cd_delibere(cd_id)",
     "CREATE INDEX IF NOT EXISTS idx_cd_verbali_cd ON cd_verbali(cd_id)",
     "CREATE INDEX IF NOT EXISTS idx_cd_riunioni_data ON cd_riunioni(data)",
@@ -448,6 +509,7 @@ CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_cd_mandati_periodo ON cd_mandati(start_date, end_date)",
     "CREATE INDEX IF NOT EXISTS idx_ponti_stato ON ponti(stato_corrente)",
     "CREATE INDEX IF NOT EXISTS idx_ponti_auth_scadenza ON ponti_authorizations(data_scadenza)",
+    "CREATE INDEX IF NOT EXISTS idx_ponti_auth_ponte_scadenza ON ponti_authorizations(ponte_id, data_scadenza)",
     "CREATE INDEX IF NOT EXISTS idx_ponti_interventi_data ON ponti_interventi(data)",
     "CREATE UNIQUE INDEX IF NOT EXISTS ux_section_documents_relative_path ON section_documents(relative_path) WHERE deleted_at IS NULL",
     "CREATE UNIQUE INDEX IF NOT EXISTS ux_section_documents_percorso ON section_documents(percorso) WHERE deleted_at IS NULL",
@@ -455,7 +517,9 @@ CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_section_documents_data ON section_documents(data_caricamento)",
     "CREATE UNIQUE INDEX IF NOT EXISTS idx_soci_ruoli_unique ON soci_ruoli(socio_id, ruolo)",
     "CREATE INDEX IF NOT EXISTS idx_magazzino_loans_item ON magazzino_loans(item_id)",
-    "CREATE INDEX IF NOT EXISTS idx_magazzino_loans_active ON magazzino_loans(item_id, data_reso)"
+    "CREATE INDEX IF NOT EXISTS idx_magazzino_loans_active ON magazzino_loans(item_id, data_reso)",
+    # At most one open loan per item (also serves the "already on loan" probe)
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_magazzino_loans_active_item ON magazzino_loans(item_id) WHERE data_reso IS NULL",
 ]
 
 
@@ -493,10 +557,33 @@ def _has_column(conn: sqlite3.Connection, table: str, col: str) -> bool:
     """Check if a column exists in a table."""
     return any(r["name"] == col for r in conn.execute(f"PRAGMA table_info({table})"))
 
-def _ensure_column(conn: sqlite3.Connection, table: str, col: str, decl: str):
-    """Add a column to a table if it doesn't exist."""
-    if not _has_column(conn, table, col):
+def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    """Return the set of column names of a table."""
+    return {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+def _ensure_column(
+    conn: sqlite3.Connection,
+    table: str,
+    col: str,
+    decl: str,
+    columns: Dict[str, set[str]] | None = None,
+):
+    """Add a column to a table if it doesn't exist.
+
+    When ``columns`` is given it is used as a per-table cache of the known
+    column names, so a sequence of checks on the same table reads
+    ``PRAGMA table_info`` only once.
+    """
+    if columns is None:
+        if not _has_column(conn, table, col):
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
+        return
+    known = columns.get(table)
+    if known is None:
+        known = columns[table] = _table_columns(conn, table)
+    if col not in known:
         conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
+        known.add(col)
 
 def init_db():
     """
@@ -504,12 +591,14 @@ def init_db():
     Ensures all schema elements are created and migrated properly.
     """
     with get_connection() as conn:
+        # Column names per table, read once and updated as columns are added
+        columns: Dict[str, set[str]] = {}
         conn.execute(CREATE_SOCI_MIN)
         for col, decl in REQUIRED_COLUMNS_SOCI:
-            _ensure_column(conn, "soci", col, decl)
+            _ensure_column(conn, "soci", col, decl, columns)
         conn.execute(CREATE_DOCS)
         for col, decl in REQUIRED_COLUMNS_DOCS:
-            _ensure_column(conn, "documenti", col, decl)
+            _ensure_column(conn, "documenti", col, decl, columns)
         conn.execute(
             "UPDATE documenti SET categoria = ? WHERE categoria IS NULL OR TRIM(categoria) = ''",
             (DEFAULT_DOCUMENT_CATEGORY,)
@@ -517,30 +606,31 @@ def init_db():
         conn.execute(CREATE_EVENTI)
         conn.execute(CREATE_CD_RIUNIONI)
         # Ensure numero_cd column exists in cd_riunioni
-        _ensure_column(conn, "cd_riunioni", "numero_cd", "TEXT")
+        _ensure_column(conn, "cd_riunioni", "numero_cd", "TEXT", columns)
         # Tipo riunione: futura/passata (per riabilitare invio email in modifica)
-        _ensure_column(conn, "cd_riunioni", "tipo_riunione", "TEXT")
+        _ensure_column(conn, "cd_riunioni", "tipo_riunione", "TEXT", columns)
         # MVP Riunione CD (v0.4.3+): JSON structured fields
-        _ensure_column(conn, "cd_riunioni", "meta_json", "TEXT")
-        _ensure_column(conn, "cd_riunioni", "odg_json", "TEXT")
-        _ensure_column(conn, "cd_riunioni", "presenze_json", "TEXT")
+        _ensure_column(conn, "cd_riunioni", "meta_json", "TEXT", columns)
+        _ensure_column(conn, "cd_riunioni", "odg_json", "TEXT", columns)
+        _ensure_column(conn, "cd_riunioni", "presenze_json", "TEXT", columns)
         # Verbale linkage (canonical): points to section_documents.id
-        _ensure_column(conn, "cd_riunioni", "verbale_section_doc_id", "INTEGER")
+        _ensure_column(conn, "cd_riunioni", "verbale_section_doc_id", "INTEGER", columns)
         # Optional explicit mandate linkage (overrides date-based inference in UI)
-        _ensure_column(conn, "cd_riunioni", "mandato_id", "INTEGER")
+        _ensure_column(conn, "cd_riunioni", "mandato_id", "INTEGER", columns)
         conn.execute(CREATE_CD_DELIBERE)
         # Best-effort migration for older DBs created before some CD columns existed
-        _ensure_column(conn, "cd_delibere", "data_votazione", "TEXT")
-        _ensure_column(conn, "cd_delibere", "favorevoli", "INTEGER")
-        _ensure_column(conn, "cd_delibere", "contrari", "INTEGER")
-        _ensure_column(conn, "cd_delibere", "astenuti", "INTEGER")
-        _ensure_column(conn, "cd_delibere", "allegato_path", "TEXT")
-        _ensure_column(conn, "cd_delibere", "note", "TEXT")
-        _ensure_column(conn, "cd_delibere", "created_at", "TEXT")
+        _ensure_column(conn, "cd_delibere", "data_votazione", "TEXT", columns)
+        _ensure_column(conn, "cd_delibere", "favorevoli", "INTEGER", columns)
+        _ensure_column(conn, "cd_delibere", "contrari", "INTEGER", columns)
+        _ensure_column(conn, "cd_delibere", "astenuti", "INTEGER", columns)
+        _ensure_column(conn, "cd_delibere", "allegato_path", "TEXT", columns)
+        _ensure_column(conn, "cd_delibere", "note", "TEXT", columns)
+        _ensure_column(conn, "cd_delibere", "created_at", "TEXT", columns)
 
         # If a legacy "data" column exists, backfill data_votazione when empty.
         try:
-            if _has_column(conn, "cd_delibere", "data") and _has_column(conn, "cd_delibere", "data_votazione"):
+            delibere_cols = columns.get("cd_delibere") or _table_columns(conn, "cd_delibere")
+            if "data" in delibere_cols and "data_votazione" in delibere_cols:
                 conn.execute(
                     """
                     UPDATE cd_delibere
@@ -552,14 +642,14 @@ def init_db():
             logger.warning("Impossibile eseguire backfill cd_delibere: %s", exc)
         conn.execute(CREATE_CD_VERBALI)
         conn.execute(CREATE_CD_MANDATI)
-        _ensure_column(conn, "cd_mandati", "label", "TEXT")
-        _ensure_column(conn, "cd_mandati", "start_date", "TEXT")
-        _ensure_column(conn, "cd_mandati", "end_date", "TEXT")
-        _ensure_column(conn, "cd_mandati", "composizione_json", "TEXT")
-        _ensure_column(conn, "cd_mandati", "note", "TEXT")
-        _ensure_column(conn, "cd_mandati", "is_active", "INTEGER DEFAULT 1")
-        _ensure_column(conn, "cd_mandati", "created_at", "TEXT")
-        _ensure_column(conn, "cd_mandati", "updated_at", "TEXT")
+        _ensure_column(conn, "cd_mandati", "label", "TEXT", columns)
+        _ensure_column(conn, "cd_mandati", "start_date", "TEXT", columns)
+        _ensure_column(conn, "cd_mandati", "end_date", "TEXT", columns)
+        _ensure_column(conn, "cd_mandati", "composizione_json", "TEXT", columns)
+        _ensure_column(conn, "cd_mandati", "note", "TEXT", columns)
+        _ensure_column(conn, "cd_mandati", "is_active", "INTEGER DEFAULT 1", columns)
+        _ensure_column(conn, "cd_mandati", "created_at", "TEXT", columns)
+        _ensure_column(conn, "cd_mandati", "updated_at", "TEXT", columns)
 
         # Normalize mandate labels (best-effort):
         # - if empty, set to "Mandato AAAA-BBBB" derived from dates
@@ -588,22 +678,22 @@ def init_db():
         conn.execute(CREATE_PONTI)
         conn.execute(CREATE_PONTI_STATUS_HISTORY)
         conn.execute(CREATE_PONTI_AUTHORIZATIONS)
-        _ensure_column(conn, "ponti_authorizations", "calendar_event_id", "INTEGER")
+        _ensure_column(conn, "ponti_authorizations", "calendar_event_id", "INTEGER", columns)
 
         conn.execute(CREATE_PONTI_INTERVENTI)
         conn.execute(CREATE_PONTI_DOCUMENTS)
         conn.execute(CREATE_SECTION_DOCUMENTS)
         # Uniforma schema section_documents a quello dei documenti soci (best effort su DB esistenti)
-        _ensure_column(conn, "section_documents", "socio_id", "INTEGER")
-        _ensure_column(conn, "section_documents", "nome_file", "TEXT")
-        _ensure_column(conn, "section_documents", "percorso", "TEXT")
-        _ensure_column(conn, "section_documents", "tipo", "TEXT")
-        _ensure_column(conn, "section_documents", "categoria", "TEXT")
-        _ensure_column(conn, "section_documents", "descrizione", "TEXT")
-        _ensure_column(conn, "section_documents", "data_caricamento", "TEXT")
-        _ensure_column(conn, "section_documents", "protocollo", "TEXT")
-        _ensure_column(conn, "section_documents", "verbale_numero", "TEXT")
-        _ensure_column(conn, "section_documents", "original_name", "TEXT")
+        _ensure_column(conn, "section_documents", "socio_id", "INTEGER", columns)
+        _ensure_column(conn, "section_documents", "nome_file", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "percorso", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "tipo", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "categoria", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "descrizione", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "data_caricamento", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "protocollo", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "verbale_numero", "TEXT", columns)
+        _ensure_column(conn, "section_documents", "original_name", "TEXT", columns)
 
         # Backfill campi uniformati (solo se vuoti)
         try:
@@ -666,25 +756,34 @@ def init_db():
 
         conn.execute(CREATE_MAGAZZINO_ITEMS)
         # Magazzino: extended inventory columns (best-effort migrations)
-        _ensure_column(conn, "magazzino_items", "quantita", "TEXT")
-        _ensure_column(conn, "magazzino_items", "ubicazione", "TEXT")
-        _ensure_column(conn, "magazzino_items", "matricola", "TEXT")
-        _ensure_column(conn, "magazzino_items", "doc_fisc_prov", "TEXT")
-        _ensure_column(conn, "magazzino_items", "valore_acq_eur", "TEXT")
-        _ensure_column(conn, "magazzino_items", "scheda_tecnica", "TEXT")
-        _ensure_column(conn, "magazzino_items", "provenienza", "TEXT")
-        _ensure_column(conn, "magazzino_items", "altre_notizie", "TEXT")
+        _ensure_column(conn, "magazzino_items", "quantita", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "ubicazione", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "matricola", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "doc_fisc_prov", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "valore_acq_eur", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "scheda_tecnica", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "provenienza", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "altre_notizie", "TEXT", columns)
         # Magazzino: dismissione (soft-delete)
-        _ensure_column(conn, "magazzino_items", "is_dismesso", "INTEGER NOT NULL DEFAULT 0")
-        _ensure_column(conn, "magazzino_items", "dismesso_at", "TEXT")
-        _ensure_column(conn, "magazzino_items", "dismesso_reason", "TEXT")
-        _ensure_column(conn, "magazzino_items", "dismesso_destination", "TEXT")
+        _ensure_column(conn, "magazzino_items", "is_dismesso", "INTEGER NOT NULL DEFAULT 0", columns)
+        _ensure_column(conn, "magazzino_items", "dismesso_at", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "dismesso_reason", "TEXT", columns)
+        _ensure_column(conn, "magazzino_items", "dismesso_destination", "TEXT", columns)
         conn.execute(CREATE_MAGAZZINO_LOANS)
+        # Materialized active loan, maintained by triggers on magazzino_loans
+        item_cols = columns.get("magazzino_items") or _table_columns(conn, "magazzino_items")
+        backfill_active_loan = "active_loan_id" not in item_cols
+        _ensure_column(conn, "magazzino_items", "active_loan_id", "INTEGER", columns)
+        for trigger in CREATE_MAGAZZINO_TRIGGERS:
+            conn.execute(trigger)
+        if backfill_active_loan:
+            conn.execute(_MAGAZZINO_ACTIVE_LOAN_SQL)
         conn.execute(CREATE_SOCI_ROLES)
         for idx in CREATE_INDEXES:
             try:
                 conn.execute(idx)
-            except sqlite3.OperationalError as e:
+            except (sqlite3.OperationalError, sqlite3.IntegrityError) as e:
+                # IntegrityError: legacy data violates a UNIQUE index
                 logger.warning("Indice non creato (%s): %s", idx, e)
 
         # Backfill historical single-role data into soci_ruoli
@@ -855,8 +954,12 @@ def add_section_document_record(
     stored_name: str | None = None,
     relative_path: str | None = None,
     uploaded_at: str | None = None,
+    conn: sqlite3.Connection | None = None,
 ) -> int | None:
-    """Insert a new section document registry record (soft-delete aware)."""
+    """Insert a new section document registry record (soft-delete aware).
+
+    If ``conn`` is given the insert joins the caller's transaction.
+    """
     percorso_value = (percorso or "").strip()
     relative_path_value = (relative_path or "").strip()
 
@@ -901,36 +1004,30 @@ def add_section_document_record(
     VALUES
         (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
     """
+    params = (
+        hash_id,
+        nome_file_value,
+        percorso_value,
+        tipo_value,
+        categoria,
+        descrizione_value,
+        data_value,
+        (protocollo or None),
+        (verbale_numero or None),
+        stored_name,
+        relative_path_value,
+        uploaded_at or data_value,
+    )
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                sql,
-                (
-                    hash_id,
-                    nome_file_value,
-                    percorso_value,
-                    tipo_value,
-                    categoria,
-                    descrizione_value,
-                    data_value,
-                    (protocollo or None),
-                    (verbale_numero or None),
-                    stored_name,
-                    relative_path_value,
-                    uploaded_at or data_value,
-                ),
-            )
-            return cur.lastrowid
+        if conn is not None:
+            return conn.execute(sql, params).lastrowid
+        with get_connection() as own_conn:
+            return own_conn.execute(sql, params).lastrowid
     except sqlite3.Error as e:
         raise map_sqlite_exception(e)
 
 
-def list_section_document_records(*, include_deleted: bool = False) -> list[dict]:
-    where = "" if include_deleted else "WHERE deleted_at IS NULL"
-    rows = fetch_all(
-        f"""
-        SELECT
+_SECTION_DOCUMENT_COLUMNS = """
             id,
             hash_id,
             nome_file,
@@ -944,7 +1041,14 @@ def list_section_document_records(*, include_deleted: bool = False) -> list[dict
             stored_name,
             relative_path,
             uploaded_at,
-            deleted_at
+            deleted_at"""
+
+
+def list_section_document_records(*, include_deleted: bool = False) -> list[dict]:
+    where = "" if include_deleted else "WHERE deleted_at IS NULL"
+    rows = fetch_all(
+        f"""
+        SELECT{_SECTION_DOCUMENT_COLUMNS}
         FROM section_documents
         {where}
         ORDER BY categoria COLLATE NOCASE, COALESCE(data_caricamento, uploaded_at, '') DESC, id DESC
@@ -953,6 +1057,48 @@ def list_section_document_records(*, include_deleted: bool = False) -> list[dict
     return [dict(r) for r in rows]
 
 
+def list_section_document_records_by_category(categoria: str) -> list[dict]:
+    """Active records of one category, in the same order as list_section_document_records."""
+    return fetch_all_dicts(
+        f"""
+        SELECT{_SECTION_DOCUMENT_COLUMNS}
+        FROM section_documents
+        WHERE categoria = ? AND deleted_at IS NULL
+        ORDER BY COALESCE(data_caricamento, uploaded_at, '') DESC, id DESC
+        """,
+        (categoria,),
+    )
+
+
+def list_cd_verbali_records() -> list[dict]:
+    """Active section documents that look like CD verbali.
+
+    Same rule as section_documents.list_cd_verbali_documents: categoria
+    containing "verbal" or a non-empty verbale_numero.
+    """
+    return fetch_all_dicts(
+        f"""
+        SELECT{_SECTION_DOCUMENT_COLUMNS}
+        FROM section_documents
+        WHERE deleted_at IS NULL
+          AND (LOWER(categoria) LIKE '%verbal%' OR TRIM(COALESCE(verbale_numero, '')) <> '')
+        """
+    )
+
+
+def list_section_document_relative_paths() -> set[str]:
+    """Return every stored relative_path and percorso value (deleted rows included).
+
+    Membership in this set matches a non-empty get_section_document_by_relative_path().
+    """
+    paths: set[str] = set()
+    for row in fetch_all("SELECT relative_path, percorso FROM section_documents"):
+        for value in row:
+            if value:
+                paths.add(value)
+    return paths
+
+
 def get_section_document_by_relative_path(relative_path: str) -> dict | None:
     row = fetch_one(
         """
@@ -995,7 +1141,12 @@ def update_section_document_record(
     nome_file: str | None = None,
     tipo: str | None = None,
     data_caricamento: str | None = None,
+    conn: sqlite3.Connection | None = None,
 ) -> bool:
+    """Update the given fields of a section document record.
+
+    If ``conn`` is given the update joins the caller's transaction.
+    """
     updates: list[str] = []
     params: list[object] = []
     if hash_id is not None:
@@ -1035,23 +1186,40 @@ def update_section_document_record(
         return False
     params.append(record_id)
     sql = f"UPDATE section_documents SET {', '.join(updates)} WHERE id = ?"
-    exec_query(sql, tuple(params))
+    if conn is not None:
+        try:
+            conn.execute(sql, tuple(params))
+        except sqlite3.Error as e:
+            raise map_sqlite_exception(e)
+    else:
+        exec_query(sql, tuple(params))
     return True
 
 
-def soft_delete_section_document_record(record_id: int) -> bool:
+def soft_delete_section_document_record(record_id: int, *, conn: sqlite3.Connection | None = None) -> bool:
     from utils import now_iso
 
-    exec_query("UPDATE section_documents SET deleted_at = ? WHERE id = ?", (now_iso(), record_id))
+    sql = "UPDATE section_documents SET deleted_at = ? WHERE id = ?"
+    params = (now_iso(), record_id)
+    if conn is not None:
+        try:
+            conn.execute(sql, params)
+        except sqlite3.Error as e:
+            raise map_sqlite_exception(e)
+    else:
+        exec_query(sql, params)
     return True
 
+# json.dumps() builds a new encoder whenever options differ from the defaults
+_EVENT_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
 def log_evento(socio_id: int, tipo: str, payload: dict):
     """Log an event to the events table."""
     try:
         from utils import now_iso
         exec_query(
             "INSERT INTO eventi_libro_soci (socio_id, tipo_evento, dettagli_json, ts) VALUES (?,?,?,?)",
-            (socio_id, tipo, json.dumps(payload, ensure_ascii=False), now_iso()),
+            (socio_id, tipo, _EVENT_JSON_ENCODER.encode(payload), now_iso()),
         )
     except Exception as e:
         logger.error("log_evento failed: %s", e)
@@ -1283,8 +1451,12 @@ def add_calendar_event(
     luogo: str | None = None,
     reminder_days: int = 7,
     origin: str | None = None,
+    conn: sqlite3.Connection | None = None,
 ) -> int:
-    """Create a calendar event and return its ID."""
+    """Create a calendar event and return its ID.
+
+    If ``conn`` is given the insert joins the caller's transaction.
+    """
     from utils import now_iso
 
     sql = """
@@ -1292,17 +1464,22 @@ def add_calendar_event(
     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
     now = now_iso()
-    with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute(sql, (tipo, titolo, descrizione, luogo, start_ts, reminder_days, origin, now, now))
-        last_id = cur.lastrowid
-        if last_id is None:  # pragma: no cover - sqlite should always return the row id
-            raise RuntimeError("Impossibile determinare l'ID del nuovo evento calendario")
-        return int(last_id)
+    params = (tipo, titolo, descrizione, luogo, start_ts, reminder_days, origin, now, now)
+    if conn is not None:
+        last_id = conn.execute(sql, params).lastrowid
+    else:
+        with get_connection() as own_conn:
+            last_id = own_conn.execute(sql, params).lastrowid
+    if last_id is None:  # pragma: no cover - sqlite should always return the row id
+        raise RuntimeError("Impossibile determinare l'ID del nuovo evento calendario")
+    return int(last_id)
 
 
-def update_calendar_event(event_id: int, **fields) -> bool:
-    """Update fields of a calendar event."""
+def update_calendar_event(event_id: int, *, conn: sqlite3.Connection | None = None, **fields) -> bool:
+    """Update fields of a calendar event.
+
+    If ``conn`` is given the update joins the caller's transaction.
+    """
     if not fields:
         return False
     from utils import now_iso
@@ -1316,13 +1493,19 @@ def update_calendar_event(event_id: int, **fields) -> bool:
     set_clause = ", ".join(f"{k} = ?" for k in allowed.keys())
     params = list(allowed.values()) + [event_id]
     sql = f"UPDATE calendar_events SET {set_clause} WHERE id = ?"
-    exec_query(sql, tuple(params))
+    if conn is not None:
+        conn.execute(sql, tuple(params))
+    else:
+        exec_query(sql, tuple(params))
     return True
 
 
-def delete_calendar_event(event_id: int) -> bool:
+def delete_calendar_event(event_id: int, *, conn: sqlite3.Connection | None = None) -> bool:
     try:
-        exec_query("DELETE FROM calendar_events WHERE id = ?", (event_id,))
+        if conn is not None:
+            conn.execute("DELETE FROM calendar_events WHERE id = ?", (event_id,))
+        else:
+            exec_query("DELETE FROM calendar_events WHERE id = ?", (event_id,))
         return True
     except Exception as exc:
         logger.error("Failed to delete calendar event %s: %s", event_id, exc)
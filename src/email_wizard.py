@@ -22,6 +22,9 @@ from config_manager import load_config
 
 logger = logging.getLogger("librosoci")
 
+# Directory of this module (src/), resolved once at import
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 EMAIL_TEMPLATES_SUBDIR = "email_templates"
 
@@ -638,8 +641,7 @@ class EmailWizard:
 
     def _read_definizioni_gruppi(self) -> Dict[str, List[str]]:
         """Parse src/Definizioni/DefinizioniGruppi into {group_line: [role_lines...]}."""
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        path = os.path.join(base_dir, "Definizioni", "DefinizioniGruppi")
+        path = os.path.join(_MODULE_DIR, "Definizioni", "DefinizioniGruppi")
         groups: Dict[str, List[str]] = {}
         try:
             if not os.path.exists(path):
@@ -58,18 +58,28 @@ class ExportManager:
                     "data_iscrizione", "deleted_at"
                 ]
             
-            # Write CSV
+            # Write CSV: rows go to csv.writer as sequences in header order
+            # (missing values become empty cells, like DictWriter's restval;
+            # unknown keys still fail, like DictWriter's extrasaction='raise').
+            width = len(headers)
+            header_set = frozenset(headers)
+
+            def _ordered(member):
+                if isinstance(member, dict):
+                    extra = member.keys() - header_set
+                    if extra:
+                        raise ValueError(
+                            "dict contains fields not in fieldnames: " + ", ".join(map(repr, extra))
+                        )
+                    return [member.get(h, "") for h in headers]
+                values = list(member)[:width]
+                values.extend([""] * (width - len(values)))
+                return values
+
             with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.DictWriter(f, fieldnames=headers, delimiter=";")
-                writer.writeheader()
-                
-                for member in members_list:
-                    if isinstance(member, dict):
-                        writer.writerow(member)
-                    else:
-                        # Convert tuple/row to dict
-                        row = dict(zip(headers, member))
-                        writer.writerow(row)
+                writer = csv.writer(f, delimiter=";")
+                writer.writerow(headers)
+                writer.writerows(map(_ordered, members_list))
             
             logger.info(f"CSV export completed: {filepath}")
             return filepath
@@ -9,10 +9,22 @@ Some areas (e.g. section documents) may use a different length to distinguish.
 
 from __future__ import annotations
 
+import errno
+import os
 import secrets
 import shutil
 from pathlib import Path
 
+# copy_file_range failures that just mean "not supported here": fall back to shutil
+_COPY_RANGE_FALLBACK_ERRNOS = {
+    errno.ENOSYS,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EBADF,
+}
+
 
 def _hex_token(*, length: int) -> str:
     if length < 1:
@@ -32,6 +44,44 @@ def unique_hex_filename(directory: Path, extension: str, length: int = 10) -> st
             return candidate
 
 
+def _copy_file_range(src: Path, dst: Path) -> bool:
+    """Copy src to dst in kernel space with os.copy_file_range (Linux).
+
+    On filesystems with reflink support (btrfs, XFS) the copy is copy-on-write.
+    Returns False when the syscall is not usable or stops before the whole
+    file is copied, leaving dst to be rewritten; never succeeds on a short copy.
+    """
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is None:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        remaining = os.fstat(in_fd).st_size
+        try:
+            while remaining > 0:
+                copied = copy_range(in_fd, out_fd, remaining)
+                if copied == 0:
+                    # Unsupported (first call) or EOF before the expected size
+                    # (source changed/truncated): let shutil redo the copy.
+                    return False
+                remaining -= copied
+        except OSError as exc:
+            if exc.errno in _COPY_RANGE_FALLBACK_ERRNOS:
+                return False
+            raise
+    return True
+
+
+def copy_file(source_path: str | Path, dest_path: str | Path) -> None:
+    """Copy a file with its metadata (like shutil.copy2), using the fastest kernel path."""
+    src = Path(source_path)
+    dst = Path(dest_path)
+    if not _copy_file_range(src, dst):
+        # shutil already uses sendfile (Linux) / fcopyfile (macOS) / CopyFile (Windows)
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
 def archive_file(
     *,
     source_path: str | Path,
@@ -54,7 +104,7 @@ def archive_file(
     dest = dst_dir / stored_name
 
     if keep_mtime:
-        shutil.copy2(src, dest)
+        copy_file(src, dest)
     else:
         shutil.copy(src, dest)
 
@@ -11,6 +11,12 @@ import csv
 
 logger = logging.getLogger("librosoci")
 
+# CSV 'voto' values -> 0/1 (anything else means "no information")
+_VOTO_FLAGS = {'1': 1, 'True': 1, 'true': 1, '0': 0, 'False': 0, 'false': 0}
+
+# Rows written per transaction; the UI is refreshed between chunks
+_IMPORT_CHUNK_ROWS = 50
+
 class ImportWizard:
     """Main import wizard dialog - manages the complete import process"""
     
@@ -758,8 +764,17 @@ class ImportWizard:
     def _execute_import(self):
         """Execute the import process"""
         try:
-            from soci_import_engine import fetch_socio_by_matricola, insert_socio, update_socio_by_matricola
+            import sqlite3
+
+            from soci_import_engine import (
+                fetch_socio_by_matricola,
+                insert_socio,
+                matricola_upsert_available,
+                update_socio_by_matricola,
+                upsert_socio_by_matricola,
+            )
             from csv_import import apply_mapping
+            from database import get_connection
 
             # Ask user which name-splitting strategy to use when `cognome` is missing
             def _ask_name_split_mode():
@@ -826,12 +841,7 @@ class ImportWizard:
             def _voto_to_bool(v):
                 if v is None:
                     return None
-                s = str(v).strip()
-                if s in ('1', 'True', 'true'):
-                    return 1
-                if s in ('0', 'False', 'false'):
-                    return 0
-                return None
+                return _VOTO_FLAGS.get(str(v).strip())
             # Apply attivo rule per user specification:
             # - If Voto == 1 => Attivo = 1
             # - If Voto == 0 and Q0 != NULL => Attivo = 1
@@ -880,120 +890,163 @@ class ImportWizard:
             if res is True:
                 duplicate_strategy = 'status_only'
 
-            self.import_count = 0
-            for i, row in enumerate(mapped_rows):
-                # Update progress
-                progress = int((i / total) * 100)
-                self.progress["value"] = progress
-                self.progress_text.config(text=f"Importazione: {i+1}/{total}")
-                self.win.update()
+            def _insert_payload(row):
+                # Only non-empty and selected fields (matricola always)
+                return {
+                    k: v for k, v in row.items()
+                    if _is_present(v) and (k == 'matricola' or self.selected_fields.get(k, True))
+                }
 
-                try:
-                    # If CSV provides a single 'nome' field containing both surname and given name
-                    # (e.g. 'ROSSI PAOLA') and 'cognome' mapping is empty/None, attempt to split with heuristics.
-                    nome_val = row.get('nome')
-                    cognome_val = row.get('cognome')
-                    if (cognome_val is None or str(cognome_val).strip() == "") and nome_val:
-                        cognome, nome = self._split_name(nome_val, name_split_mode)
-                        if cognome:
-                            row['cognome'] = cognome
-                            row['nome'] = nome
-
-                    # Determine matricola and check existing record to avoid IntegrityError
-                    matricola = row.get('matricola')
-                    existing = None
-                    if matricola:
-                        existing = fetch_socio_by_matricola(str(matricola))
-
-                    if existing:
-                        # Handle duplicate according to chosen strategy
-                        if duplicate_strategy is None:
-                            res = messagebox.askyesnocancel(
-                                "Duplicato trovato",
-                                "È stato trovato un socio con la stessa 'matricola'.\n\n"
-                                "Come vuoi aggiornare i dati?\n\n"
-                                "Premi 'Sì' per aggiornare SOLO i campi vuoti (non sovrascrive quelli già compilati).\n\n"
-                                "Premi 'No' per SOVRASCRIVERE tutti i campi con i valori del CSV.\n\n"
-                                "Premi 'Annulla' per interrompere l'importazione."
-                            )
-                            if res is None:
-                                messagebox.showinfo("Importazione", "Importazione annullata dall'utente.")
-                                return
-                            duplicate_strategy = 'update_empty' if res else 'overwrite'
-
-                        update_cols = []
-                        update_vals = []
-                        if duplicate_strategy == 'status_only':
-                            for col in ('attivo', 'voto'):
-                                # Check if field is selected for update
-                                if not self.selected_fields.get(col, True):
-                                    continue
-                                val = row.get(col)
-                                if val is not None and str(val).strip() != "":
-                                    update_cols.append(f"{col}=?")
-                                    update_vals.append(val)
-                        else:
-                            for col, val in row.items():
-                                if col == 'id':
-                                    continue
-                                    
-                                # Check if field is selected for update (matricola always allowed)
-                                if col != 'matricola' and not self.selected_fields.get(col, True):
-                                    continue
-                                    
-                                # Use the value provided in the mapped row for 'attivo' (do not force)
-                                if col == 'attivo':
-                                    if val is not None and str(val).strip() != "":
-                                        update_cols.append(f"{col}=?")
-                                        update_vals.append(val)
-                                    continue
+            self.import_count = 0
+            # Rows are written in chunks: a commit per row forces a disk sync for
+            # every socio. Each chunk is committed before the UI is serviced (and
+            # before any dialog), so no write lock is held while the user or the
+            # rest of the app (refresh, backup) is waiting. Rows that fail are
+            # skipped as before.
+            with get_connection() as conn:
+                # The upsert needs the UNIQUE index on matricola, which is not
+                # created on databases holding duplicate matricole.
+                use_upsert = matricola_upsert_available(conn)
+                for i, row in enumerate(mapped_rows):
+                    if i % _IMPORT_CHUNK_ROWS == 0:
+                        conn.commit()
+                        # Update progress
+                        progress = int((i / total) * 100)
+                        self.progress["value"] = progress
+                        self.progress_text.config(text=f"Importazione: {i+1}/{total}")
+                        self.win.update()
 
-                                if duplicate_strategy == 'overwrite':
+                    try:
+                        # If CSV provides a single 'nome' field containing both surname and given name
+                        # (e.g. 'ROSSI PAOLA') and 'cognome' mapping is empty/None, attempt to split with heuristics.
+                        nome_val = row.get('nome')
+                        cognome_val = row.get('cognome')
+                        if (cognome_val is None or str(cognome_val).strip() == "") and nome_val:
+                            cognome, nome = self._split_name(nome_val, name_split_mode)
+                            if cognome:
+                                row['cognome'] = cognome
+                                row['nome'] = nome
+
+                        # Determine matricola and check existing record to avoid IntegrityError
+                        matricola = row.get('matricola')
+                        if matricola and duplicate_strategy is not None and use_upsert:
+                            # Strategy already chosen: lookup + insert/update in one statement
+                            payload = _insert_payload(row)
+                            if duplicate_strategy == 'status_only':
+                                update_cols = [
+                                    col for col in ('attivo', 'voto')
+                                    if self.selected_fields.get(col, True) and _is_present(row.get(col))
+                                ]
+                            else:
+                                update_cols = [
+                                    col for col, val in payload.items()
+                                    if col != 'id' and (duplicate_strategy == 'overwrite' or col == 'attivo' or val)
+                                ]
+                            try:
+                                if upsert_socio_by_matricola(
+                                    payload,
+                                    update_columns=update_cols,
+                                    only_empty=(duplicate_strategy == 'update_empty'),
+                                    conn=conn,
+                                ):
+                                    self.import_count += 1
+                                continue
+                            except sqlite3.OperationalError as exc:
+                                # e.g. ON CONFLICT target without a matching index:
+                                # use the lookup/update path for this and later rows.
+                                logger.warning("Upsert socio non disponibile, uso aggiornamento classico: %s", exc)
+                                use_upsert = False
+
+                        existing = None
+                        if matricola:
+                            existing = fetch_socio_by_matricola(str(matricola), conn=conn)
+
+                        if existing:
+                            # Handle duplicate according to chosen strategy
+                            if duplicate_strategy is None:
+                                conn.commit()
+                                res = messagebox.askyesnocancel(
+                                    "Duplicato trovato",
+                                    "È stato trovato un socio con la stessa 'matricola'.\n\n"
+                                    "Come vuoi aggiornare i dati?\n\n"
+                                    "Premi 'Sì' per aggiornare SOLO i campi vuoti (non sovrascrive quelli già compilati).\n\n"
+                                    "Premi 'No' per SOVRASCRIVERE tutti i campi con i valori del CSV.\n\n"
+                                    "Premi 'Annulla' per interrompere l'importazione."
+                                )
+                                if res is None:
+                                    messagebox.showinfo("Importazione", "Importazione annullata dall'utente.")
+                                    return
+                                duplicate_strategy = 'update_empty' if res else 'overwrite'
+
+                            update_cols = []
+                            update_vals = []
+                            if duplicate_strategy == 'status_only':
+                                for col in ('attivo', 'voto'):
+                                    # Check if field is selected for update
+                                    if not self.selected_fields.get(col, True):
+                                        continue
+                                    val = row.get(col)
                                     if val is not None and str(val).strip() != "":
                                         update_cols.append(f"{col}=?")
                                         update_vals.append(val)
-                                else:  # update_empty
-                                    # only update if existing value is empty
+                            else:
+                                for col, val in row.items():
+                                    if col == 'id':
+                                        continue
+                                    
+                                    # Check if field is selected for update (matricola always allowed)
+                                    if col != 'matricola' and not self.selected_fields.get(col, True):
+                                        continue
+                                    
+                                    # Use the value provided in the mapped row for 'attivo' (do not force)
+                                    if col == 'attivo':
+                                        if val is not None and str(val).strip() != "":
+                                            update_cols.append(f"{col}=?")
+                                            update_vals.append(val)
+                                        continue
+
+                                    if duplicate_strategy == 'overwrite':
+                                        if val is not None and str(val).strip() != "":
+                                            update_cols.append(f"{col}=?")
+                                            update_vals.append(val)
+                                    else:  # update_empty
+                                        # only update if existing value is empty
+                                        try:
+                                            existing_val = existing[col]
+                                        except Exception:
+                                            existing_val = None
+                                        if (existing_val is None or str(existing_val).strip() == "") and val:
+                                            update_cols.append(f"{col}=?")
+                                            update_vals.append(val)
+
+                            if update_cols:
+                                updates = {}
+                                for part, v in zip(update_cols, update_vals):
                                     try:
-                                        existing_val = existing[col]
+                                        colname = part.split("=")[0]
                                     except Exception:
-                                        existing_val = None
-                                    if (existing_val is None or str(existing_val).strip() == "") and val:
-                                        update_cols.append(f"{col}=?")
-                                        update_vals.append(val)
-
-                        if update_cols:
-                            updates = {}
-                            for part, v in zip(update_cols, update_vals):
-                                try:
-                                    colname = part.split("=")[0]
-                                except Exception:
-                                    continue
-                                updates[colname] = v
-                            update_socio_by_matricola(
-                                matricola=str(matricola),
-                                updates=updates,
-                                write_enabled=True,
-                                keep_empty_strings=False,
-                            )
-                            self.import_count += 1
+                                        continue
+                                    updates[colname] = v
+                                update_socio_by_matricola(
+                                    matricola=str(matricola),
+                                    updates=updates,
+                                    write_enabled=True,
+                                    keep_empty_strings=False,
+                                    conn=conn,
+                                )
+                                self.import_count += 1
+                            else:
+                                logger.debug("No fields to update for matricola %s", matricola)
                         else:
-                            logger.debug("No fields to update for matricola %s", matricola)
-                    else:
-                        # Insert new record (only non-empty and selected fields)
-                        payload = {}
-                        for k, v in row.items():
-                            if v is None or str(v).strip() == "":
+                            # Insert new record (only non-empty and selected fields)
+                            payload = _insert_payload(row)
+                            if not payload:
                                 continue
-                            if k == 'matricola' or self.selected_fields.get(k, True):
-                                payload[k] = v
-                        if not payload:
-                            continue
-                        insert_socio(payload, write_enabled=True)
-                        self.import_count += 1
-                except Exception as e:
-                    logger.error("Unexpected error importing row %s: %s", i, e)
-                    continue
+                            insert_socio(payload, write_enabled=True, conn=conn)
+                            self.import_count += 1
+                    except Exception as e:
+                        logger.error("Unexpected error importing row %s: %s", i, e)
+                        continue
 
             # Complete
             self.progress["value"] = 100
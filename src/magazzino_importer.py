@@ -91,16 +91,22 @@ def detect_format(path: str) -> str | None:
     return SUPPORTED_FORMATS.get(ext)
 
 
+_SNIFF_SAMPLE_SIZE = 4096
+
+
+def _sniff_sample(sample: str) -> str:
+    """Detect the CSV delimiter from an already-read text sample."""
+    if not sample:
+        return ";"
+    dialect = csv.Sniffer().sniff(sample, delimiters=";,.\t|")
+    return dialect.delimiter or ";"
+
+
 def sniff_delimiter(path: str) -> str:
     """Detect CSV delimiter from file contents."""
     try:
-        with open(path, "r", encoding="utf-8-sig") as handle:
-            sample = handle.read(4096)
-            handle.seek(0)
-            if not sample:
-                return ";"
-            dialect = csv.Sniffer().sniff(sample, delimiters=";,.\t|")
-            return dialect.delimiter or ";"
+        with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+            return _sniff_sample(handle.read(_SNIFF_SAMPLE_SIZE))
     except Exception as exc:
         logger.debug("Delimiter sniff failed for %s: %s", path, exc)
         return ";"
@@ -122,16 +128,42 @@ _HEADER_HINTS = {
 }
 
 
+_HEADER_SPACE_RE = re.compile(r"[\s\u00a0]+")
+_HEADER_STRIP_RE = re.compile(r"[^\w\sàèéìòù°.]")
+# ASCII bytes removed by _HEADER_STRIP_RE (everything but word chars, spaces and ".")
+_ASCII_HEADER_DELETE = bytes(
+    c for c in range(128)
+    if not (chr(c).isalnum() or chr(c).isspace() or chr(c) in "_.")
+)
+
+
 def _canon_header_cell(value: str | None) -> str:
     text = (value or "").strip().lower()
     if not text:
         return ""
     # normalize punctuation/spacing so that "N. INV" and "N INV" match.
-    text = re.sub(r"[\s\u00a0]+", " ", text)
-    text = re.sub(r"[^\w\sàèéìòù°.]", "", text)
-    text = text.replace(".", " ")
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    if text.isascii():
+        text = text.encode("ascii").translate(None, _ASCII_HEADER_DELETE).decode("ascii")
+    else:
+        text = _HEADER_SPACE_RE.sub(" ", text)
+        text = _HEADER_STRIP_RE.sub("", text)
+    return " ".join(text.replace(".", " ").split())
+
+
+def _build_auto_guess_reverse() -> dict[str, tuple[str, ...]]:
+    """Invert AUTO_GUESS: canonical header -> field keys, in INVENTORY_FIELDS order."""
+    reverse: dict[str, list[str]] = {}
+    for field in INVENTORY_FIELDS:
+        key = field["key"]
+        for candidate in AUTO_GUESS.get(key, ()):
+            keys = reverse.setdefault(_canon_header_cell(candidate), [])
+            if key not in keys:
+                keys.append(key)
+    return {canon: tuple(keys) for canon, keys in reverse.items()}
+
+
+_AUTO_GUESS_REVERSE = _build_auto_guess_reverse()
+_NOTE_FALLBACK_CANON = tuple(_canon_header_cell(alt) for alt in ("ubicazione", "posizione", "location"))
 
 
 def _score_header_row(cells: Sequence[str]) -> int:
@@ -185,7 +217,8 @@ def normalize_inventory_code(value: str | None) -> str | None:
     """Normalize an inventory code for duplicate detection (trim + uppercase)."""
     if value is None:
         return None
-    text = str(value).strip()
+    # Codes read from CSV/Excel are already strings: skip the str() round trip.
+    text = (value if isinstance(value, str) else str(value)).strip()
     if not text:
         return None
     return text.upper()
@@ -208,9 +241,18 @@ def _ensure_headers(headers: Sequence[str]) -> List[str]:
 
 
 def _read_csv_file(path: str, delimiter: str | None = None) -> Tuple[List[str], List[dict]]:
-    delim = delimiter or sniff_delimiter(path)
     try:
+        # Open the file once: the delimiter is sniffed on the leading sample
+        # and the same handle is then rewound for the full parse.
         with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+            delim = delimiter
+            if not delim:
+                try:
+                    delim = _sniff_sample(handle.read(_SNIFF_SAMPLE_SIZE))
+                except Exception as exc:
+                    logger.debug("Delimiter sniff failed for %s: %s", path, exc)
+                    delim = ";"
+                handle.seek(0)
             reader = csv.reader(handle, delimiter=delim)
             raw_rows = list(reader)
 
@@ -227,16 +269,18 @@ def _read_csv_file(path: str, delimiter: str | None = None) -> Tuple[List[str],
             raise InventoryImportError("Il file CSV non contiene intestazioni valide.")
 
         headers = _ensure_headers(raw_headers)
+        width = len(headers)
         rows: list[dict] = []
         for raw_row in raw_rows[header_idx + 1 :]:
-            if not raw_row or not any((c or "").strip() for c in raw_row):
+            if not raw_row:
+                continue
+            # csv.reader yields strings: strip them directly, pad short rows.
+            values: list[str | None] = [cell.strip() or None for cell in raw_row[:width]]
+            if not any(values):
                 continue
-            row: dict[str, str | None] = {}
-            for idx, header in enumerate(headers):
-                value = raw_row[idx] if idx < len(raw_row) else None
-                row[header] = _normalize_value(value)
-            if any(row.values()):
-                rows.append(row)
+            if len(values) < width:
+                values.extend([None] * (width - len(values)))
+            rows.append(dict(zip(headers, values)))
         return headers, rows
     except InventoryImportError:
         raise
@@ -268,16 +312,14 @@ def _read_excel_file(path: str) -> Tuple[List[str], List[dict]]:
                 continue
             if not headers:
                 continue
-            row: dict[str, str | None] = {}
-            empty = True
-            for idx, header in enumerate(headers):
-                value = values[idx] if idx < len(values) else None
-                norm = _normalize_value(value)
-                if norm is not None:
-                    empty = False
-                row[header] = norm
-            if not empty:
-                rows.append(row)
+            # Cells are already normalized above: only trim/pad to the header width.
+            width = len(headers)
+            values = values[:width]
+            if not any(values):
+                continue
+            if len(values) < width:
+                values.extend([None] * (width - len(values)))
+            rows.append(dict(zip(headers, values)))
         if headers is None:
             raise InventoryImportError("Impossibile individuare l'intestazione del foglio Excel.")
         return headers, rows
@@ -301,34 +343,27 @@ def auto_detect_mapping(headers: Iterable[str]) -> dict[str, str | None]:
     mapping: dict[str, str | None] = {field["key"]: None for field in INVENTORY_FIELDS}
     # Use canonicalized lookup so we can match e.g. "N. INV" and "N INV".
     header_lookup = {_canon_header_cell(header): header for header in headers}
-    for field in INVENTORY_FIELDS:
-        targets = AUTO_GUESS.get(field["key"], set())
-        for candidate in targets:
-            canon = _canon_header_cell(candidate)
-            if canon in header_lookup:
-                mapping[field["key"]] = header_lookup[canon]
+    for canon, header in header_lookup.items():
+        for key in _AUTO_GUESS_REVERSE.get(canon, ()):
+            if mapping.get(key) is None:
+                mapping[key] = header
+    # Helpful fallback for common exports: map "note" to location if notes are missing.
+    if mapping.get("note") is None:
+        for canon_alt in _NOTE_FALLBACK_CANON:
+            if canon_alt in header_lookup:
+                mapping["note"] = header_lookup[canon_alt]
                 break
-        # Helpful fallback for common exports: map "note" to location if notes are missing.
-        if field["key"] == "note" and mapping.get("note") is None:
-            for alt in ("ubicazione", "posizione", "location"):
-                canon_alt = _canon_header_cell(alt)
-                if canon_alt in header_lookup:
-                    mapping["note"] = header_lookup[canon_alt]
-                    break
     return mapping
 
 
 def apply_mapping(rows: List[dict], mapping: dict[str, str | None]) -> List[dict[str, str | None]]:
     """Return normalized dictionaries with keys from INVENTORY_FIELDS."""
-    mapped_rows: list[dict[str, str | None]] = []
-    for source in rows:
-        mapped: dict[str, str | None] = {}
-        for field in INVENTORY_FIELDS:
-            key = field["key"]
-            header = mapping.get(key)
-            mapped[key] = _normalize_value(source.get(header)) if header else None
-        mapped_rows.append(mapped)
-    return mapped_rows
+    # Resolve the field -> source header layout once instead of per row.
+    plan = [(field["key"], mapping.get(field["key"])) for field in INVENTORY_FIELDS]
+    return [
+        {key: (_normalize_value(source.get(header)) if header else None) for key, header in plan}
+        for source in rows
+    ]
 
 
 __all__ = [
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import sqlite3
 from typing import Any
 
 from database import fetch_all, fetch_one, get_connection
@@ -198,7 +199,7 @@ def dismiss_item(
     item = _ensure_item(item_id)
     if item.get("is_dismesso"):
         return False
-    if get_active_loan(item_id):
+    if _has_active_loan(item_id):
         raise ValueError("Impossibile dismettere: l'oggetto risulta 'In prestito'. Registra prima il reso.")
 
     ts = dismesso_at or now_iso()
@@ -243,20 +244,14 @@ def list_items() -> list[dict]:
     """List all inventory items with active loan summary."""
     sql = """
     SELECT i.*,
-           al.id AS active_loan_id,
            al.socio_id AS active_socio_id,
            al.data_prestito AS active_data_prestito,
            s.nome AS active_socio_nome,
            s.cognome AS active_socio_cognome,
            s.matricola AS active_socio_matricola
       FROM magazzino_items i
-      LEFT JOIN (
-           SELECT * FROM (
-               SELECT ml.*, ROW_NUMBER() OVER (PARTITION BY ml.item_id ORDER BY ml.data_prestito ASC, ml.id ASC) AS rn
-                 FROM magazzino_loans ml
-                WHERE ml.data_reso IS NULL
-           ) WHERE rn = 1
-      ) al ON al.item_id = i.id
+      -- active_loan_id is kept current by triggers on magazzino_loans
+      LEFT JOIN magazzino_loans al ON al.id = i.active_loan_id
       LEFT JOIN soci s ON s.id = al.socio_id
      ORDER BY i.numero_inventario COLLATE NOCASE, i.id ASC
     """
@@ -310,8 +305,20 @@ def get_active_loan(item_id: int) -> dict | None:
     return dict(row) if row else None
 
 
-def _ensure_no_active_loan(item_id: int):
-    if get_active_loan(item_id):
+_ACTIVE_LOAN_EXISTS_SQL = (
+    "SELECT 1 FROM magazzino_loans WHERE item_id = ? AND data_reso IS NULL LIMIT 1"
+)
+
+
+def _has_active_loan(item_id: int, conn: sqlite3.Connection | None = None) -> bool:
+    """Return True if the item has an open loan (index-only existence probe)."""
+    if conn is not None:
+        return conn.execute(_ACTIVE_LOAN_EXISTS_SQL, (item_id,)).fetchone() is not None
+    return fetch_one(_ACTIVE_LOAN_EXISTS_SQL, (item_id,)) is not None
+
+
+def _ensure_no_active_loan(item_id: int, conn: sqlite3.Connection | None = None):
+    if _has_active_loan(item_id, conn):
         raise ValueError("L'oggetto risulta già in prestito")
 
 
@@ -323,7 +330,6 @@ def create_loan(item_id: int, *, socio_id: int, data_prestito: str | None = None
         raise ValueError("Impossibile prestare: l'oggetto risulta dismesso")
     if socio_id is None:
         raise ValueError("Selezionare un socio valido")
-    _ensure_no_active_loan(item_id)
     iso_date = _normalize_date(data_prestito) or today_iso()
     timestamp = now_iso()
     payload = (
@@ -338,10 +344,18 @@ def create_loan(item_id: int, *, socio_id: int, data_prestito: str | None = None
         "INSERT INTO magazzino_loans (item_id, socio_id, data_prestito, note, created_at, updated_at) "
         "VALUES (?, ?, ?, ?, ?, ?)"
     )
-    with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute(sql, payload)
-        new_id = cur.lastrowid
+    try:
+        with get_connection() as conn:
+            # Probe and insert on the same connection; the partial UNIQUE index
+            # on open loans rejects a concurrent insert that slipped past the probe.
+            _ensure_no_active_loan(item_id, conn)
+            cur = conn.cursor()
+            cur.execute(sql, payload)
+            new_id = cur.lastrowid
+    except sqlite3.IntegrityError as exc:
+        if "UNIQUE" not in str(exc).upper():
+            raise
+        raise ValueError("L'oggetto risulta già in prestito") from exc
     if new_id is None:
         raise RuntimeError("Impossibile determinare l'ID del prestito")
     return int(new_id)
@@ -10,7 +10,7 @@ import sys
 
 # Import configuration
 from config import (
-    APP_NAME, APP_VERSION, AUTHOR, BUILD_ID, BUILD_DATE,
+    APP_NAME, APP_VERSION, AUTHOR,
     BASE_DIR, DATA_DIR, BACKUP_DIR, DOCS_BASE, TRASH_DIR, SEC_DOCS, LOG_DIR,
     DB_NAME, CONFIG_JSON, PRESETS_JSON, CAUSALI_JSON, APP_LOG,
     SEC_CATEGORIES, DEFAULT_CONFIG,
@@ -41,22 +41,24 @@ set_config_paths(CONFIG_JSON, SEC_DOCS, DEFAULT_CONFIG, list(SEC_CATEGORIES))
 set_docs_base(DOCS_BASE)
 
 logger.debug(f"App Version: {APP_VERSION}")
-logger.debug(f"Build ID: {BUILD_ID} ({BUILD_DATE})")
 logger.debug(f"Base Directory: {BASE_DIR}")
 
-# Initialize database
-init_db()
-logger.debug("Database initialized")
+# The splash only needs tkinter: show it before the heavy startup work and
+# the UI imports so it appears as early as possible.
+from v4_ui.loading_window import LoadingWindow
 
-# Perform startup backup
-backup_on_startup(DB_NAME, get_backup_dir())
 
-# Import the main App class and loading splash
-from v4_ui.main_window import App
-from v4_ui.loading_window import LoadingWindow
-from startup_checks import collect_startup_issues
+def _warm_optional_imports() -> None:
+    """Pre-import heavy optional modules used by the import/export wizards."""
+    try:
+        import openpyxl  # noqa: F401
+    except Exception:
+        pass
+
 
 if __name__ == "__main__":
+    import threading
+
     logger.info("Starting application...")
     loading = LoadingWindow(
         app_name=APP_NAME,
@@ -67,6 +69,23 @@ if __name__ == "__main__":
     )
     try:
         loading.show()
+        # Build info is computed on first access (config.__getattr__): read it
+        # only once the splash is on screen.
+        import config
+        logger.debug(f"Build ID: {config.BUILD_ID} ({config.BUILD_DATE})")
+        threading.Thread(target=_warm_optional_imports, name="warm-imports", daemon=True).start()
+
+        loading.set_status("Inizializzazione database...")
+        init_db()
+        logger.debug("Database initialized")
+
+        # Perform startup backup
+        backup_on_startup(DB_NAME, get_backup_dir())
+
+        loading.set_status("Caricamento interfaccia...")
+        from v4_ui.main_window import App
+        from startup_checks import collect_startup_issues
+
         loading.set_status("Verifica ambiente...")
         startup_issues = collect_startup_issues()
     finally:
@@ -3,8 +3,8 @@
 Data models and validation for GLR Gestione Locale Radioamatori
 """
 
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Optional
 from datetime import date, datetime
 import re
 import logging
@@ -12,8 +12,30 @@ from exceptions import ValidationError, RequiredFieldError, InvalidFormatError
 
 logger = logging.getLogger("librosoci")
 
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')  # RFC 5322 simplified
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_QUOTA_RE = re.compile(r'^[A-Z0-9]{1,3}$')
+_CF_RE = re.compile(r'[A-Z0-9]{16}')
+_CAP_RE = re.compile(r'[0-9]{5}')
+_PROV_RE = re.compile(r'[A-Z]{2}')
 
-@dataclass
+# Columns stored as 0/1 in the database
+_BOOL_FIELDS = ('attivo', 'voto', 'privacy_ok', 'privacy_signed')
+
+
+# Values read as True; 1 also covers True (equal hash)
+_TRUTHY = frozenset({1, '1', 'True', 'true', '1.0'})
+
+
+def _coerce_bool(value):
+    """Convert a DB/form boolean (0/1, '1', 'true', ...) to bool; other values pass through."""
+    if isinstance(value, (int, str)):
+        return value in _TRUTHY
+    return value
+
+
+@dataclass(slots=True)
 class Member:
     """
     Member (Socio) data model with built-in validation.
@@ -74,16 +96,20 @@ class Member:
     q1: Optional[str] = None
     q2: Optional[str] = None
     
+    # Field metadata, filled in once after the class definition
+    _FIELD_NAMES: ClassVar[frozenset[str]]
+    
     def __post_init__(self):
         """Validate data after initialization."""
         self._validate_required_fields()
-        self._validate_email()
-        self._validate_codicefiscale()
-        self._validate_cap()
-        self._validate_provincia()
-        self._validate_dates()
-        self._validate_socio()
-        self._validate_quota_codes()
+        # socio: an empty string is stored as None (other fields keep "")
+        if self.socio == "":
+            self.socio = None
+        # Optional fields: one pass, validators run only for non-empty values
+        for field_name, validate in _OPTIONAL_VALIDATORS:
+            value = getattr(self, field_name)
+            if value:
+                setattr(self, field_name, validate(field_name, value))
     
     def _validate_required_fields(self):
         """Validate required fields are not empty."""
@@ -97,127 +123,6 @@ class Member:
         self.nome = self.nome.strip()
         self.cognome = self.cognome.strip()
     
-    def _validate_email(self):
-        """Validate email format if provided."""
-        if self.email:
-            email = self.email.strip()
-            if not email:
-                self.email = None
-                return
-            
-            # RFC 5322 simplified pattern
-            pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(pattern, email):
-                raise InvalidFormatError("email", f"Formato non valido: {email}")
-            
-            self.email = email.lower()  # Normalize to lowercase
-    
-    def _validate_codicefiscale(self):
-        """Validate Italian fiscal code format if provided."""
-        if self.codicefiscale:
-            cf = self.codicefiscale.strip().upper()
-            if not cf:
-                self.codicefiscale = None
-                return
-            
-            # Italian CF: 16 alphanumeric characters
-            if len(cf) != 16:
-                raise InvalidFormatError("codicefiscale", f"Deve essere 16 caratteri: {cf}")
-            
-            if not cf.isalnum():
-                raise InvalidFormatError("codicefiscale", f"Contiene caratteri non validi: {cf}")
-            
-            self.codicefiscale = cf
-    
-    def _validate_cap(self):
-        """Validate Italian postal code format if provided."""
-        if self.cap:
-            cap = self.cap.strip()
-            if not cap:
-                self.cap = None
-                return
-            
-            # Italian CAP: 5 digits
-            if not cap.isdigit() or len(cap) != 5:
-                raise InvalidFormatError("cap", f"Deve essere 5 cifre: {cap}")
-            
-            self.cap = cap
-    
-    def _validate_provincia(self):
-        """Validate Italian province code if provided."""
-        if self.provincia:
-            prov = self.provincia.strip().upper()
-            if not prov:
-                self.provincia = None
-                return
-            
-            # Province code: 2 uppercase letters
-            if len(prov) != 2 or not prov.isalpha():
-                raise InvalidFormatError("provincia", f"Deve essere 2 lettere: {prov}")
-            
-            self.provincia = prov
-
-    def _validate_socio(self):
-        """Validate socio membership type."""
-        if self.socio is None:
-            return
-        socio = self.socio.strip().upper()
-        if not socio:
-            self.socio = None
-            return
-
-        allowed = {"HAM", "RCL", "THR", "ORD"}
-        if socio not in allowed:
-            raise InvalidFormatError("socio", "Valori validi: HAM, RCL, THR, ORD")
-
-        self.socio = socio
-    
-    def _validate_dates(self):
-        """Validate date formats (ISO YYYY-MM-DD)."""
-        date_fields = [
-            ('data_nascita', self.data_nascita),
-            ('data_iscrizione', self.data_iscrizione),
-            ('data_dimissioni', self.data_dimissioni),
-            ('delibera_data', self.delibera_data),
-            ('privacy_data', self.privacy_data),
-            ('privacy_scadenza', self.privacy_scadenza),
-        ]
-        
-        for field_name, field_value in date_fields:
-            if field_value:
-                value = field_value.strip()
-                if not value:
-                    setattr(self, field_name, None)
-                    continue
-                
-                # Validate ISO format
-                if not re.match(r'^\d{4}-\d{2}-\d{2}$', value):
-                    raise InvalidFormatError(field_name, f"Formato data non valido (usa YYYY-MM-DD): {value}")
-                
-                # Validate date exists
-                try:
-                    year, month, day = map(int, value.split('-'))
-                    date(year, month, day)
-                except ValueError as e:
-                    raise InvalidFormatError(field_name, f"Data non valida: {value}")
-    
-    def _validate_quota_codes(self):
-        """Validate quota codes format (Q0/Q1/Q2)."""
-        quota_pattern = re.compile(r'^[A-Z0-9]{1,3}$')
-        
-        for quota_field in ['q0', 'q1', 'q2']:
-            quota_value = getattr(self, quota_field)
-            if quota_value:
-                quota = quota_value.strip().upper()
-                if not quota:
-                    setattr(self, quota_field, None)
-                    continue
-                
-                if not quota_pattern.match(quota):
-                    raise InvalidFormatError(quota_field, f"Formato non valido (2-3 caratteri alfanumerici maiuscoli): {quota}")
-                
-                setattr(self, quota_field, quota)
-    
     def to_dict(self) -> dict:
         """
         Convert member to dictionary for database storage.
@@ -281,15 +186,12 @@ class Member:
             ValidationError: If validation fails
         """
         # Convert boolean fields from DB (0/1) to Python bool
-        bool_fields = ['attivo', 'voto', 'privacy_ok', 'privacy_signed']
-        for field in bool_fields:
+        for field in _BOOL_FIELDS:
             if field in data:
-                value = data[field]
-                if isinstance(value, (int, str)):
-                    data[field] = str(value) in ('1', 'True', 'true', '1.0')
+                data[field] = _coerce_bool(data[field])
         
         # Filter only fields that exist in Member dataclass
-        valid_fields = {f.name for f in cls.__dataclass_fields__.values()}
+        valid_fields = cls._FIELD_NAMES
         filtered_data = {k: v for k, v in data.items() if k in valid_fields}
         
         return cls(**filtered_data)
@@ -299,6 +201,112 @@ class Member:
         return f"{self.cognome} {self.nome} (Mat. {self.matricola or 'N/A'})"
 
 
+# Field metadata cached once (used by from_dict on every row)
+# (dataclasses.fields() excludes the ClassVar entries of __dataclass_fields__)
+Member._FIELD_NAMES = frozenset(f.name for f in fields(Member))
+
+
+# Optional field validators: (field_name, value) -> normalized value.
+# Called only for non-empty values; whitespace-only input becomes None.
+
+def _validate_email(field_name: str, value: str) -> Optional[str]:
+    """Validate email format."""
+    email = value.strip()
+    if not email:
+        return None
+    if not _EMAIL_RE.match(email):
+        raise InvalidFormatError(field_name, f"Formato non valido: {email}")
+    return email.lower()  # Normalize to lowercase
+
+
+def _validate_codicefiscale(field_name: str, value: str) -> Optional[str]:
+    """Validate Italian fiscal code format (16 alphanumeric characters)."""
+    cf = value.strip().upper()
+    if not cf:
+        return None
+    if not _CF_RE.fullmatch(cf):
+        if len(cf) != 16:
+            raise InvalidFormatError(field_name, f"Deve essere 16 caratteri: {cf}")
+        raise InvalidFormatError(field_name, f"Contiene caratteri non validi: {cf}")
+    return cf
+
+
+def _validate_cap(field_name: str, value: str) -> Optional[str]:
+    """Validate Italian postal code format (5 digits)."""
+    cap = value.strip()
+    if not cap:
+        return None
+    if not _CAP_RE.fullmatch(cap):
+        raise InvalidFormatError(field_name, f"Deve essere 5 cifre: {cap}")
+    return cap
+
+
+def _validate_provincia(field_name: str, value: str) -> Optional[str]:
+    """Validate Italian province code (2 letters)."""
+    prov = value.strip().upper()
+    if not prov:
+        return None
+    if not _PROV_RE.fullmatch(prov):
+        raise InvalidFormatError(field_name, f"Deve essere 2 lettere: {prov}")
+    return prov
+
+
+def _validate_date(field_name: str, value: str) -> Optional[str]:
+    """Validate an ISO YYYY-MM-DD date (the stored value is left unchanged)."""
+    text = value.strip()
+    if not text:
+        return None
+    if not _ISO_DATE_RE.match(text):
+        raise InvalidFormatError(field_name, f"Formato data non valido (usa YYYY-MM-DD): {text}")
+    # The regex keeps the strict format: fromisoformat also accepts week dates
+    try:
+        date.fromisoformat(text)
+    except ValueError:
+        raise InvalidFormatError(field_name, f"Data non valida: {text}")
+    return value
+
+
+def _validate_socio(field_name: str, value: str) -> Optional[str]:
+    """Validate socio membership type."""
+    socio = value.strip().upper()
+    if not socio:
+        return None
+    if socio not in _SOCIO_TYPES:
+        raise InvalidFormatError(field_name, "Valori validi: HAM, RCL, THR, ORD")
+    return socio
+
+
+def _validate_quota(field_name: str, value: str) -> Optional[str]:
+    """Validate a quota code (Q0/Q1/Q2)."""
+    quota = value.strip().upper()
+    if not quota:
+        return None
+    if not _QUOTA_RE.match(quota):
+        raise InvalidFormatError(field_name, f"Formato non valido (2-3 caratteri alfanumerici maiuscoli): {quota}")
+    return quota
+
+
+_SOCIO_TYPES = frozenset({"HAM", "RCL", "THR", "ORD"})
+
+# Validation order matches the historical __post_init__ sequence
+_OPTIONAL_VALIDATORS = (
+    ('email', _validate_email),
+    ('codicefiscale', _validate_codicefiscale),
+    ('cap', _validate_cap),
+    ('provincia', _validate_provincia),
+    ('data_nascita', _validate_date),
+    ('data_iscrizione', _validate_date),
+    ('data_dimissioni', _validate_date),
+    ('delibera_data', _validate_date),
+    ('privacy_data', _validate_date),
+    ('privacy_scadenza', _validate_date),
+    ('socio', _validate_socio),
+    ('q0', _validate_quota),
+    ('q1', _validate_quota),
+    ('q2', _validate_quota),
+)
+
+
 # Validation helper functions (for backward compatibility)
 
 def validate_member_data(data: dict) -> Member:
@@ -317,6 +325,18 @@ def validate_member_data(data: dict) -> Member:
     return Member.from_dict(data)
 
 
+# Field-specific normalization applied by sanitize_member_input
+_INPUT_NORMALIZERS = {
+    'email': str.lower,
+    'codicefiscale': str.upper,
+    'provincia': str.upper,
+    'q0': str.upper,
+    'q1': str.upper,
+    'q2': str.upper,
+    'socio': str.upper,
+}
+
+
 def sanitize_member_input(raw_data: dict) -> dict:
     """
     Sanitize and normalize member input data.
@@ -344,10 +364,9 @@ def sanitize_member_input(raw_data: dict) -> dict:
                 continue
             
             # Normalize specific fields
-            if key == 'email':
-                value = value.lower()
-            elif key in ('codicefiscale', 'provincia', 'q0', 'q1', 'q2', 'socio'):
-                value = value.upper()
+            normalize = _INPUT_NORMALIZERS.get(key)
+            if normalize is not None:
+                value = normalize(value)
         
         sanitized[key] = value
     
@@ -5,27 +5,32 @@ from __future__ import annotations
 
 import os
 import re
-import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from database import (
     add_calendar_event,
     delete_calendar_event,
-    fetch_all,
+    fetch_all_dicts,
     fetch_one,
     get_connection,
     update_calendar_event,
 )
 from utils import ddmmyyyy_to_iso, now_iso
-from file_archiver import unique_hex_filename
+from file_archiver import copy_file, unique_hex_filename
 
 DEFAULT_REMINDER_DAYS = 60
 EVENT_TYPE = "ponte_autorizzazione"
 DEFAULT_PONTI_DOCS_BASE = Path("data/documents/ponti")
 PONTI_DOCS_BASE = DEFAULT_PONTI_DOCS_BASE
 _SAFE_TOKEN_RE = re.compile(r"[^A-Z0-9]+")
+# ASCII characters that _SAFE_TOKEN_RE replaces with "_" (after upper())
+_SAFE_TOKEN_TABLE = str.maketrans(
+    {c: "_" for c in range(128) if not ("A" <= chr(c) <= "Z" or "0" <= chr(c) <= "9")}
+)
 
 __all__ = [
     "create_ponte",
@@ -41,13 +46,26 @@ __all__ = [
     "list_ponte_documents",
     "update_ponte_document",
     "delete_ponte_document",
+    "delete_ponte_documents",
 ]
 
 
+# Directories already created in this process (reset when the base changes)
+_ensured_dirs: set[Path] = set()
+
+
 def set_ponti_docs_base(base_path: str | Path):
     """Override the base folder used to store ponti documents."""
     global PONTI_DOCS_BASE
     PONTI_DOCS_BASE = Path(base_path)
+    _ensured_dirs.clear()
+
+
+def _ensure_dir(path: Path) -> Path:
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
+    return path
 
 
 def _normalize_text(value: Any | None) -> str | None:
@@ -66,14 +84,16 @@ def _require_non_empty(value: Any, field_name: str) -> str:
 
 def _sanitize_token(value: str | None, fallback: str) -> str:
     text = (value or "").strip().upper()
-    text = _SAFE_TOKEN_RE.sub("_", text).strip("_")
+    if text.isascii():
+        # translate + split/join collapses "_" runs and trims them at the edges
+        text = "_".join(filter(None, text.translate(_SAFE_TOKEN_TABLE).split("_")))
+    else:
+        text = _SAFE_TOKEN_RE.sub("_", text).strip("_")
     return text or fallback
 
 
 def _ensure_docs_root() -> Path:
-    base = PONTI_DOCS_BASE or DEFAULT_PONTI_DOCS_BASE
-    base.mkdir(parents=True, exist_ok=True)
-    return base
+    return _ensure_dir(PONTI_DOCS_BASE or DEFAULT_PONTI_DOCS_BASE)
 
 
 def _resolve_ponte_dir(ponte: dict) -> Path:
@@ -81,9 +101,7 @@ def _resolve_ponte_dir(ponte: dict) -> Path:
     label = ponte.get("nome") or ponte.get("nominativo") or ponte.get("qth") or f"PONTE_{ponte['id']}"
     token = _sanitize_token(label, fallback=f"PONTE_{ponte['id']}")
     folder_name = f"{int(ponte['id']):04d}_{token}"
-    target = base / folder_name
-    target.mkdir(parents=True, exist_ok=True)
-    return target
+    return _ensure_dir(base / folder_name)
 
 
 def _copy_into_managed_dir(ponte: dict, source_path: str, tipo: str | None) -> str:
@@ -92,11 +110,11 @@ def _copy_into_managed_dir(ponte: dict, source_path: str, tipo: str | None) -> s
         raise FileNotFoundError(f"File non trovato: {source}")
     target_dir = _resolve_ponte_dir(ponte)
     tipo_label = _sanitize_token(tipo, "DOCUMENTI") if tipo else "DOCUMENTI"
-    final_dir = target_dir / tipo_label
-    final_dir.mkdir(parents=True, exist_ok=True)
+    final_dir = _ensure_dir(target_dir / tipo_label)
+    # unique_hex_filename re-creates final_dir if it was removed behind the cache
     filename = unique_hex_filename(final_dir, source.suffix.lower())
     destination = final_dir / filename
-    shutil.copy2(source, destination)
+    copy_file(source, destination)
     return str(destination)
 
 
@@ -134,8 +152,9 @@ def _date_to_ts(date_iso: str) -> str:
     return f"{date_iso}T09:00:00"
 
 
-def _fetch_ponte_identity(ponte_id: int) -> dict:
-    row = fetch_one("SELECT id, nome, nominativo, qth FROM ponti WHERE id = ?", (ponte_id,))
+def _fetch_ponte_identity(ponte_id: int, conn: sqlite3.Connection | None = None) -> dict:
+    sql = "SELECT id, nome, nominativo, qth FROM ponti WHERE id = ?"
+    row = conn.execute(sql, (ponte_id,)).fetchone() if conn is not None else fetch_one(sql, (ponte_id,))
     if row is None:
         raise ValueError(f"Ponte #{ponte_id} inesistente")
     return dict(row)
@@ -219,8 +238,7 @@ def get_ponte(ponte_id: int) -> dict | None:
         return None
     data = dict(row)
     latest = fetch_one(
-        "SELECT data_scadenza FROM ponti_authorizations WHERE ponte_id = ? AND data_scadenza IS NOT NULL "
-        "ORDER BY data_scadenza DESC LIMIT 1",
+        "SELECT MAX(data_scadenza) AS data_scadenza FROM ponti_authorizations WHERE ponte_id = ?",
         (ponte_id,),
     )
     data["next_scadenza"] = latest["data_scadenza"] if latest else None
@@ -229,10 +247,10 @@ def get_ponte(ponte_id: int) -> dict | None:
 
 def list_ponti(*, stato: str | None = None) -> list[dict]:
     """Return all ponti optionally filtered by status."""
+    # MAX() over idx_ponti_auth_ponte_scadenza is a single index seek per ponte
     sql = (
         "SELECT p.*, ("
-        "SELECT data_scadenza FROM ponti_authorizations pa WHERE pa.ponte_id = p.id AND pa.data_scadenza IS NOT NULL "
-        "ORDER BY pa.data_scadenza DESC LIMIT 1"
+        "SELECT MAX(pa.data_scadenza) FROM ponti_authorizations pa WHERE pa.ponte_id = p.id"
         ") AS next_scadenza FROM ponti p"
     )
     params: list[Any] = []
@@ -240,12 +258,11 @@ def list_ponti(*, stato: str | None = None) -> list[dict]:
         sql += " WHERE p.stato_corrente = ?"
         params.append(stato.upper())
     sql += " ORDER BY p.nome COLLATE NOCASE"
-    rows = fetch_all(sql, tuple(params)) if params else fetch_all(sql)
-    return [dict(row) for row in rows]
+    return fetch_all_dicts(sql, tuple(params))
 
 
 def list_authorizations(ponte_id: int) -> list[dict]:
-    rows = fetch_all(
+    return fetch_all_dicts(
         """
         SELECT pa.*, ce.reminder_days
           FROM ponti_authorizations pa
@@ -255,23 +272,20 @@ def list_authorizations(ponte_id: int) -> list[dict]:
         """,
         (ponte_id,),
     )
-    return [dict(r) for r in rows]
 
 
 def delete_authorization(authorization_id: int) -> bool:
-    row = fetch_one(
-        "SELECT calendar_event_id FROM ponti_authorizations WHERE id = ?",
-        (authorization_id,),
-    )
-    if row is None:
-        return False
-    row_dict = dict(row)
-    event_id = row_dict.get("calendar_event_id")
-    if event_id:
-        delete_calendar_event(event_id)
     with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute("DELETE FROM ponti_authorizations WHERE id = ?", (authorization_id,))
+        row = conn.execute(
+            "SELECT calendar_event_id FROM ponti_authorizations WHERE id = ?",
+            (authorization_id,),
+        ).fetchone()
+        if row is None:
+            return False
+        event_id = row["calendar_event_id"]
+        if event_id:
+            delete_calendar_event(event_id, conn=conn)
+        cur = conn.execute("DELETE FROM ponti_authorizations WHERE id = ?", (authorization_id,))
         return cur.rowcount > 0
 
 
@@ -284,10 +298,11 @@ def _sync_authorization_event(
     promoter_note: str | None,
     reminder_days: int,
     enable_reminder: bool,
+    conn: sqlite3.Connection | None = None,
 ) -> int | None:
     if not enable_reminder or not scadenza_iso:
         if existing_event_id:
-            delete_calendar_event(existing_event_id)
+            delete_calendar_event(existing_event_id, conn=conn)
         return None
     titolo = ponte.get("nome") or ponte.get("nominativo") or f"Ponte #{ponte['id']}"
     event_title = f"Scadenza autorizzazione {titolo}"
@@ -300,6 +315,7 @@ def _sync_authorization_event(
             descrizione=descrizione,
             start_ts=start_ts,
             reminder_days=reminder_days,
+            conn=conn,
         )
         return existing_event_id
     return add_calendar_event(
@@ -309,6 +325,7 @@ def _sync_authorization_event(
         start_ts=start_ts,
         reminder_days=reminder_days,
         origin=f"ponte:{ponte['id']}#autorizzazione:{authorization_id}",
+        conn=conn,
     )
 
 
@@ -327,7 +344,6 @@ def save_authorization(
     enable_reminder: bool = True,
 ) -> int:
     """Insert or update an authorization and keep reminder in sync."""
-    ponte = _fetch_ponte_identity(ponte_id)
     tipo_norm = _require_non_empty(tipo, "tipo")
     rilascio_iso = _normalize_date(data_rilascio)
     scadenza_iso = _normalize_date(data_scadenza)
@@ -340,14 +356,16 @@ def save_authorization(
         _normalize_text(documento_path),
         _normalize_text(note),
     )
-    if authorization_id is not None:
-        existing = fetch_one(
-            "SELECT id, calendar_event_id FROM ponti_authorizations WHERE id = ? AND ponte_id = ?",
-            (authorization_id, ponte_id),
-        )
-        if existing is None:
-            raise ValueError("Autorizzazione non trovata per il ponte indicato")
-        with get_connection() as conn:
+    # Authorization row and reminder event are written in a single transaction.
+    with get_connection() as conn:
+        ponte = _fetch_ponte_identity(ponte_id, conn)
+        if authorization_id is not None:
+            existing = conn.execute(
+                "SELECT id, calendar_event_id FROM ponti_authorizations WHERE id = ? AND ponte_id = ?",
+                (authorization_id, ponte_id),
+            ).fetchone()
+            if existing is None:
+                raise ValueError("Autorizzazione non trovata per il ponte indicato")
             conn.execute(
                 """UPDATE ponti_authorizations
                     SET tipo = ?, ente = ?, numero = ?, data_rilascio = ?, data_scadenza = ?,
@@ -355,34 +373,33 @@ def save_authorization(
                   WHERE id = ? AND ponte_id = ?""",
                 payload + (authorization_id, ponte_id),
             )
-        event_id = existing["calendar_event_id"]
-    else:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(
+            event_id = existing["calendar_event_id"]
+        else:
+            cur = conn.execute(
                 """INSERT INTO ponti_authorizations
                     (ponte_id, tipo, ente, numero, data_rilascio, data_scadenza, documento_path, note, calendar_event_id)
                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL)""",
                 (ponte_id,) + payload,
             )
             authorization_id = cur.lastrowid
-        if authorization_id is None:
-            raise RuntimeError("Impossibile determinare l'ID dell'autorizzazione")
-        event_id = None
-    new_event_id = _sync_authorization_event(
-        ponte=ponte,
-        authorization_id=int(authorization_id),
-        scadenza_iso=scadenza_iso,
-        existing_event_id=event_id,
-        promoter_note=payload[-1],
-        reminder_days=reminder_days,
-        enable_reminder=enable_reminder,
-    )
-    with get_connection() as conn:
-        conn.execute(
-            "UPDATE ponti_authorizations SET calendar_event_id = ? WHERE id = ?",
-            (new_event_id, authorization_id),
+            if authorization_id is None:
+                raise RuntimeError("Impossibile determinare l'ID dell'autorizzazione")
+            event_id = None
+        new_event_id = _sync_authorization_event(
+            ponte=ponte,
+            authorization_id=int(authorization_id),
+            scadenza_iso=scadenza_iso,
+            existing_event_id=event_id,
+            promoter_note=payload[-1],
+            reminder_days=reminder_days,
+            enable_reminder=enable_reminder,
+            conn=conn,
         )
+        if new_event_id != event_id:
+            conn.execute(
+                "UPDATE ponti_authorizations SET calendar_event_id = ? WHERE id = ?",
+                (new_event_id, authorization_id),
+            )
     return int(authorization_id)
 
 
@@ -405,11 +422,10 @@ def add_ponte_document(ponte_id: int, document_path: str, *, tipo: str | None =
 
 
 def list_ponte_documents(ponte_id: int) -> list[dict]:
-    rows = fetch_all(
+    return fetch_all_dicts(
         "SELECT * FROM ponti_documents WHERE ponte_id = ? ORDER BY id DESC",
         (ponte_id,),
     )
-    return [dict(r) for r in rows]
 
 
 def update_ponte_document(document_id: int, *, tipo: str | None = None, note: str | None = None) -> bool:
@@ -431,12 +447,28 @@ def update_ponte_document(document_id: int, *, tipo: str | None = None, note: st
 
 
 def delete_ponte_document(document_id: int) -> bool:
-    row = fetch_one("SELECT document_path FROM ponti_documents WHERE id = ?", (document_id,))
-    if row is None:
-        return False
-    row_dict = dict(row)
-    _maybe_remove_file(row_dict.get("document_path"))
+    return delete_ponte_documents([document_id]) > 0
+
+
+def delete_ponte_documents(document_ids: Iterable[int]) -> int:
+    """Delete several ponte documents (files and rows). Returns the rows deleted."""
+    ids = list(dict.fromkeys(int(doc_id) for doc_id in document_ids))
+    if not ids:
+        return 0
+    placeholders = ", ".join("?" for _ in ids)
     with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute("DELETE FROM ponti_documents WHERE id = ?", (document_id,))
-        return cur.rowcount > 0
\ No newline at end of file
+        paths = [
+            row["document_path"]
+            for row in conn.execute(
+                f"SELECT document_path FROM ponti_documents WHERE id IN ({placeholders})", ids
+            )
+        ]
+        if len(paths) > 1:
+            # unlink is I/O bound: overlap the calls on slow (network) drives
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+                list(pool.map(_maybe_remove_file, paths))
+        else:
+            for path in paths:
+                _maybe_remove_file(path)
+        cur = conn.execute(f"DELETE FROM ponti_documents WHERE id IN ({placeholders})", ids)
+        return cur.rowcount
\ No newline at end of file
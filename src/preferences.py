@@ -3,9 +3,10 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Sequence
 
-from config_manager import load_config, save_config
+from config_manager import load_config, load_config_cached, save_config
 from document_types_catalog import DOCUMENT_CATEGORIES, SECTION_DOCUMENT_CATEGORIES
 
 DEFAULT_ROLE_OPTIONS: list[str] = [
@@ -20,56 +21,51 @@ DEFAULT_ROLE_OPTIONS: list[str] = [
     "Bibliotecario",
     "Gestore ponti",
 ]
+_DEFAULT_ROLE_SET = frozenset(DEFAULT_ROLE_OPTIONS)
 
 
 def _sanitize_custom_categories(options: Iterable[str], *, defaults: Sequence[str]) -> list[str]:
     """Return clean list of custom categories without duplicates or empty entries."""
     cleaned: list[str] = []
-    seen: set[str] = set()
-    defaults_lower = {d.lower(): d for d in defaults if d}
+    # Defaults and already accepted values share one case-folded set
+    seen = {d.casefold() for d in defaults if d}
     for opt in options:
         value = (opt or "").strip()
         if not value:
             continue
-        if value.lower() in defaults_lower:
-            continue
-        if value.lower() in seen:
+        key = value.casefold()
+        if key in seen:
             continue
         cleaned.append(value)
-        seen.add(value.lower())
+        seen.add(key)
     return cleaned
 
 
+@lru_cache(maxsize=32)
+def _merge_categories(defaults: tuple[str, ...], custom_categories: tuple[str, ...]) -> tuple[str, ...]:
+    """Return defaults + custom categories (unique case-insensitively, non-empty)."""
+    categories: list[str] = list(defaults)
+    seen = {c.casefold() for c in categories if c}
+    for value in custom_categories:
+        v = (value or "").strip()
+        if not v:
+            continue
+        key = v.casefold()
+        if key in seen:
+            continue
+        categories.append(v)
+        seen.add(key)
+    return tuple(categories)
+
+
 def build_document_categories(custom_categories: Sequence[str] | None = None) -> list[str]:
     """Return member document categories: defaults + custom (unique, non-empty)."""
-    categories: list[str] = list(DOCUMENT_CATEGORIES)
-    seen = {c.lower() for c in categories if c}
-    if custom_categories:
-        for value in custom_categories:
-            v = (value or "").strip()
-            if not v:
-                continue
-            if v.lower() in seen:
-                continue
-            categories.append(v)
-            seen.add(v.lower())
-    return categories
+    return list(_merge_categories(tuple(DOCUMENT_CATEGORIES), tuple(custom_categories or ())))
 
 
 def build_section_document_categories(custom_categories: Sequence[str] | None = None) -> list[str]:
     """Return section document categories: defaults + custom (unique, non-empty)."""
-    categories: list[str] = list(SECTION_DOCUMENT_CATEGORIES)
-    seen = {c.lower() for c in categories if c}
-    if custom_categories:
-        for value in custom_categories:
-            v = (value or "").strip()
-            if not v:
-                continue
-            if v.lower() in seen:
-                continue
-            categories.append(v)
-            seen.add(v.lower())
-    return categories
+    return list(_merge_categories(tuple(SECTION_DOCUMENT_CATEGORIES), tuple(custom_categories or ())))
 
 
 def sanitize_custom_document_categories(options: Iterable[str]) -> list[str]:
@@ -80,28 +76,58 @@ def sanitize_custom_section_document_categories(options: Iterable[str]) -> list[
     return _sanitize_custom_categories(options, defaults=SECTION_DOCUMENT_CATEGORIES)
 
 
-def get_document_categories(cfg: dict | None = None) -> list[str]:
-    """Return merged member document categories using provided config or reloading it."""
+class _ConfigView(NamedTuple):
+    """Validated custom option lists projected from a config dict."""
+
+    document_categories: tuple[str, ...]
+    section_document_categories: tuple[str, ...]
+    role_options: tuple[str, ...]
+
+
+def _custom_list(data, key: str) -> tuple[str, ...]:
+    value = data.get(key) if isinstance(data, dict) else None
+    return tuple(value) if isinstance(value, list) else ()
+
+
+def _project(data) -> _ConfigView:
+    return _ConfigView(
+        _custom_list(data, "custom_document_categories"),
+        _custom_list(data, "custom_section_document_categories"),
+        _custom_list(data, "custom_role_options"),
+    )
+
+
+# (config snapshot, its view): load_config_cached() returns the same dict
+# until the file changes, so the projection is reused by identity.
+_snapshot_view: list = [None, None]
+
+
+def _cached_view() -> _ConfigView:
+    data = load_config_cached()
+    if _snapshot_view[0] is not data:
+        _snapshot_view[:] = [data, _project(data)]
+    return _snapshot_view[1]
+
+
+def _config_view(cfg: dict | None, *, tolerant: bool = False) -> _ConfigView:
+    if cfg is not None:
+        return _project(cfg)
+    if not tolerant:
+        return _cached_view()
     try:
-        data = cfg if cfg is not None else load_config()
+        return _cached_view()
     except Exception:
-        data = cfg if cfg is not None else {}
-    custom = data.get("custom_document_categories") if isinstance(data, dict) else None
-    if not isinstance(custom, list):
-        custom = []
-    return build_document_categories(custom)
+        return _project({})
+
+
+def get_document_categories(cfg: dict | None = None) -> list[str]:
+    """Return merged member document categories using provided config or the cached one."""
+    return build_document_categories(_config_view(cfg, tolerant=True).document_categories)
 
 
 def get_section_document_categories(cfg: dict | None = None) -> list[str]:
-    """Return merged section document categories using provided config or reloading it."""
-    try:
-        data = cfg if cfg is not None else load_config()
-    except Exception:
-        data = cfg if cfg is not None else {}
-    custom = data.get("custom_section_document_categories") if isinstance(data, dict) else None
-    if not isinstance(custom, list):
-        custom = []
-    return build_section_document_categories(custom)
+    """Return merged section document categories using provided config or the cached one."""
+    return build_section_document_categories(_config_view(cfg, tolerant=True).section_document_categories)
 
 
 def _sanitize_custom_roles(options: Iterable[str]) -> list[str]:
@@ -112,7 +138,7 @@ def _sanitize_custom_roles(options: Iterable[str]) -> list[str]:
         value = (opt or "").strip()
         if not value:
             continue
-        if value in DEFAULT_ROLE_OPTIONS:
+        if value in _DEFAULT_ROLE_SET:
             # Already handled as default option, no need to store.
             continue
         if value in seen:
@@ -127,34 +153,21 @@ def sanitize_custom_role_options(options: Iterable[str]) -> list[str]:
     return _sanitize_custom_roles(options)
 
 
-def build_role_options(custom_roles: Sequence[str] | None = None) -> list[str]:
-    """Return the list of role options starting with an empty choice."""
-    options: list[str] = [""]
-    seen: set[str] = {""}
+@lru_cache(maxsize=32)
+def _build_role_options_cached(custom_roles: tuple[str, ...]) -> tuple[str, ...]:
+    # dict.fromkeys dedups while keeping first-seen order; "" leads and absorbs blanks.
+    values = (*DEFAULT_ROLE_OPTIONS, *custom_roles)
+    return tuple(dict.fromkeys(["", *((value or "").strip() for value in values)]))
 
-    def _append(values: Iterable[str]):
-        for value in values:
-            normalized = (value or "").strip()
-            if not normalized:
-                continue
-            if normalized in seen:
-                continue
-            options.append(normalized)
-            seen.add(normalized)
 
-    _append(DEFAULT_ROLE_OPTIONS)
-    if custom_roles:
-        _append(custom_roles)
-    return options
+def build_role_options(custom_roles: Sequence[str] | None = None) -> list[str]:
+    """Return the list of role options starting with an empty choice."""
+    return list(_build_role_options_cached(tuple(custom_roles or ())))
 
 
 def get_role_options(cfg: dict | None = None) -> list[str]:
-    """Return combined role options using the provided config or reloading it."""
-    data = cfg if cfg is not None else load_config()
-    custom = data.get("custom_role_options") if isinstance(data, dict) else None
-    if not isinstance(custom, list):
-        custom = []
-    return build_role_options(custom)
+    """Return combined role options using the provided config or the cached one."""
+    return build_role_options(_config_view(cfg).role_options)
 
 
 def save_custom_role_options(options: Sequence[str]) -> dict:
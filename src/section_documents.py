@@ -9,16 +9,23 @@ Per compatibilita' con installazioni precedenti, resta un'import best-effort da
 """
 from __future__ import annotations
 
+import errno
 import json
 import logging
 import os
+import re
 import secrets
 import shutil
+import sqlite3
+import threading
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List
+from stat import S_ISREG
+from typing import Dict, Iterable, Iterator, List
 
 from config import SEC_DOCS
 from document_types_catalog import DEFAULT_SECTION_CATEGORY, SECTION_DOCUMENT_CATEGORIES
@@ -26,25 +33,49 @@ from document_types_catalog import DEFAULT_SECTION_CATEGORY, SECTION_DOCUMENT_CA
 SECTION_DOCUMENT_ROOT = Path(SEC_DOCS)
 SECTION_METADATA_FILE = SECTION_DOCUMENT_ROOT / "metadata.json"
 SECTION_DOCUMENT_INDEX_FILENAME = "elenco_documenti.txt"
+HASH_CACHE_FILENAME = ".hash_cache.json"
+# Bookkeeping files that are never section documents
+_RESERVED_NAMES = frozenset({SECTION_DOCUMENT_INDEX_FILENAME, SECTION_METADATA_FILE.name, HASH_CACHE_FILENAME})
 METADATA_SCHEMA_VERSION = 1
 
 logger = logging.getLogger("librosoci")
 
 
+@lru_cache(maxsize=8)
+def _resolved_dir(path: Path) -> Path:
+    return path.resolve()
+
+
+def _root() -> Path:
+    """Resolved SECTION_DOCUMENT_ROOT, cached per configured root (tests swap it)."""
+    return _resolved_dir(SECTION_DOCUMENT_ROOT)
+
+
 # Naming convention aligned with member docs: <hex token> + extension.
 # Use a different length to distinguish section docs from member docs.
 SECTION_DOC_TOKEN_LENGTH = 15
 
 
+@lru_cache(maxsize=None)
+def _hex_token_matcher(length: int):
+    """fullmatch of a compiled pattern accepting exactly `length` hex digits."""
+    return re.compile(f"[0-9a-fA-F]{{{length}}}").fullmatch
+
+
 def _sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
     with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # Older interpreters: one reusable buffer instead of a bytes object per chunk.
+        h = hashlib.sha256()
+        buf = bytearray(1024 * 1024)
+        view = memoryview(buf)
         while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
+            n = f.readinto(buf)
+            if not n:
                 break
-            h.update(chunk)
-    return h.hexdigest()
+            h.update(view[:n])
+        return h.hexdigest()
 
 
 def _safe_sha256_file(path: Path) -> str | None:
@@ -63,17 +94,89 @@ def _iter_files_in_dir(directory: Path) -> Iterable[Path]:
         return
 
 
+# Digest side-cache: absolute path -> {"size", "mtime_ns", "sha256"}, stored
+# in SECTION_DOCUMENT_ROOT and loaded on first use (per configured root).
+_hash_cache: dict[str, dict] | None = None
+_hash_cache_path: Path | None = None
+
+
+def _load_hash_cache() -> dict[str, dict]:
+    global _hash_cache, _hash_cache_path
+    cache_path = SECTION_DOCUMENT_ROOT / HASH_CACHE_FILENAME
+    if _hash_cache is not None and _hash_cache_path == cache_path:
+        return _hash_cache
+    data: dict[str, dict] = {}
+    try:
+        with cache_path.open("r", encoding="utf-8") as handle:
+            raw = json.load(handle)
+        if isinstance(raw, dict):
+            data = {str(k): v for k, v in raw.items() if isinstance(v, dict)}
+    except FileNotFoundError:
+        pass
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Cache hash documenti sezione non leggibile: %s", exc)
+    _hash_cache, _hash_cache_path = data, cache_path
+    return data
+
+
+def _save_hash_cache(cache: dict[str, dict]) -> None:
+    cache_path = SECTION_DOCUMENT_ROOT / HASH_CACHE_FILENAME
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(cache, handle, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        logger.warning("Impossibile salvare cache hash documenti sezione: %s", exc)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
 def _build_hash_index(directory: Path) -> dict[str, Path]:
-    """Build a best-effort SHA256 -> Path map for files in directory."""
+    """Build a best-effort SHA256 -> Path map for files in directory.
+
+    Digests are reused from the side-cache while a file's size and mtime are
+    unchanged, so only new or modified files are read.
+    """
     index: dict[str, Path] = {}
-    for p in _iter_files_in_dir(directory):
+    cache = _load_hash_cache()
+    dirty = False
+    seen: set[str] = set()
+    try:
+        with os.scandir(directory) as it:
+            entries = [entry for entry in it if entry.is_file()]
+    except OSError:
+        return index
+    for entry in entries:
         # Skip non-doc helper files
-        if p.name.lower() == SECTION_DOCUMENT_INDEX_FILENAME.lower():
+        if entry.name.lower() == SECTION_DOCUMENT_INDEX_FILENAME.lower():
             continue
-        digest = _safe_sha256_file(p)
+        key = os.path.abspath(entry.path)
+        seen.add(key)
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        cached = cache.get(key)
+        if cached and cached.get("size") == st.st_size and cached.get("mtime_ns") == st.st_mtime_ns:
+            digest = cached.get("sha256")
+        else:
+            digest = _safe_sha256_file(Path(entry.path))
+            if digest:
+                cache[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+                dirty = True
         if not digest:
             continue
-        index.setdefault(digest, p)
+        index.setdefault(digest, Path(entry.path))
+    # Forget files that are no longer in this directory.
+    dir_key = os.path.abspath(directory)
+    for key in [k for k in cache if k not in seen and os.path.dirname(k) == dir_key]:
+        del cache[key]
+        dirty = True
+    if dirty:
+        _save_hash_cache(cache)
     return index
 
 
@@ -87,12 +190,7 @@ def _preferred_token_for_content(digest_hex: str) -> str | None:
 
 def _is_hex_token(value: str, *, length: int) -> bool:
     text = (value or "").strip()
-    if len(text) != length:
-        return False
-    for ch in text:
-        if ch not in "0123456789abcdefABCDEF":
-            return False
-    return True
+    return _hex_token_matcher(length)(text) is not None
 
 
 def _is_abs_path(value: str | None) -> bool:
@@ -117,7 +215,7 @@ def _resolve_to_absolute(
     under the configured root_dir.
     """
 
-    root = (root_dir or SECTION_DOCUMENT_ROOT).resolve()
+    root = _resolved_dir(Path(root_dir)) if root_dir else _root()
     candidate = (percorso_or_rel or "").strip()
     fallback = (fallback_rel or "").strip()
 
@@ -132,7 +230,8 @@ def _resolve_to_absolute(
         p = Path(rel)
         if p.is_absolute():
             return p
-        return (root / rel).resolve()
+        # root is already resolved: lexical normalization is enough here.
+        return Path(os.path.normpath(root / rel))
 
     resolved_fallback: Path | None = None
     if fallback:
@@ -152,6 +251,25 @@ def _resolve_to_absolute(
     return None
 
 
+def _scan_orphan_candidates(directory: Path) -> list[tuple[Path, float]]:
+    """Return (path, mtime) for the files of a category folder (index file excluded)."""
+    files: list[tuple[Path, float]] = []
+    try:
+        # scandir reuses the directory listing for the type check and
+        # caches the stat result per entry.
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name == SECTION_DOCUMENT_INDEX_FILENAME or not entry.is_file():
+                    continue
+                try:
+                    files.append((Path(entry.path), entry.stat().st_mtime))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    return files
+
+
 def _db_backfill_registry() -> None:
     """Ensure section documents are tracked in DB (best effort).
 
@@ -162,13 +280,22 @@ def _db_backfill_registry() -> None:
     try:
         from database import (
             add_section_document_record,
-            get_section_document_by_relative_path,
+            get_connection,
+            list_section_document_relative_paths,
         )
+        from exceptions import DatabaseLockError, map_sqlite_exception
     except Exception:
         return
 
     ensure_section_structure()
 
+    try:
+        known_paths = list_section_document_relative_paths()
+    except Exception:
+        return
+
+    pending: list[dict] = []
+
     def _safe_insert(
         *,
         hash_id: str,
@@ -182,53 +309,41 @@ def _db_backfill_registry() -> None:
         uploaded_at: str,
         absolute_path: str,
     ):
-        # Best-effort: tolerate transient locks (e.g. antivirus/backup or concurrent instance)
-        for attempt in range(3):
-            try:
-                if get_section_document_by_relative_path(relative_path):
-                    return
-                add_section_document_record(
-                    hash_id=hash_id,
-                    nome_file=stored_name,
-                    percorso=absolute_path,
-                    tipo="documento",
-                    data_caricamento=uploaded_at,
-                    categoria=categoria,
-                    descrizione=descrizione,
-                    protocollo=protocollo,
-                    verbale_numero=verbale_numero,
-                    original_name=original_name,
-                    stored_name=stored_name,
-                    relative_path=relative_path,
-                    uploaded_at=uploaded_at,
-                )
-                return
-            except Exception as exc:
-                try:
-                    from exceptions import DatabaseLockError
-
-                    is_lock = isinstance(exc, DatabaseLockError)
-                except Exception:
-                    is_lock = False
-
-                if is_lock and attempt < 2:
-                    time.sleep(0.25 * (attempt + 1))
-                    continue
-                return
+        if relative_path in known_paths:
+            return
+        known_paths.add(relative_path)
+        pending.append(
+            dict(
+                hash_id=hash_id,
+                nome_file=stored_name,
+                percorso=absolute_path,
+                tipo="documento",
+                data_caricamento=uploaded_at,
+                categoria=categoria,
+                descrizione=descrizione,
+                protocollo=protocollo,
+                verbale_numero=verbale_numero,
+                original_name=original_name,
+                stored_name=stored_name,
+                relative_path=relative_path,
+                uploaded_at=uploaded_at,
+            )
+        )
 
     # 1) Import existing metadata.json entries
     metadata = _load_metadata()
     for hash_id, payload in metadata.items():
         rel_path = payload.get("relative_path")
-        if not rel_path:
+        if not rel_path or str(rel_path) in known_paths:
+            # Already registered: no need to look at the file at all.
             continue
         abs_path = (SECTION_DOCUMENT_ROOT / str(rel_path)).resolve()
-        if not abs_path.exists() or not abs_path.is_file():
-            continue
         try:
-            stat = abs_path.stat()
+            stat = os.stat(abs_path)
         except OSError:
             continue
+        if not S_ISREG(stat.st_mode):
+            continue
         _safe_insert(
             hash_id=str(hash_id),
             categoria=payload.get("categoria") or _category_from_directory(abs_path.parent),
@@ -242,19 +357,17 @@ def _db_backfill_registry() -> None:
             absolute_path=str(abs_path),
         )
 
-    # 2) Import orphan files found on disk
-    for category in SECTION_DOCUMENT_CATEGORIES:
-        directory = _category_dir(category)
-        for path in directory.glob("*"):
-            if not path.is_file() or path.name == SECTION_DOCUMENT_INDEX_FILENAME:
-                continue
+    # 2) Import orphan files found on disk. Folder scans are I/O bound and
+    # independent: overlap them (slow/network drives); inserts stay here.
+    directories = [_category_dir(category) for category in SECTION_DOCUMENT_CATEGORIES]
+    with ThreadPoolExecutor(max_workers=min(8, len(directories))) as pool:
+        scans = list(pool.map(_scan_orphan_candidates, directories))
+    for directory, files in zip(directories, scans):
+        directory_category = _category_from_directory(directory)
+        for path, mtime in files:
             rel = _relative_to_root(path)
             if not rel:
                 continue
-            try:
-                stat = path.stat()
-            except OSError:
-                continue
             if len(path.stem) >= SECTION_DOC_TOKEN_LENGTH:
                 guessed_hash = path.stem[:SECTION_DOC_TOKEN_LENGTH]
             elif len(path.stem) >= 10:
@@ -263,37 +376,84 @@ def _db_backfill_registry() -> None:
                 guessed_hash = secrets.token_hex(8)[:SECTION_DOC_TOKEN_LENGTH]
             _safe_insert(
                 hash_id=guessed_hash,
-                categoria=_category_from_directory(path.parent),
+                categoria=directory_category,
                 descrizione="",
                 protocollo="",
                 verbale_numero="",
                 original_name=path.name,
                 stored_name=path.name,
                 relative_path=rel,
-                uploaded_at=datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                uploaded_at=datetime.fromtimestamp(mtime).isoformat(),
                 absolute_path=str(path.resolve()),
             )
 
+    if not pending:
+        return
 
-def _load_metadata() -> dict[str, dict]:
-    ensure_section_structure()
-    if not SECTION_METADATA_FILE.exists():
-        return {}
+    # All missing rows are written in one transaction. Best-effort: tolerate
+    # transient locks (e.g. antivirus/backup or concurrent instance).
+    for attempt in range(3):
+        try:
+            with get_connection() as conn:
+                for record in pending:
+                    try:
+                        add_section_document_record(**record, conn=conn)
+                    except DatabaseLockError:
+                        raise
+                    except Exception:
+                        continue
+            return
+        except Exception as exc:
+            if isinstance(exc, sqlite3.Error):
+                exc = map_sqlite_exception(exc)
+            if isinstance(exc, DatabaseLockError) and attempt < 2:
+                time.sleep(0.25 * (attempt + 1))
+                continue
+            return
+
+
+def _metadata_cache_key() -> tuple[str, int, int] | None:
+    try:
+        st = SECTION_METADATA_FILE.stat()
+    except OSError:
+        return None
+    return (str(SECTION_METADATA_FILE), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1)
+def _load_metadata_cached(cache_key: tuple[str, int, int]) -> tuple[dict[str, dict], dict[str, tuple[str, ...]]]:
+    """Parse metadata.json and index it by relative_path (shared, read-only).
+
+    ``cache_key`` is the (path, mtime_ns, size) of the file, so any rewrite of
+    metadata.json yields a fresh parse.
+    """
     try:
         with SECTION_METADATA_FILE.open("r", encoding="utf-8") as handle:
             raw = json.load(handle)
     except (OSError, json.JSONDecodeError) as exc:
         logger.warning("Impossibile leggere metadata documenti sezione: %s", exc)
-        return {}
+        return {}, {}
     if isinstance(raw, dict) and "documents" in raw and isinstance(raw["documents"], dict):
         raw = raw["documents"]
     if not isinstance(raw, dict):
-        return {}
+        return {}, {}
     normalized: dict[str, dict] = {}
+    by_rel: dict[str, list[str]] = {}
     for key, value in raw.items():
         if isinstance(value, dict):
-            normalized[str(key)] = dict(value)
-    return normalized
+            normalized[str(key)] = value
+            by_rel.setdefault(value.get("relative_path"), []).append(str(key))
+    return normalized, {rel: tuple(keys) for rel, keys in by_rel.items()}
+
+
+def _load_metadata() -> dict[str, dict]:
+    ensure_section_structure()
+    cache_key = _metadata_cache_key()
+    if cache_key is None:
+        return {}
+    metadata, _ = _load_metadata_cached(cache_key)
+    # Callers mutate the result: hand out copies of the cached parse.
+    return {key: dict(value) for key, value in metadata.items()}
 
 
 def _save_metadata(metadata: dict[str, dict]):
@@ -304,6 +464,7 @@ def _save_metadata(metadata: dict[str, dict]):
         with tmp_path.open("w", encoding="utf-8") as handle:
             json.dump(payload, handle, ensure_ascii=False, indent=2)
         os.replace(tmp_path, SECTION_METADATA_FILE)
+        _load_metadata_cached.cache_clear()
     except OSError as exc:
         logger.error("Impossibile salvare metadata documenti sezione: %s", exc)
         if tmp_path.exists():
@@ -313,30 +474,107 @@ def _save_metadata(metadata: dict[str, dict]):
                 pass
 
 
-def _relative_to_root(path: Path) -> str | None:
+def _relative_to_root(path: Path, *, created: bool = False) -> str | None:
+    """Return ``path`` relative to the section root, or None if it lies outside.
+
+    Files found on disk are resolved, so a symlink/junction that leads outside
+    the root is rejected. ``created=True`` is for files this module has just
+    written into a category folder: a lexical check skips the realpath walk.
+    """
     try:
-        rel = path.resolve().relative_to(SECTION_DOCUMENT_ROOT.resolve())
+        root = _root()
+        if created:
+            normalized = Path(os.path.abspath(path))
+            if normalized.is_relative_to(root):
+                return normalized.relative_to(root).as_posix()
+        rel = path.resolve().relative_to(root)
         return rel.as_posix()
     except ValueError:
         return None
 
 
+class _RecordFields:
+    """Text fields of a section-document DB row, converted to ``str`` once.
+
+    ``row`` keeps the original dict for snapshots that report raw values.
+    """
+
+    __slots__ = (
+        "row",
+        "id",
+        "hash_id",
+        "hash_key",
+        "stored_name",
+        "nome_file",
+        "percorso",
+        "relative_path",
+        "categoria",
+    )
+
+    def __init__(self, row: dict):
+        self.row = row
+        self.id = row.get("id")
+        self.hash_id = str(row.get("hash_id") or "")
+        self.hash_key = self.hash_id.strip().lower()
+        self.stored_name = str(row.get("stored_name") or "")
+        self.nome_file = str(row.get("nome_file") or "")
+        self.percorso = str(row.get("percorso") or "")
+        self.relative_path = str(row.get("relative_path") or "")
+        self.categoria = str(row.get("categoria") or "")
+
+    def snapshot(self) -> dict:
+        row = self.row
+        return {
+            "id": row.get("id"),
+            "hash_id": row.get("hash_id"),
+            "stored_name": row.get("stored_name"),
+            "percorso": row.get("percorso"),
+            "relative_path": row.get("relative_path"),
+        }
+
+
 def _generate_hash_token(existing: Iterable[str], length: int = 10) -> str:
-    existing_set = set(existing)
+    existing_set = existing if isinstance(existing, (set, frozenset)) else set(existing)
     while True:
         token = secrets.token_hex(max(1, (length + 1) // 2))[:length]
         if token not in existing_set:
             return token
 
 
+def _generate_hash_tokens(count: int, existing: set[str], length: int = 10) -> list[str]:
+    """Return ``count`` distinct tokens not in ``existing`` (one batch, one dedup set)."""
+    nbytes = max(1, (length + 1) // 2)
+    tokens: list[str] = []
+    seen = set(existing)
+    while len(tokens) < count:
+        token = secrets.token_hex(nbytes)[:length]
+        if token not in seen:
+            seen.add(token)
+            tokens.append(token)
+    return tokens
+
+
+def _token_candidates(preferred: str | None, existing: set[str], *, attempts: int = 50) -> Iterator[str]:
+    """Yield the preferred token, then random ones; generated lazily (usually one is enough)."""
+    if preferred:
+        yield preferred
+    for _ in range(attempts):
+        yield _generate_hash_token(existing, length=SECTION_DOC_TOKEN_LENGTH)
+
+
 def _remove_metadata_for_path(path: Path):
     rel = _relative_to_root(path)
     if not rel:
         return
-    metadata = _load_metadata()
-    keys_to_delete = [key for key, payload in metadata.items() if payload.get("relative_path") == rel]
+    ensure_section_structure()
+    cache_key = _metadata_cache_key()
+    if cache_key is None:
+        return
+    _, keys_by_rel = _load_metadata_cached(cache_key)
+    keys_to_delete = keys_by_rel.get(rel)
     if not keys_to_delete:
         return
+    metadata = _load_metadata()
     for key in keys_to_delete:
         metadata.pop(key, None)
     _save_metadata(metadata)
@@ -370,11 +608,14 @@ def _slugify(label: str) -> str:
     return "_".join(label.lower().split()) or "misc"
 
 
+_CATEGORY_SLUGS = {category: _slugify(category) for category in SECTION_DOCUMENT_CATEGORIES}
+
+
 def _get_custom_section_categories() -> list[str]:
     try:
-        from config_manager import load_config
+        from config_manager import load_config_cached
 
-        cfg = load_config()
+        cfg = load_config_cached()
         custom = cfg.get("custom_section_document_categories") if isinstance(cfg, dict) else None
         if not isinstance(custom, list):
             return []
@@ -383,37 +624,60 @@ def _get_custom_section_categories() -> list[str]:
         return []
 
 
+@lru_cache(maxsize=8)
+def _build_category_lookups(customs: tuple[str, ...]) -> tuple[dict[str, str], dict[str, str]]:
+    """Map lower-cased names and folder slugs to categories (built-ins win, then first match)."""
+    by_lower: dict[str, str] = {}
+    by_slug: dict[str, str] = {}
+    for category in (*SECTION_DOCUMENT_CATEGORIES, *customs):
+        by_lower.setdefault(category.lower(), category)
+        by_slug.setdefault(_CATEGORY_SLUGS.get(category) or _slugify(category), category)
+    return by_lower, by_slug
+
+
+_BUILTIN_BY_LOWER, _BUILTIN_BY_SLUG = _build_category_lookups(())
+
+
+def _category_lookups() -> tuple[dict[str, str], dict[str, str]]:
+    return _build_category_lookups(tuple(_get_custom_section_categories()))
+
+
 def _normalize_category(value: str | None) -> str:
     if not value:
         return DEFAULT_SECTION_CATEGORY
     candidate = value.strip()
     if not candidate:
         return DEFAULT_SECTION_CATEGORY
-    for category in SECTION_DOCUMENT_CATEGORIES:
-        if category.lower() == candidate.lower():
-            return category
-    for category in _get_custom_section_categories():
-        if category.lower() == candidate.lower():
-            return category
-    return "Altro"
+    key = candidate.lower()
+    # Built-ins win anyway, so they are answered without reading the config.
+    builtin = _BUILTIN_BY_LOWER.get(key)
+    if builtin is not None:
+        return builtin
+    by_lower, _ = _category_lookups()
+    return by_lower.get(key, "Altro")
+
+
+# Category folders already created in this process
+_prepared_category_dirs: set[Path] = set()
 
 
 def _category_dir(category: str) -> Path:
     normalized = _normalize_category(category)
-    directory = SECTION_DOCUMENT_ROOT / _slugify(normalized)
+    directory = SECTION_DOCUMENT_ROOT / (_CATEGORY_SLUGS.get(normalized) or _slugify(normalized))
+    if directory in _prepared_category_dirs and os.path.isdir(directory):
+        return directory
     directory.mkdir(parents=True, exist_ok=True)
+    _prepared_category_dirs.add(directory)
     return directory
 
 
 def _category_from_directory(directory: Path) -> str:
     slug = directory.name.lower()
-    for category in SECTION_DOCUMENT_CATEGORIES:
-        if _slugify(category) == slug:
-            return category
-    for category in _get_custom_section_categories():
-        if _slugify(category) == slug:
-            return category
-    return DEFAULT_SECTION_CATEGORY
+    builtin = _BUILTIN_BY_SLUG.get(slug)
+    if builtin is not None:
+        return builtin
+    _, by_slug = _category_lookups()
+    return by_slug.get(slug, DEFAULT_SECTION_CATEGORY)
 
 
 def ensure_section_index_file(category: str) -> Path:
@@ -424,16 +688,16 @@ def ensure_section_index_file(category: str) -> Path:
     index_path = directory / SECTION_DOCUMENT_INDEX_FILENAME
 
     # Prefer DB records; fall back to metadata.json when DB is unavailable.
-    db_rows: list[dict] = []
+    db_rows: list[dict] | None = None
     try:
-        from database import list_section_document_records
+        from database import list_section_document_records_by_category
 
         _db_backfill_registry()
-        db_rows = list_section_document_records(include_deleted=False)
+        db_rows = list_section_document_records_by_category(normalized)
     except Exception:
-        db_rows = []
+        db_rows = None
 
-    metadata = _load_metadata() if not db_rows else {}
+    metadata = _load_metadata() if db_rows is None else {}
     metadata_by_path: dict[str, dict] = {}
     for payload in metadata.values():
         rel = payload.get("relative_path")
@@ -442,46 +706,67 @@ def ensure_section_index_file(category: str) -> Path:
         abs_path = (SECTION_DOCUMENT_ROOT / rel).resolve()
         metadata_by_path[str(abs_path)] = payload
 
-    lines = [
-        f"Elenco documenti sezione - categoria '{normalized}'",
-        "Nome file\tDescrizione\tCategoria\tPercorso relativo",
-    ]
-
+    # Rows are streamed to a temp file that replaces the index only when complete.
+    # It lives in the root folder so the category scans below never list it.
+    tmp_path = SECTION_DOCUMENT_ROOT / f"{directory.name}_{SECTION_DOCUMENT_INDEX_FILENAME}.tmp"
+    written = 0
     try:
-        if db_rows:
-            for row in db_rows:
-                categoria = str(row.get("categoria") or "")
-                if categoria != normalized:
-                    continue
-                abs_path = _resolve_to_absolute(
-                    str(row.get("percorso") or ""),
-                    fallback_rel=str(row.get("relative_path") or ""),
-                )
-                if not abs_path or not abs_path.exists() or not abs_path.is_file():
-                    continue
-                rel = _relative_to_root(abs_path) or abs_path.name
-                originale = (row.get("nome_file") or row.get("stored_name") or abs_path.name) or abs_path.name
-                descrizione = (row.get("descrizione") or "") or ""
-                lines.append(f"{originale}\t{descrizione}\t{categoria}\t{rel}")
-        else:
-            for path in sorted(directory.iterdir(), key=lambda p: p.name.lower()):
-                if not path.is_file() or path.name == SECTION_DOCUMENT_INDEX_FILENAME:
-                    continue
-                resolved = path.resolve()
-                payload = metadata_by_path.get(str(resolved))
-                descrizione = (payload.get("description") if payload else "") or ""
-                categoria = payload.get("categoria") if payload else normalized
-                rel = _relative_to_root(resolved) or path.name
-                originale = (payload.get("original_name") if payload else None) or path.name
-                lines.append(f"{originale}\t{descrizione}\t{categoria}\t{rel}")
-
-        if len(lines) == 2:
-            lines.append("(Nessun documento presente)")
-
-        with index_path.open("w", encoding="utf-8") as handle:
-            handle.write("\n".join(lines) + "\n")
+        with open(tmp_path, "w", encoding="utf-8", buffering=64 * 1024) as handle:
+            handle.write(f"Elenco documenti sezione - categoria '{normalized}'\n")
+            handle.write("Nome file\tDescrizione\tCategoria\tPercorso relativo\n")
+            if db_rows is not None:
+                # One directory listing answers the existence check for every row
+                # stored in the category folder; other paths are stat'ed as before.
+                # Names are compared with normcase (case-insensitive on Windows).
+                resolved_dir = directory.resolve()
+                try:
+                    with os.scandir(directory) as it:
+                        present = {os.path.normcase(e.name) for e in it if e.is_file()}
+                except OSError:
+                    present = None
+                for row in db_rows:
+                    categoria = str(row.get("categoria") or "")
+                    if categoria != normalized:
+                        continue
+                    abs_path = _resolve_to_absolute(
+                        str(row.get("percorso") or ""),
+                        fallback_rel=str(row.get("relative_path") or ""),
+                    )
+                    if not abs_path:
+                        continue
+                    if present is not None and abs_path.parent == resolved_dir:
+                        if os.path.normcase(abs_path.name) not in present:
+                            continue
+                    elif not abs_path.is_file():
+                        continue
+                    rel = _relative_to_root(abs_path) or abs_path.name
+                    originale = (row.get("nome_file") or row.get("stored_name") or abs_path.name) or abs_path.name
+                    descrizione = (row.get("descrizione") or "") or ""
+                    handle.write(f"{originale}\t{descrizione}\t{categoria}\t{rel}\n")
+                    written += 1
+            else:
+                with os.scandir(directory) as it:
+                    entries = [e for e in it if e.name != SECTION_DOCUMENT_INDEX_FILENAME and e.is_file()]
+                for entry in sorted(entries, key=lambda e: e.name.lower()):
+                    path = Path(entry.path)
+                    resolved = path.resolve()
+                    payload = metadata_by_path.get(str(resolved))
+                    descrizione = (payload.get("description") if payload else "") or ""
+                    categoria = payload.get("categoria") if payload else normalized
+                    rel = _relative_to_root(resolved) or path.name
+                    originale = (payload.get("original_name") if payload else None) or path.name
+                    handle.write(f"{originale}\t{descrizione}\t{categoria}\t{rel}\n")
+                    written += 1
+
+            if not written:
+                handle.write("(Nessun documento presente)\n")
+        os.replace(tmp_path, index_path)
     except OSError as exc:
         logger.warning("Impossibile aggiornare l'indice documenti sezione %s: %s", normalized, exc)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
 
     return index_path
 
@@ -509,6 +794,23 @@ def list_section_documents(*, include_missing: bool = False) -> List[Dict[str, o
     except Exception:
         rows = []
 
+    docs = _docs_from_records(rows, metadata_by_hash, include_missing=include_missing)
+    docs.sort(
+        key=lambda item: (
+            str(item.get("categoria", "")),
+            str(item.get("nome_file", "")).lower(),
+        )
+    )
+    return docs
+
+
+def _docs_from_records(
+    rows: Iterable[dict],
+    metadata_by_hash: dict[str, dict],
+    *,
+    include_missing: bool,
+) -> List[Dict[str, object]]:
+    """Turn section_documents rows into the dicts shown by the UI panels."""
     docs: List[Dict[str, object]] = []
 
     # DB-first: produce the structure expected by the UI panel.
@@ -522,7 +824,13 @@ def list_section_documents(*, include_missing: bool = False) -> List[Dict[str, o
         )
         if not abs_path:
             continue
-        if not abs_path.exists() or not abs_path.is_file():
+        # A single stat answers both "is it a regular file" and size/mtime.
+        try:
+            st = os.stat(abs_path)
+            is_file = S_ISREG(st.st_mode)
+        except OSError:
+            is_file = False
+        if not is_file:
             # By default hide missing documents (prevents confusing size=0 entries and avoids
             # apparent duplicates after a manual disk cleanup + re-import).
             if not include_missing:
@@ -530,13 +838,8 @@ def list_section_documents(*, include_missing: bool = False) -> List[Dict[str, o
             size = 0
             mtime = None
         else:
-            try:
-                stat = abs_path.stat()
-                size = stat.st_size
-                mtime = stat.st_mtime
-            except OSError:
-                size = 0
-                mtime = None
+            size = st.st_size
+            mtime = st.st_mtime
 
         rel_display = _relative_to_root(abs_path) or str(row.get("relative_path") or "") or abs_path.name
         stored_name = (row.get("stored_name") or row.get("nome_file") or abs_path.name) or abs_path.name
@@ -565,13 +868,6 @@ def list_section_documents(*, include_missing: bool = False) -> List[Dict[str, o
                 "uploaded_at": row.get("data_caricamento") or row.get("uploaded_at"),
             }
         )
-
-    docs.sort(
-        key=lambda item: (
-            str(item.get("categoria", "")),
-            str(item.get("nome_file", "")).lower(),
-        )
-    )
     return docs
 
 
@@ -656,7 +952,19 @@ def list_cd_verbali_documents(
     Result is sorted descending by date.
     """
 
-    docs = list_section_documents(include_missing=include_missing)
+    try:
+        # Let SQLite drop the non-verbali rows before any path/stat work.
+        from database import list_cd_verbali_records
+
+        ensure_section_structure()
+        _db_backfill_registry()
+        try:
+            metadata_by_hash = _load_metadata()
+        except Exception:
+            metadata_by_hash = {}
+        docs = _docs_from_records(list_cd_verbali_records(), metadata_by_hash, include_missing=include_missing)
+    except Exception:
+        docs = list_section_documents(include_missing=include_missing)
     verbali: list[dict] = []
     for doc in docs:
         categoria = str(doc.get("categoria") or "").strip().lower()
@@ -974,15 +1282,8 @@ def add_section_document(
             existing_tokens.add(preferred)
 
         # Try preferred token first; fall back to random token on collision.
-        candidates: list[str] = []
-        if preferred:
-            candidates.append(preferred)
-
-        for _ in range(50):
-            candidates.append(_generate_hash_token(existing_tokens, length=SECTION_DOC_TOKEN_LENGTH))
-
         chosen: str | None = None
-        for token in candidates:
+        for token in _token_candidates(preferred, existing_tokens):
             candidate_name = f"{token}{src.suffix.lower()}"
             candidate_dest = target_dir / candidate_name
             if not candidate_dest.exists():
@@ -995,7 +1296,7 @@ def add_section_document(
 
         shutil.copy2(src, dest)
 
-    relative_path = _relative_to_root(dest)
+    relative_path = _relative_to_root(dest, created=True)
     if not relative_path:
         raise RuntimeError("Impossibile determinare il percorso relativo del documento di sezione")
 
@@ -1008,15 +1309,17 @@ def add_section_document(
     except OSError:
         doc_ts = import_ts
 
+    dest_abs = str(dest.resolve())
+
     # Persist DB tracking (primary). Avoid duplicate registry rows when reusing an existing file.
     try:
         from database import add_section_document_record, get_section_document_by_relative_path
 
-        if not get_section_document_by_relative_path(str(dest.resolve())) and not get_section_document_by_relative_path(relative_path):
+        if not get_section_document_by_relative_path(dest_abs) and not get_section_document_by_relative_path(relative_path):
             add_section_document_record(
                 hash_id=hash_id,
                 nome_file=dest.name,
-                percorso=str(dest.resolve()),
+                percorso=dest_abs,
                 tipo="documento",
                 data_caricamento=doc_ts,
                 categoria=normalized_category,
@@ -1048,7 +1351,7 @@ def add_section_document(
     except Exception:
         pass
 
-    return str(dest.resolve())
+    return dest_abs
 
 
 def bulk_import_section_documents(
@@ -1090,154 +1393,190 @@ def bulk_import_section_documents(
     # Build a hash index once to avoid creating duplicates (same content, different name).
     existing_hash_index = _build_hash_index(target_dir)
 
+    # metadata.json is loaded once and written back once after the loop
+    # (also when the loop is interrupted).
+    metadata = _load_metadata()
+    metadata_dirty = False
+    existing_tokens = set(metadata)
+
     try:
         filenames = sorted(os.listdir(src_root))
     except OSError as exc:
         raise RuntimeError(f"Impossibile leggere la cartella: {exc}")
 
-    for name in filenames:
-        src = Path(src_root) / name
-        if not src.is_file():
-            continue
-
-        metadata = _load_metadata()
-        src_digest = _safe_sha256_file(src)
-        if src_digest and src_digest in existing_hash_index:
-            # Reuse existing file and only ensure DB registry exists.
-            dest = existing_hash_index[src_digest]
-            hash_id = dest.stem
-            reused = True
-        else:
-            reused = False
-            preferred = _preferred_token_for_content(src_digest) if src_digest else None
-            existing_tokens = set(metadata.keys())
-            if preferred:
-                existing_tokens.add(preferred)
-
-            candidates: list[str] = []
-            if preferred:
-                candidates.append(preferred)
-            for _ in range(50):
-                candidates.append(_generate_hash_token(existing_tokens, length=SECTION_DOC_TOKEN_LENGTH))
-
-            chosen: str | None = None
-            dest = None
-            for token in candidates:
-                candidate_name = f"{token}{src.suffix.lower()}"
-                candidate_dest = target_dir / candidate_name
-                if not candidate_dest.exists():
-                    chosen = token
-                    dest = candidate_dest
-                    break
-
-            if not chosen or dest is None:
-                failed += 1
-                details.append(f"{name}: impossibile determinare nome univoco")
-                continue
+    # Names already used in the target folder, listed once (lower-cased, so the
+    # check also holds on case-insensitive filesystems).
+    try:
+        with os.scandir(target_dir) as it:
+            taken_names = {entry.name.lower() for entry in it}
+    except OSError as exc:
+        raise RuntimeError(f"Impossibile leggere la cartella di destinazione: {exc}")
 
-            hash_id = chosen
+    # On the same filesystem a move is a rename: no need to copy the bytes.
+    try:
+        same_device = move and os.stat(src_root).st_dev == os.stat(target_dir).st_dev
+    except OSError:
+        same_device = False
 
-        try:
-            if not reused:
-                shutil.copy2(src, dest)
+    # One import timestamp for the whole batch.
+    import_ts = datetime.now().isoformat(timespec="seconds")
 
-            relative_path = _relative_to_root(dest)
-            if not relative_path:
-                raise RuntimeError("Impossibile determinare il percorso relativo del documento di sezione")
+    try:
+        for name in filenames:
+            src = Path(src_root) / name
+            if not src.is_file():
+                continue
 
-            import_ts = datetime.now().isoformat(timespec="seconds")
-            try:
-                st = src.stat()
-                doc_ts = datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds")
-            except OSError:
-                doc_ts = import_ts
+            src_digest = _safe_sha256_file(src)
+            if src_digest and src_digest in existing_hash_index:
+                # Reuse existing file and only ensure DB registry exists.
+                dest = existing_hash_index[src_digest]
+                hash_id = dest.stem
+                reused = True
+            else:
+                reused = False
+                preferred = _preferred_token_for_content(src_digest) if src_digest else None
+                if preferred:
+                    existing_tokens.add(preferred)
+
+                chosen: str | None = None
+                dest = None
+                for token in _token_candidates(preferred, existing_tokens):
+                    candidate_name = f"{token}{src.suffix.lower()}"
+                    if candidate_name not in taken_names:
+                        chosen = token
+                        dest = target_dir / candidate_name
+                        taken_names.add(candidate_name)
+                        break
+
+                if not chosen or dest is None:
+                    failed += 1
+                    details.append(f"{name}: impossibile determinare nome univoco")
+                    continue
 
-            from database import add_section_document_record
+                hash_id = chosen
 
-            # Ensure we don't create duplicate DB rows when reusing an existing file
+            renamed = False
             try:
-                from database import get_section_document_by_relative_path
-
-                exists_row = get_section_document_by_relative_path(str(dest.resolve())) or get_section_document_by_relative_path(relative_path)
-            except Exception:
-                exists_row = None
-
-            if exists_row:
-                imported += 1
-                details.append(f"{name}: duplicato (riusato {dest.name})")
-                continue
-
-            inserted = False
-            last_exc: Exception | None = None
-            for attempt in range(3):
                 try:
-                    add_section_document_record(
-                        hash_id=hash_id,
-                        nome_file=dest.name,
-                        percorso=str(dest.resolve()),
-                        tipo="documento",
-                        data_caricamento=doc_ts,
-                        categoria=normalized_category,
-                        descrizione=description_value,
-                        protocollo=protocollo_value or None,
-                        verbale_numero=verbale_numero_value or None,
-                        original_name=src.name,
-                        stored_name=dest.name,
-                        relative_path=relative_path,
-                        uploaded_at=import_ts,
-                    )
-                    inserted = True
-                    break
-                except Exception as exc:
-                    last_exc = exc
-                    try:
-                        from exceptions import DatabaseLockError
-
-                        is_lock = isinstance(exc, DatabaseLockError)
-                    except Exception:
-                        is_lock = False
+                    st = src.stat()
+                    doc_ts = datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds")
+                except OSError:
+                    doc_ts = import_ts
+
+                if not reused:
+                    if same_device:
+                        try:
+                            os.rename(src, dest)
+                            renamed = True
+                        except OSError as exc:
+                            if exc.errno != errno.EXDEV:
+                                raise
+                    if not renamed:
+                        shutil.copy2(src, dest)
+
+                relative_path = _relative_to_root(dest, created=True)
+                if not relative_path:
+                    raise RuntimeError("Impossibile determinare il percorso relativo del documento di sezione")
+
+                from database import add_section_document_record
+
+                dest_abs = str(dest.resolve())
+
+                # Ensure we don't create duplicate DB rows when reusing an existing file
+                try:
+                    from database import get_section_document_by_relative_path
 
-                    if is_lock and attempt < 2:
-                        time.sleep(0.25 * (attempt + 1))
-                        continue
-                    break
+                    exists_row = get_section_document_by_relative_path(dest_abs) or get_section_document_by_relative_path(relative_path)
+                except Exception:
+                    exists_row = None
 
-            if not inserted:
-                raise RuntimeError(f"DB insert failed: {last_exc}")
+                if exists_row:
+                    imported += 1
+                    details.append(f"{name}: duplicato (riusato {dest.name})")
+                    continue
 
-            if src_digest:
-                existing_hash_index.setdefault(src_digest, dest)
+                inserted = False
+                last_exc: Exception | None = None
+                for attempt in range(3):
+                    try:
+                        add_section_document_record(
+                            hash_id=hash_id,
+                            nome_file=dest.name,
+                            percorso=dest_abs,
+                            tipo="documento",
+                            data_caricamento=doc_ts,
+                            categoria=normalized_category,
+                            descrizione=description_value,
+                            protocollo=protocollo_value or None,
+                            verbale_numero=verbale_numero_value or None,
+                            original_name=src.name,
+                            stored_name=dest.name,
+                            relative_path=relative_path,
+                            uploaded_at=import_ts,
+                        )
+                        inserted = True
+                        break
+                    except Exception as exc:
+                        last_exc = exc
+                        try:
+                            from exceptions import DatabaseLockError
+
+                            is_lock = isinstance(exc, DatabaseLockError)
+                        except Exception:
+                            is_lock = False
+
+                        if is_lock and attempt < 2:
+                            time.sleep(0.25 * (attempt + 1))
+                            continue
+                        break
+
+                if not inserted:
+                    raise RuntimeError(f"DB insert failed: {last_exc}")
+
+                if src_digest:
+                    existing_hash_index.setdefault(src_digest, dest)
+
+                # Mantieni metadata.json solo per compatibilita' (best effort)
+                try:
+                    metadata[hash_id] = {
+                        "hash_id": hash_id,
+                        "categoria": normalized_category,
+                        "original_name": src.name,
+                        "stored_name": dest.name,
+                        "description": description_value,
+                        "protocollo": protocollo_value,
+                        "verbale_numero": verbale_numero_value,
+                        "uploaded_at": doc_ts,
+                        "relative_path": relative_path,
+                    }
+                    existing_tokens.add(hash_id)
+                    metadata_dirty = True
+                except Exception:
+                    pass
 
-            # Mantieni metadata.json solo per compatibilita' (best effort)
-            try:
-                metadata[hash_id] = {
-                    "hash_id": hash_id,
-                    "categoria": normalized_category,
-                    "original_name": src.name,
-                    "stored_name": dest.name,
-                    "description": description_value,
-                    "protocollo": protocollo_value,
-                    "verbale_numero": verbale_numero_value,
-                    "uploaded_at": doc_ts,
-                    "relative_path": relative_path,
-                }
-                _save_metadata(metadata)
-            except Exception:
-                pass
+                if move and not renamed:
+                    try:
+                        src.unlink()
+                    except OSError as exc:
+                        details.append(f"{src.name}: importato ma non spostato ({exc})")
 
-            if move:
+                imported += 1
+            except Exception as exc:
+                failed += 1
+                details.append(f"{src.name}: {exc}")
                 try:
-                    src.unlink()
-                except OSError as exc:
-                    details.append(f"{src.name}: importato ma non spostato ({exc})")
-
-            imported += 1
-        except Exception as exc:
-            failed += 1
-            details.append(f"{src.name}: {exc}")
+                    if renamed:
+                        # Put the source file back where it was.
+                        os.rename(dest, src)
+                    elif dest.exists():
+                        dest.unlink()
+                except Exception:
+                    pass
+    finally:
+        if metadata_dirty:
             try:
-                if dest.exists():
-                    dest.unlink()
+                _save_metadata(metadata)
             except Exception:
                 pass
 
@@ -1307,11 +1646,13 @@ def update_section_document_metadata(
 
     if entry is not None:
         # Keep both DB field (descrizione) and legacy metadata field (description)
-        entry["categoria"] = normalized_category
-        entry["descrizione"] = description_value
-        entry["description"] = description_value
-        entry["protocollo"] = protocollo_value
-        entry["verbale_numero"] = verbale_numero_value
+        entry.update(
+            categoria=normalized_category,
+            descrizione=description_value,
+            description=description_value,
+            protocollo=protocollo_value,
+            verbale_numero=verbale_numero_value,
+        )
     new_rel = _relative_to_root(destination)
     if entry is not None and new_rel:
         entry["relative_path"] = new_rel
@@ -1327,7 +1668,12 @@ def update_section_document_metadata(
         )
 
         new_rel_db = new_rel or rel
-        row = get_section_document_by_relative_path(str(rel)) or get_section_document_by_relative_path(str(new_rel_db))
+        destination_abs = str(destination.resolve())
+        # The row looked up above is still valid (only its id is used); otherwise
+        # the document may only be registered under its new location.
+        row = db_row
+        if row is None and new_rel_db != rel:
+            row = get_section_document_by_relative_path(str(new_rel_db))
         if row:
             update_section_document_record(
                 int(row["id"]),
@@ -1335,21 +1681,22 @@ def update_section_document_metadata(
                 descrizione=description_value,
                 protocollo=protocollo_value or None,
                 verbale_numero=verbale_numero_value or None,
-                percorso=str(destination.resolve()),
+                percorso=destination_abs,
                 stored_name=destination.name,
                 nome_file=destination.name,
                 tipo="documento",
                 relative_path=str(new_rel_db),
             )
         else:
+            now_ts = datetime.now().isoformat(timespec="seconds")
             add_section_document_record(
                 hash_id=str(entry_key or secrets.token_hex(5)),
                 nome_file=destination.name,
-                percorso=str(destination.resolve()),
+                percorso=destination_abs,
                 tipo="documento",
                 data_caricamento=(entry.get("data_caricamento") if entry else None)
                 or (entry.get("uploaded_at") if entry else None)
-                or datetime.now().isoformat(timespec="seconds"),
+                or now_ts,
                 categoria=normalized_category,
                 descrizione=description_value,
                 protocollo=protocollo_value or None,
@@ -1357,7 +1704,7 @@ def update_section_document_metadata(
                 original_name=(entry.get("original_name") if entry else None) or destination.name,
                 stored_name=destination.name,
                 relative_path=str(new_rel_db),
-                uploaded_at=(entry.get("uploaded_at") if entry else None) or datetime.now().isoformat(timespec="seconds"),
+                uploaded_at=(entry.get("uploaded_at") if entry else None) or now_ts,
             )
     except Exception:
         pass
@@ -1427,20 +1774,16 @@ def bulk_rename_section_documents_to_hex_tokens(
     _db_backfill_registry()
 
     try:
-        from database import list_section_document_records, update_section_document_record
+        from database import get_conn, list_section_document_records, update_section_document_record
     except Exception as exc:
         raise RuntimeError(f"DB non disponibile per rinomina documenti sezione: {exc}")
 
-    rows = list_section_document_records(include_deleted=False)
-    existing_tokens: set[str] = set()
-    for row in rows:
-        tok = str(row.get("hash_id") or "").strip()
-        if tok:
-            existing_tokens.add(tok)
+    records = [_RecordFields(row) for row in list_section_document_records(include_deleted=False)]
+    existing_tokens = {tok for tok in (rec.hash_id.strip() for rec in records) if tok}
 
     changes: list[tuple[str, str]] = []
 
-    root = Path(root_dir).resolve() if root_dir else SECTION_DOCUMENT_ROOT.resolve()
+    root = _resolved_dir(Path(root_dir)) if root_dir else _root()
 
     def _is_under_root(p: Path) -> bool:
         try:
@@ -1449,91 +1792,129 @@ def bulk_rename_section_documents_to_hex_tokens(
         except Exception:
             return False
 
-    # Work per-record, keeping category folder unchanged.
-    for row in rows:
-        abs_path = _resolve_to_absolute(
-            str(row.get("percorso") or ""),
-            fallback_rel=str(row.get("relative_path") or ""),
-            root_dir=root,
+    # metadata.json is loaded on the first rename and written back once.
+    metadata: dict[str, dict] | None = None
+    key_by_rel: dict[str | None, str] = {}
+    metadata_dirty = False
+
+    # DB updates share one connection and are committed once at the end; the
+    # commit also runs when the loop stops early, because every update so far
+    # matches a file that has already been renamed on disk.
+    conn = get_conn() if not dry_run else None
+
+    def _already_compliant(rec: _RecordFields) -> bool:
+        # Rows that already describe a compliant file need no disk access.
+        stored = rec.stored_name
+        stored_stem = Path(stored).stem
+        return (
+            _is_hex_token(stored_stem, length=token_length)
+            and rec.hash_key == stored_stem.lower()
+            and Path(rec.relative_path or rec.percorso).name == stored
         )
-        if not abs_path:
-            continue
-        if not _is_under_root(abs_path):
-            # Safety: never touch files outside the configured section-docs root.
-            continue
-        if not abs_path.exists() or not abs_path.is_file():
-            continue
 
-        current_name = abs_path.name
-        current_stem = abs_path.stem
-        current_suffix = abs_path.suffix.lower()
+    candidates = [rec for rec in records if not _already_compliant(rec)]
+    # One token per candidate, generated (and de-duplicated) up front.
+    new_tokens = iter(_generate_hash_tokens(len(candidates), existing_tokens, length=token_length))
 
-        # Already compliant?
-        if _is_hex_token(current_stem, length=token_length):
-            continue
+    # Work per-record, keeping category folder unchanged.
+    try:
+        for rec in candidates:
+            abs_path = _resolve_to_absolute(
+                rec.percorso,
+                fallback_rel=rec.relative_path,
+                root_dir=root,
+            )
+            if not abs_path:
+                continue
+            if not _is_under_root(abs_path):
+                # Safety: never touch files outside the configured section-docs root.
+                continue
+            if not abs_path.exists() or not abs_path.is_file():
+                continue
 
-        # Generate new token and filename in the same folder.
-        new_token = _generate_hash_token(existing_tokens, length=token_length)
-        existing_tokens.add(new_token)
-        new_name = f"{new_token}{current_suffix}"
-        target = abs_path.with_name(new_name)
-        if target.exists():
-            # Extremely unlikely due to token uniqueness; still keep it safe.
-            new_name = _ensure_unique_filename(abs_path.parent, new_token, current_suffix, abs_path)
+            current_name = abs_path.name
+            current_stem = abs_path.stem
+            current_suffix = abs_path.suffix.lower()
+
+            # Already compliant?
+            if _is_hex_token(current_stem, length=token_length):
+                continue
+
+            # Generate new token and filename in the same folder.
+            new_token = next(new_tokens)
+            new_name = f"{new_token}{current_suffix}"
             target = abs_path.with_name(new_name)
+            if target.exists():
+                # Extremely unlikely due to token uniqueness; still keep it safe.
+                new_name = _ensure_unique_filename(abs_path.parent, new_token, current_suffix, abs_path)
+                target = abs_path.with_name(new_name)
 
-        changes.append((str(abs_path), str(target)))
-        if dry_run:
-            continue
+            changes.append((str(abs_path), str(target)))
+            if dry_run:
+                continue
 
-        # 1) Rename on disk
-        abs_path.parent.mkdir(parents=True, exist_ok=True)
-        os.replace(str(abs_path), str(target))
-
-        # 2) Update DB
-        new_rel = _relative_to_root(target) or str(row.get("relative_path") or "")
-        update_section_document_record(
-            int(row["id"]),
-            hash_id=new_token,
-            stored_name=target.name,
-            nome_file=target.name,
-            percorso=str(target.resolve()),
-            relative_path=str(new_rel),
-        )
+            # 1) Rename on disk (same folder: abs_path was just checked to exist)
+            os.replace(str(abs_path), str(target))
 
-        # 3) Update metadata.json best-effort
-        try:
-            metadata = _load_metadata()
-            key_to_update = None
-            payload_to_update: dict | None = None
-            old_rel = _relative_to_root(abs_path) or str(row.get("relative_path") or "")
-
-            # Prefer match by relative path (more stable than key).
-            for key, payload in metadata.items():
-                if payload.get("relative_path") == old_rel:
-                    key_to_update = key
-                    payload_to_update = payload
-                    break
-            if key_to_update is None:
-                # Fallback: key might match old hash
-                old_key = str(row.get("hash_id") or "")
-                if old_key and old_key in metadata:
-                    key_to_update = old_key
-                    payload_to_update = metadata.get(old_key)
-
-            if key_to_update and isinstance(payload_to_update, dict):
-                payload_to_update["hash_id"] = new_token
-                payload_to_update["stored_name"] = target.name
-                payload_to_update["relative_path"] = new_rel
-                # Move dict key to new token when key was the old hash
-                if key_to_update == str(row.get("hash_id") or "") and key_to_update != new_token:
-                    metadata.pop(key_to_update, None)
-                    metadata[new_token] = payload_to_update
-                else:
+            # 2) Update DB
+            new_rel = _relative_to_root(target, created=True) or rec.relative_path
+            update_section_document_record(
+                int(rec.id),
+                hash_id=new_token,
+                stored_name=target.name,
+                nome_file=target.name,
+                percorso=str(target.resolve()),
+                relative_path=str(new_rel),
+                conn=conn,
+            )
+
+            # 3) Update metadata.json best-effort (saved once, after the loop)
+            try:
+                if metadata is None:
+                    metadata = _load_metadata()
+                    key_by_rel = {}
+                    for key, payload in metadata.items():
+                        key_by_rel.setdefault(payload.get("relative_path"), key)
+                key_to_update = None
+                payload_to_update: dict | None = None
+                old_rel = _relative_to_root(abs_path) or rec.relative_path
+
+                # Prefer match by relative path (more stable than key).
+                rel_key = key_by_rel.pop(old_rel, None)
+                if rel_key is not None and rel_key in metadata:
+                    key_to_update = rel_key
+                    payload_to_update = metadata[rel_key]
+                if key_to_update is None:
+                    # Fallback: key might match old hash
+                    old_key = rec.hash_id
+                    if old_key and old_key in metadata:
+                        key_to_update = old_key
+                        payload_to_update = metadata.get(old_key)
+
+                if key_to_update and isinstance(payload_to_update, dict):
+                    payload_to_update["hash_id"] = new_token
+                    payload_to_update["stored_name"] = target.name
+                    payload_to_update["relative_path"] = new_rel
+                    # Move dict key to new token when key was the old hash
+                    if key_to_update == rec.hash_id and key_to_update != new_token:
+                        metadata.pop(key_to_update, None)
+                        key_to_update = new_token
                     metadata[key_to_update] = payload_to_update
+                    key_by_rel.setdefault(new_rel, key_to_update)
+                    metadata_dirty = True
+            except Exception:
+                pass
+    finally:
+        if metadata is not None and metadata_dirty:
+            try:
                 _save_metadata(metadata)
-        except Exception:
-            pass
+            except Exception:
+                pass
+        if conn is not None:
+            try:
+                conn.commit()
+            finally:
+                conn.close()
 
     return changes
 
@@ -1574,6 +1955,7 @@ def reindex_section_documents(
     try:
         from database import (
             add_section_document_record,
+            get_connection,
             list_section_document_records,
             soft_delete_section_document_record,
             update_section_document_record,
@@ -1581,49 +1963,65 @@ def reindex_section_documents(
     except Exception as exc:
         raise RuntimeError(f"DB non disponibile per re-indicizzazione documenti sezione: {exc}")
 
-    root = Path(root_dir).resolve() if root_dir else SECTION_DOCUMENT_ROOT.resolve()
+    root = _resolved_dir(Path(root_dir)) if root_dir else _root()
 
-    def _is_under_root(p: Path) -> bool:
+    # Callers that already hold p.resolve() pass it as `resolved`.
+    def _is_under_root(p: Path, *, resolved: Path | None = None) -> bool:
         try:
-            p.resolve().relative_to(root)
+            (resolved or p.resolve()).relative_to(root)
             return True
         except Exception:
             return False
 
-    def _to_rel(p: Path) -> str | None:
+    def _to_rel(p: Path, *, resolved: Path | None = None) -> str | None:
         try:
-            return p.resolve().relative_to(root).as_posix()
+            return (resolved or p.resolve()).relative_to(root).as_posix()
         except Exception:
             return None
 
-    def _find_on_disk(row: dict) -> Path | None:
+    root_str = str(root)
+    root_key = os.path.normcase(root_str)
+    root_prefix = os.path.join(root_key, "")
+
+    def _real_under_root(path_str: str) -> bool:
+        # String twin of _is_under_root for paths already passed through realpath.
+        key = os.path.normcase(path_str)
+        return key == root_key or key.startswith(root_prefix)
+
+    # Raw categoria value -> category folder (as str) for _find_on_disk step 3.
+    category_dir_strs: dict[str, str] = {}
+
+    def _find_on_disk(rec: _RecordFields) -> Path | None:
+        # Candidates are handled as strings (os.path); a Path is only built for the result.
         # 1) Prefer relative_path when it is actually relative
-        rel = str(row.get("relative_path") or "").strip()
+        rel = rec.relative_path.strip()
         if rel and not _is_abs_path(rel):
-            cand = (root / rel).resolve()
-            if cand.exists() and cand.is_file() and _is_under_root(cand):
-                return cand
+            cand = os.path.realpath(os.path.join(root_str, rel))
+            if os.path.isfile(cand) and _real_under_root(cand):
+                return Path(cand)
 
         # 2) Use percorso when it points under root
-        perc = str(row.get("percorso") or "").strip()
+        perc = rec.percorso.strip()
         if perc:
-            p = Path(perc)
-            if p.is_absolute():
-                if p.exists() and p.is_file() and _is_under_root(p):
-                    return p
+            if os.path.isabs(perc):
+                if os.path.isfile(perc) and _real_under_root(os.path.realpath(perc)):
+                    return Path(perc)
             else:
-                cand = (root / perc).resolve()
-                if cand.exists() and cand.is_file() and _is_under_root(cand):
-                    return cand
+                cand = os.path.realpath(os.path.join(root_str, perc))
+                if os.path.isfile(cand) and _real_under_root(cand):
+                    return Path(cand)
 
         # 3) Reconstruct from categoria + stored_name
-        stored = str(row.get("stored_name") or row.get("nome_file") or "").strip()
-        cat = str(row.get("categoria") or "").strip()
+        stored = (rec.stored_name or rec.nome_file).strip()
+        cat = rec.categoria.strip()
         if stored and cat:
             try:
-                cand = (_category_dir(_normalize_category(cat)).resolve() / stored).resolve()
-                if cand.exists() and cand.is_file() and _is_under_root(cand):
-                    return cand
+                cat_dir = category_dir_strs.get(cat)
+                if cat_dir is None:
+                    cat_dir = category_dir_strs[cat] = str(_category_dir(cat))
+                cand = os.path.realpath(os.path.join(cat_dir, stored))
+                if os.path.isfile(cand) and _real_under_root(cand):
+                    return Path(cand)
             except Exception:
                 pass
 
@@ -1631,89 +2029,103 @@ def reindex_section_documents(
         targets: list[str] = []
         if stored:
             targets.append(stored.lower())
-        tok = str(row.get("hash_id") or "").strip().lower()
+        tok = rec.hash_key
         if tok:
             targets.append(tok)
         if not targets:
             return None
 
+        index = _disk_index()
         matches: list[Path] = []
-        for p in root.rglob("*"):
-            if not p.is_file() or p.name == SECTION_DOCUMENT_INDEX_FILENAME or p.name == "metadata.json":
-                continue
-            name_l = p.name.lower()
-            stem_l = p.stem.lower()
-            if name_l in targets or stem_l in targets:
-                matches.append(p)
-                if len(matches) > 1:
-                    break
+        for target in targets:
+            for p in index.get(target, ()):
+                if p not in matches and p.is_file():
+                    matches.append(p)
         return matches[0] if len(matches) == 1 else None
 
-    rows = list_section_document_records(include_deleted=False)
+    # Lower-cased file name and stem -> files under root. Built on first use
+    # (one walk of the tree) instead of an rglob per unresolved row.
+    disk_index: dict[str, list[Path]] | None = None
+
+    disk_index_lock = threading.Lock()
+
+    def _disk_index() -> dict[str, list[Path]]:
+        nonlocal disk_index
+        with disk_index_lock:
+            if disk_index is None:
+                index: dict[str, list[Path]] = {}
+                for dirpath, _dirnames, filenames in os.walk(root):
+                    for name in filenames:
+                        if name in _RESERVED_NAMES:
+                            continue
+                        p = Path(dirpath, name)
+                        name_l = name.lower()
+                        index.setdefault(name_l, []).append(p)
+                        stem_l = p.stem.lower()
+                        if stem_l != name_l:
+                            index.setdefault(stem_l, []).append(p)
+                disk_index = index
+        return disk_index
+
+    records = [_RecordFields(row) for row in list_section_document_records(include_deleted=False)]
     updated: list[dict] = []
     missing: list[dict] = []
     errors: list[str] = []
 
-    existing_hashes: set[str] = set()
-    for r in rows:
-        h = str(r.get("hash_id") or "").strip()
-        if h:
-            existing_hashes.add(h.lower())
+    existing_hashes = {rec.hash_key for rec in records if rec.hash_key}
 
-    for row in rows:
-        found = _find_on_disk(row)
-        if not found:
-            if prune_missing and not dry_run:
-                try:
-                    p = str(row.get("percorso") or "").strip()
-                    rp = str(row.get("relative_path") or "").strip()
-                    p_abs = Path(p) if p else None
-                    rp_abs = Path(rp) if rp else None
-                    outside_root = False
-                    if p_abs and p_abs.is_absolute() and not _is_under_root(p_abs):
-                        outside_root = True
-                    if rp_abs and rp_abs.is_absolute() and not _is_under_root(rp_abs):
-                        outside_root = True
-                    if outside_root:
-                        soft_delete_section_document_record(int(row["id"]))
-                except Exception as exc:
-                    errors.append(f"prune_missing id={row.get('id')}: {exc}")
-            missing.append({"id": row.get("id"), "hash_id": row.get("hash_id"), "stored_name": row.get("stored_name"), "percorso": row.get("percorso"), "relative_path": row.get("relative_path")})
-            continue
+    # Locating files is stat-bound: overlap the lookups (slow/network drives).
+    # Results keep the row order; the DB work below stays on this thread.
+    if len(records) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(records))) as pool:
+            found_paths = list(pool.map(_find_on_disk, records))
+    else:
+        found_paths = [_find_on_disk(rec) for rec in records]
+
+    def _outside_root(rec: _RecordFields) -> bool:
+        # Missing rows whose stored paths point outside root are prune candidates.
+        for value in (rec.percorso.strip(), rec.relative_path.strip()):
+            if value:
+                p = Path(value)
+                if p.is_absolute() and not _is_under_root(p):
+                    return True
+        return False
 
-        rel = _to_rel(found)
-        if not rel:
-            missing.append({"id": row.get("id"), "hash_id": row.get("hash_id"), "stored_name": row.get("stored_name"), "percorso": row.get("percorso"), "relative_path": row.get("relative_path"), "note": "found outside root"})
-            continue
+    def _plan_row_change(
+        rec: _RecordFields, found: Path, found_resolved: Path, rel: str
+    ) -> tuple[dict, dict] | None:
+        """Return (report payload, update fields) for a located row, or None if it is in sync."""
+        found_name = found.name
+        found_resolved_str = str(found_resolved)
+
+        # Cheap string comparisons first; the category/hash checks follow.
+        needs_update = (
+            rec.stored_name != found_name
+            or rec.nome_file != found_name
+            or rec.relative_path != rel
+            or rec.percorso != found_resolved_str
+        )
 
         inferred_category = _category_from_directory(found.parent)
+        if not needs_update and inferred_category and rec.categoria != inferred_category:
+            needs_update = True
+
+        found_stem = found.stem
         new_hash: str | None = None
-        if _is_hex_token(found.stem, length=SECTION_DOC_TOKEN_LENGTH):
-            new_hash = found.stem.lower()
-        elif _is_hex_token(found.stem, length=10):
+        if _is_hex_token(found_stem, length=SECTION_DOC_TOKEN_LENGTH):
+            new_hash = found_stem.lower()
+        elif _is_hex_token(found_stem, length=10):
             # keep legacy tokens if present
-            new_hash = found.stem.lower()
-
-        needs_update = False
-        if str(row.get("stored_name") or "") != found.name:
-            needs_update = True
-        if str(row.get("nome_file") or "") != found.name:
+            new_hash = found_stem.lower()
+        # Avoid collisions
+        if not needs_update and new_hash and rec.hash_key != new_hash and new_hash not in existing_hashes:
             needs_update = True
-        if str(row.get("relative_path") or "") != rel:
-            needs_update = True
-        if str(row.get("percorso") or "") != str(found.resolve()):
-            needs_update = True
-        if inferred_category and str(row.get("categoria") or "") != inferred_category:
-            needs_update = True
-        if new_hash and str(row.get("hash_id") or "").strip().lower() != new_hash:
-            # Avoid collisions
-            if new_hash not in existing_hashes or new_hash == str(row.get("hash_id") or "").strip().lower():
-                needs_update = True
 
         if not needs_update:
-            continue
+            return None
 
-        payload: dict = {
+        row = rec.row
+        payload = {
             "id": row.get("id"),
             "from": {
                 "hash_id": row.get("hash_id"),
@@ -1725,45 +2137,90 @@ def reindex_section_documents(
             },
             "to": {
                 "hash_id": new_hash or row.get("hash_id"),
-                "stored_name": found.name,
-                "nome_file": found.name,
+                "stored_name": found_name,
+                "nome_file": found_name,
                 "relative_path": rel,
-                "percorso": str(found.resolve()),
+                "percorso": found_resolved_str,
                 "categoria": inferred_category or row.get("categoria"),
             },
         }
-        updated.append(payload)
-        if dry_run:
+        fields = {
+            "hash_id": new_hash,
+            "stored_name": found_name,
+            "nome_file": found_name,
+            "relative_path": rel,
+            "percorso": found_resolved_str,
+            "categoria": inferred_category or None,
+        }
+        return payload, fields
+
+    # Pass 1 (no DB access): decide what to change. A dry run stops here.
+    to_prune: list[_RecordFields] = []
+    planned: list[tuple[_RecordFields, dict]] = []
+    for rec, found in zip(records, found_paths):
+        if not found:
+            if prune_missing and not dry_run:
+                try:
+                    if _outside_root(rec):
+                        to_prune.append(rec)
+                except Exception as exc:
+                    errors.append(f"prune_missing id={rec.id}: {exc}")
+            missing.append(rec.snapshot())
             continue
 
-        try:
-            update_section_document_record(
-                int(row["id"]),
-                hash_id=(new_hash if new_hash else None),
-                stored_name=found.name,
-                nome_file=found.name,
-                relative_path=rel,
-                percorso=str(found.resolve()),
-                categoria=(inferred_category if inferred_category else None),
-            )
-            if new_hash:
-                existing_hashes.add(new_hash)
-        except Exception as exc:
-            errors.append(f"id={row.get('id')}: {exc}")
+        found_resolved = found.resolve()
+        rel = _to_rel(found, resolved=found_resolved)
+        if not rel:
+            missing.append({**rec.snapshot(), "note": "found outside root"})
+            continue
+
+        change = _plan_row_change(rec, found, found_resolved, rel)
+        if change is None:
+            continue
+        payload, fields = change
+        updated.append(payload)
+        if fields["hash_id"]:
+            # Reserved for later rows in both modes, so a dry run plans what a real run does.
+            existing_hashes.add(fields["hash_id"])
+        planned.append((rec, fields))
+
+    # Pass 2: registry fixes share one transaction (errors are collected per row).
+    if not dry_run and (to_prune or planned):
+        with get_connection() as conn:
+            for rec in to_prune:
+                try:
+                    soft_delete_section_document_record(int(rec.id), conn=conn)
+                except Exception as exc:
+                    errors.append(f"prune_missing id={rec.id}: {exc}")
+            for rec, fields in planned:
+                try:
+                    update_section_document_record(int(rec.id), **fields, conn=conn)
+                except Exception as exc:
+                    errors.append(f"id={rec.id}: {exc}")
 
     imported: list[dict] = []
     if import_orphans:
         try:
-            tracked_rel = {str(r.get("relative_path") or "") for r in rows}
+            tracked_rel = {rec.relative_path for rec in records}
             for category in SECTION_DOCUMENT_CATEGORIES:
                 directory = _category_dir(category)
                 if not directory.exists():
                     continue
-                for path in directory.glob("*"):
-                    if not path.is_file() or path.name == SECTION_DOCUMENT_INDEX_FILENAME or path.name == "metadata.json":
+                with os.scandir(directory) as it:
+                    entries = [
+                        entry
+                        for entry in it
+                        if entry.name not in _RESERVED_NAMES and entry.is_file()
+                    ]
+                directory_category = _category_from_directory(directory)
+                for entry in entries:
+                    path = Path(entry.path)
+                    resolved = path.resolve()
+                    try:
+                        rel = resolved.relative_to(root).as_posix()
+                    except ValueError:
                         continue
-                    rel = _to_rel(path)
-                    if not rel or rel in tracked_rel:
+                    if rel in tracked_rel:
                         continue
                     tok = path.stem[:SECTION_DOC_TOKEN_LENGTH]
                     if not _is_hex_token(tok, length=SECTION_DOC_TOKEN_LENGTH):
@@ -1771,20 +2228,21 @@ def reindex_section_documents(
                     imported.append({"relative_path": rel, "stored_name": path.name})
                     if dry_run:
                         continue
+                    mtime_iso = datetime.fromtimestamp(entry.stat().st_mtime).isoformat()
                     add_section_document_record(
                         hash_id=tok,
                         nome_file=path.name,
-                        percorso=str(path.resolve()),
+                        percorso=str(resolved),
                         tipo="documento",
-                        data_caricamento=datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
-                        categoria=_category_from_directory(path.parent),
+                        data_caricamento=mtime_iso,
+                        categoria=directory_category,
                         descrizione="",
                         protocollo=None,
                         verbale_numero=None,
                         original_name=path.name,
                         stored_name=path.name,
                         relative_path=rel,
-                        uploaded_at=datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+                        uploaded_at=mtime_iso,
                     )
         except Exception as exc:
             errors.append(f"import_orphans failed: {exc}")
@@ -1792,7 +2250,7 @@ def reindex_section_documents(
     return {
         "root": str(root),
         "dry_run": bool(dry_run),
-        "scanned": len(rows),
+        "scanned": len(records),
         "updated": len(updated),
         "missing": len(missing),
         "imported": len(imported),
@@ -1803,7 +2261,17 @@ def reindex_section_documents(
 def rename_section_documents_to_schema(*, dry_run: bool = False) -> list[tuple[str, str]]:
     """Rename existing section documents to the SEZIONE_CATEGORIA_DATA schema."""
     ensure_section_structure()
-    tracked_paths: set[str] = set()
+    # Tracked files are identified by (st_dev, st_ino): immune to symlinks,
+    # casing and separator differences, and one stat instead of a resolve().
+    tracked_inodes: set[tuple[int, int]] = set()
+
+    def _track(path: Path | str) -> None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        tracked_inodes.add((st.st_dev, st.st_ino))
+
     try:
         from database import list_section_document_records
 
@@ -1814,24 +2282,33 @@ def rename_section_documents_to_schema(*, dry_run: bool = False) -> list[tuple[s
                 fallback_rel=str(row.get("relative_path") or ""),
             )
             if abs_path:
-                tracked_paths.add(str(abs_path.resolve()).lower())
+                _track(abs_path)
     except Exception:
         metadata = _load_metadata()
         for payload in metadata.values():
             rel = payload.get("relative_path")
             if not rel:
                 continue
-            tracked = (SECTION_DOCUMENT_ROOT / rel).resolve()
-            tracked_paths.add(str(tracked).lower())
+            _track(_root() / rel)
     changes: list[tuple[str, str]] = []
     for category in SECTION_DOCUMENT_CATEGORIES:
         directory = _category_dir(category)
-        for path in directory.glob("*"):
-            if not path.is_file():
+        try:
+            with os.scandir(directory) as it:
+                # Listed up front: files are renamed while iterating.
+                entries = [entry for entry in it if entry.is_file()]
+        except OSError:
+            continue
+        for entry in entries:
+            path = Path(entry.path)
+            # os.stat rather than entry.stat(): on Windows the cached DirEntry
+            # stat leaves st_dev/st_ino at zero.
+            try:
+                stat = os.stat(entry.path)
+            except OSError:
                 continue
-            if str(path.resolve()).lower() in tracked_paths:
+            if (stat.st_dev, stat.st_ino) in tracked_inodes:
                 continue
-            stat = path.stat()
             date_token = datetime.fromtimestamp(stat.st_mtime).strftime("%Y%m%d")
             base_name = _build_section_basename(category, date_token)
             new_name = _ensure_unique_filename(directory, base_name, path.suffix, path)
@@ -1844,22 +2321,27 @@ def rename_section_documents_to_schema(*, dry_run: bool = False) -> list[tuple[s
     return changes
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def human_readable_size(size_bytes: int) -> str:
     if size_bytes <= 0:
         return "0 B"
-    units = ["B", "KB", "MB", "GB", "TB"]
-    size = float(size_bytes)
-    unit = 0
-    while size >= 1024 and unit < len(units) - 1:
-        size /= 1024
-        unit += 1
-    return f"{size:.1f} {units[unit]}"
+    # The unit is the power of 1024 below the value: read it off the bit length.
+    unit = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit * 10)):.1f} {_SIZE_UNITS[unit]}"
+
+
+@lru_cache(maxsize=4096)
+def _format_mtime_minute(minute: int) -> str:
+    # Batch uploads share the same minute: the formatted text is memoized.
+    return datetime.fromtimestamp(minute * 60).strftime("%d/%m/%Y %H:%M")
 
 
 def human_readable_mtime(timestamp: float | int | None) -> str:
     if not timestamp:
         return "-"
     try:
-        return datetime.fromtimestamp(float(timestamp)).strftime("%d/%m/%Y %H:%M")
+        return _format_mtime_minute(int(float(timestamp) // 60))
     except Exception:
         return "-"
@@ -12,7 +12,9 @@ Design goals:
 
 from __future__ import annotations
 
+import sqlite3
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Mapping, Sequence
 
 
@@ -41,9 +43,15 @@ def _build_insert_sql(
     if not cols:
         return None
 
-    placeholders = ["?" for _ in cols]
-    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(placeholders)})"
-    return sql, vals
+    return _insert_sql(table, tuple(cols)), vals
+
+
+@lru_cache(maxsize=64)
+def _insert_sql(table: str, cols: tuple[str, ...]) -> str:
+    # Same column set -> identical SQL text, so sqlite3's per-connection
+    # statement cache reuses the prepared statement across rows.
+    placeholders = ", ".join("?" for _ in cols)
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
 
 
 def _build_update_sql(
@@ -72,6 +80,23 @@ def _build_update_sql(
     return sql, vals + list(where_params)
 
 
+def _fetch_one(sql: str, params: Sequence[Any], conn: sqlite3.Connection | None):
+    if conn is not None:
+        return conn.execute(sql, params).fetchone()
+    from database import fetch_one
+
+    return fetch_one(sql, params)
+
+
+def _execute(sql: str, params: Sequence[Any], conn: sqlite3.Connection | None) -> None:
+    if conn is not None:
+        conn.execute(sql, params)
+        return
+    from database import exec_query
+
+    exec_query(sql, params)
+
+
 @dataclass
 class UpsertResult:
     updated: int = 0
@@ -79,59 +104,204 @@ class UpsertResult:
     skipped: int = 0
 
 
-def fetch_socio_by_matricola(matricola: str):
+def fetch_socio_by_matricola(matricola: str, *, conn: sqlite3.Connection | None = None):
     """Return the full row for an existing socio by matricola, or None."""
-    from database import fetch_one
-
     matricola_s = (matricola or "").strip()
     if not matricola_s:
         return None
-    return fetch_one("SELECT * FROM soci WHERE matricola=?", (matricola_s,))
+    return _fetch_one("SELECT * FROM soci WHERE matricola=?", (matricola_s,), conn)
 
 
-def fetch_socio_id(*, matricola: str | None = None, nominativo: str | None = None):
+def fetch_socio_id(
+    *,
+    matricola: str | None = None,
+    nominativo: str | None = None,
+    conn: sqlite3.Connection | None = None,
+):
     """Return {'id': ...} row for an existing socio by matricola or nominativo, or None."""
-    from database import fetch_one
-
     if matricola is not None:
         m = str(matricola).strip()
         if m:
-            row = fetch_one("SELECT id FROM soci WHERE matricola=?", (m,))
+            row = _fetch_one("SELECT id FROM soci WHERE matricola=?", (m,), conn)
             if row:
                 return row
 
     if nominativo is not None:
         n = str(nominativo).strip()
         if n:
-            return fetch_one("SELECT id FROM soci WHERE LOWER(nominativo)=LOWER(?)", (n,))
+            return _fetch_one("SELECT id FROM soci WHERE LOWER(nominativo)=LOWER(?)", (n,), conn)
 
     return None
 
 
-def insert_socio(payload: Mapping[str, Any], *, write_enabled: bool = True) -> bool:
-    """Insert a new record into `soci`. Returns True if executed."""
-    from database import exec_query
+class SocioIdIndex:
+    """In-memory matricola/nominativo -> id lookup mirroring fetch_socio_id().
+
+    Loaded with a single query, so batch updates avoid one or two SELECTs per
+    CSV row. Keys inserted during the batch are resolved against the database
+    (their id is not known here) once mark_inserted() has been called.
+    """
+
+    def __init__(self, conn: sqlite3.Connection | None = None):
+        self._conn = conn
+        self._by_matricola: dict[str, int] = {}
+        self._by_nominativo: dict[str, int] = {}
+        self._inserted: set[tuple[str, str]] = set()
+        if conn is not None:
+            self._load(conn)
+        else:
+            from database import get_connection
+
+            with get_connection() as own_conn:
+                self._load(own_conn)
+
+    def _load(self, conn: sqlite3.Connection) -> None:
+        # Iterate the cursor: rows are consumed as they are stepped instead
+        # of materializing the whole soci table first.
+        cursor = conn.execute("SELECT id, matricola, nominativo FROM soci ORDER BY id")
+        for socio_id, matricola, nominativo in cursor:
+            if matricola is not None:
+                self._by_matricola.setdefault(str(matricola), socio_id)
+            if nominativo is not None:
+                self._by_nominativo.setdefault(str(nominativo).lower(), socio_id)
+
+    def lookup(self, *, matricola: str | None = None, nominativo: str | None = None):
+        """Return {'id': ...} for the matching socio, or None."""
+        m = str(matricola).strip() if matricola is not None else ""
+        n = str(nominativo).strip().lower() if nominativo is not None else ""
+        if m:
+            if m in self._by_matricola:
+                return {"id": self._by_matricola[m]}
+            if ("matricola", m) in self._inserted:
+                return fetch_socio_id(matricola=m, nominativo=nominativo, conn=self._conn)
+        if n:
+            if n in self._by_nominativo:
+                return {"id": self._by_nominativo[n]}
+            if ("nominativo", n) in self._inserted:
+                return fetch_socio_id(nominativo=nominativo, conn=self._conn)
+        return None
+
+    def mark_inserted(self, payload: Mapping[str, Any]) -> None:
+        """Record the identifiers of a row inserted after the index was loaded."""
+        m = payload.get("matricola")
+        n = payload.get("nominativo")
+        if _is_non_empty(m):
+            self._inserted.add(("matricola", str(m).strip()))
+        if _is_non_empty(n):
+            self._inserted.add(("nominativo", str(n).strip().lower()))
+
 
+def insert_socio(
+    payload: Mapping[str, Any],
+    *,
+    write_enabled: bool = True,
+    conn: sqlite3.Connection | None = None,
+) -> bool:
+    """Insert a new record into `soci`. Returns True if executed.
+
+    If ``conn`` is given the insert joins the caller's transaction.
+    """
     built = _build_insert_sql(table="soci", payload=payload)
     if not built:
         return False
 
     sql, params = built
     if write_enabled:
-        exec_query(sql, params)
+        _execute(sql, params, conn)
     return True
 
 
+# INSERT ... ON CONFLICT ... RETURNING needs SQLite 3.35+
+UPSERT_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def matricola_upsert_available(conn: sqlite3.Connection | None = None) -> bool:
+    """Return True if upsert_socio_by_matricola can run on this database.
+
+    Besides SQLite 3.35+, ON CONFLICT(matricola) needs a UNIQUE index on
+    `soci(matricola)`; init_db skips it when legacy data holds duplicates.
+    """
+    if not UPSERT_SUPPORTED:
+        return False
+
+    def _check(c: sqlite3.Connection) -> bool:
+        for index in c.execute("PRAGMA index_list(soci)").fetchall():
+            # (seq, name, unique, origin, partial)
+            if not index[2]:
+                continue
+            columns = [info[2] for info in c.execute(f"PRAGMA index_info('{index[1]}')").fetchall()]
+            if columns == ["matricola"]:
+                return True
+        return False
+
+    if conn is not None:
+        return _check(conn)
+    from database import get_connection
+
+    with get_connection() as own_conn:
+        return _check(own_conn)
+
+
+def upsert_socio_by_matricola(
+    payload: Mapping[str, Any],
+    *,
+    update_columns: Sequence[str],
+    only_empty: bool = False,
+    always_update: Sequence[str] = ("attivo",),
+    conn: sqlite3.Connection | None = None,
+) -> bool:
+    """Insert `payload` or update the socio with the same matricola in one statement.
+
+    On conflict only ``update_columns`` are written; with ``only_empty`` they
+    are written only where the stored value is NULL/blank (except the columns
+    in ``always_update``). Returns True if a row was inserted or updated; with
+    ``only_empty`` a duplicate with no blank column to fill counts as not
+    updated. Callers should check matricola_upsert_available() first.
+    """
+    if not _is_non_empty(payload.get("matricola")):
+        raise ValueError("upsert_socio_by_matricola richiede una matricola")
+
+    cols = [key for key, value in payload.items() if _is_non_empty(value)]
+    vals = [payload[key] for key in cols]
+
+    set_parts: list[str] = []
+    # only_empty: the update (and RETURNING row) happens only if some column
+    # is actually filled; columns in always_update are always written.
+    fill_conditions: list[str] | None = [] if only_empty else None
+    for col in update_columns:
+        if only_empty and col not in always_update:
+            is_blank = f"(soci.{col} IS NULL OR TRIM(soci.{col})='')"
+            set_parts.append(f"{col}=CASE WHEN {is_blank} THEN excluded.{col} ELSE soci.{col} END")
+            if fill_conditions is not None:
+                fill_conditions.append(is_blank)
+        else:
+            set_parts.append(f"{col}=excluded.{col}")
+            fill_conditions = None
+    action = f"DO UPDATE SET {', '.join(set_parts)}" if set_parts else "DO NOTHING"
+    if set_parts and fill_conditions:
+        action += f" WHERE {' OR '.join(fill_conditions)}"
+
+    sql = (
+        f"INSERT INTO soci ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)}) "
+        f"ON CONFLICT(matricola) WHERE matricola IS NOT NULL {action} RETURNING id"
+    )
+    if conn is not None:
+        return conn.execute(sql, vals).fetchone() is not None
+    from database import get_connection
+
+    with get_connection() as own_conn:
+        return own_conn.execute(sql, vals).fetchone() is not None
+
+
 def update_socio_by_matricola(
     *,
     matricola: str,
     updates: Mapping[str, Any],
     write_enabled: bool = True,
     keep_empty_strings: bool = False,
+    conn: sqlite3.Connection | None = None,
 ) -> bool:
     """Update an existing record in `soci` matched by matricola. Returns True if executed."""
-    from database import exec_query
-
     m = (matricola or "").strip()
     if not m:
         return False
@@ -148,20 +318,71 @@ def update_socio_by_matricola(
 
     sql, params = built
     if write_enabled:
-        exec_query(sql, params)
+        _execute(sql, params, conn)
     return True
 
 
+# UPDATE ... FROM needs SQLite 3.33+
+_UPDATE_FROM_SUPPORTED = sqlite3.sqlite_version_info >= (3, 33, 0)
+
+
+def apply_socio_updates(
+    updates_by_id: Mapping[int, Mapping[str, Any]],
+    *,
+    conn: sqlite3.Connection | None = None,
+) -> int:
+    """Apply per-socio column updates with one set-based UPDATE.
+
+    The updates are staged in a temp table; NULL/blank staged values leave
+    the stored column untouched (same as update_socio_by_id with
+    keep_empty_strings=False). Returns the number of staged soci.
+    """
+    if not updates_by_id:
+        return 0
+    columns = sorted({col for updates in updates_by_id.values() for col in updates})
+    staged = [
+        (socio_id, *((None if not _is_non_empty(updates.get(col)) else updates[col]) for col in columns))
+        for socio_id, updates in updates_by_id.items()
+    ]
+    if _UPDATE_FROM_SUPPORTED:
+        set_sql = ", ".join(f"{col}=COALESCE(s.{col}, soci.{col})" for col in columns)
+        update_sql = f"UPDATE soci SET {set_sql} FROM temp.soci_update_stage AS s WHERE soci.id = s.id"
+    else:
+        set_sql = ", ".join(
+            f"{col}=COALESCE((SELECT s.{col} FROM temp.soci_update_stage AS s WHERE s.id = soci.id), {col})"
+            for col in columns
+        )
+        update_sql = f"UPDATE soci SET {set_sql} WHERE id IN (SELECT id FROM temp.soci_update_stage)"
+
+    def _apply(c: sqlite3.Connection) -> None:
+        c.execute("DROP TABLE IF EXISTS temp.soci_update_stage")
+        c.execute(f"CREATE TEMP TABLE soci_update_stage (id INTEGER PRIMARY KEY, {', '.join(columns)})")
+        try:
+            placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+            c.executemany(f"INSERT INTO temp.soci_update_stage VALUES ({placeholders})", staged)
+            c.execute(update_sql)
+        finally:
+            c.execute("DROP TABLE IF EXISTS temp.soci_update_stage")
+
+    if conn is not None:
+        _apply(conn)
+    else:
+        from database import get_connection
+
+        with get_connection() as own_conn:
+            _apply(own_conn)
+    return len(staged)
+
+
 def update_socio_by_id(
     *,
     socio_id: int,
     updates: Mapping[str, Any],
     write_enabled: bool = True,
     keep_empty_strings: bool = False,
+    conn: sqlite3.Connection | None = None,
 ) -> bool:
     """Update an existing record in `soci` matched by id. Returns True if executed."""
-    from database import exec_query
-
     if socio_id is None:
         return False
 
@@ -177,5 +398,5 @@ def update_socio_by_id(
 
     sql, params = built
     if write_enabled:
-        exec_query(sql, params)
+        _execute(sql, params, conn)
     return True
@@ -13,6 +13,9 @@ from pathlib import Path
 
 logger = logging.getLogger("librosoci")
 
+# src/templates, resolved once at import
+_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
 # Template types
 TEMPLATE_TYPES = {
     'convocazione_cd': 'Convocazione Consiglio Direttivo',
@@ -25,10 +28,8 @@ TEMPLATE_TYPES = {
 def get_templates_dir() -> str:
     """Get templates directory path."""
     # Use src/templates directory
-    base_dir = Path(__file__).parent
-    templates_dir = base_dir / "templates"
-    templates_dir.mkdir(exist_ok=True)
-    return str(templates_dir)
+    _TEMPLATES_DIR.mkdir(exist_ok=True)
+    return str(_TEMPLATES_DIR)
 
 def init_templates_table(conn=None):
     """Initialize templates table in database.
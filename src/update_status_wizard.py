@@ -482,7 +482,7 @@ class UpdateStatusWizard:
         """Execute the status update"""
         try:
             from database import fetch_one, get_db_path
-            from soci_import_engine import fetch_socio_id, insert_socio, update_socio_by_id
+            from soci_import_engine import SocioIdIndex, apply_socio_updates, insert_socio
             from utils import to_bool01
 
             dry_run = bool(self.dry_run_var.get())
@@ -509,6 +509,13 @@ class UpdateStatusWizard:
             col_q1 = self.mapping.get('q1')
             col_q2 = self.mapping.get('q2')
 
+            # All rows share the CSV header: resolve case-insensitive column
+            # names once instead of scanning the keys of every row.
+            header_keys = list(self.headers or []) or list(rows[0].keys() if isinstance(rows[0], dict) else [])
+            keys_by_lower: dict[str, str] = {}
+            for k in header_keys:
+                keys_by_lower.setdefault(str(k).lower(), k)
+
             def _csv_get(r: dict, key: str):
                 if not isinstance(r, dict):
                     return None
@@ -516,14 +523,8 @@ class UpdateStatusWizard:
                 if key in r:
                     return r.get(key)
                 # case-insensitive fallback
-                k_low = key.lower()
-                for k in r.keys():
-                    try:
-                        if str(k).lower() == k_low:
-                            return r.get(k)
-                    except Exception:
-                        continue
-                return None
+                actual = keys_by_lower.get(key.lower())
+                return r.get(actual) if actual is not None else None
 
             def _get_by_col(r: dict, colname: str | None):
                 if not colname:
@@ -605,6 +606,15 @@ class UpdateStatusWizard:
 
                 return payload
 
+            # Existing soci are looked up in memory instead of 1-2 queries per row
+            socio_index = SocioIdIndex()
+            # Status updates are collected per socio and written at the end with
+            # one set-based UPDATE. Later rows win per column, but only with
+            # non-empty values: blanks are never written, so they must not
+            # replace a value staged by an earlier row.
+            staged_updates: dict[int, dict] = {}
+            staged_rows = 0
+
             for i, row in enumerate(rows):
                 # Update progress
                 self.progress["value"] = i
@@ -616,7 +626,7 @@ class UpdateStatusWizard:
                     matricola = _get_by_col(row, col_matricola) if col_matricola else _csv_get(row, 'matricola')
                     nominativo = _get_by_col(row, col_nominativo) if col_nominativo else _csv_get(row, 'callsign')
 
-                    existing = fetch_socio_id(matricola=matricola, nominativo=nominativo)
+                    existing = socio_index.lookup(matricola=matricola, nominativo=nominativo)
 
                     # Values to update
                     voto_val = _get_by_col(row, col_voto)
@@ -651,7 +661,8 @@ class UpdateStatusWizard:
                                 q2_val=q2_val,
                                 voto_val=voto_val,
                             )
-                            insert_socio(payload, write_enabled=write_enabled)
+                            if insert_socio(payload, write_enabled=write_enabled) and write_enabled:
+                                socio_index.mark_inserted(payload)
                             self.inserted_count += 1
                         except Exception as ins_exc:
                             logger.error(f"Error inserting row {i}: {ins_exc}")
@@ -674,13 +685,13 @@ class UpdateStatusWizard:
                         updates["q2"] = q2_val
 
                     if updates:
-                        update_socio_by_id(
-                            socio_id=existing['id'],
-                            updates=updates,
-                            write_enabled=write_enabled,
-                            # Keep current behavior: empty strings are not written.
-                            keep_empty_strings=False,
-                        )
+                        if write_enabled:
+                            staged = staged_updates.setdefault(existing['id'], {})
+                            for col, value in updates.items():
+                                if value is None or (isinstance(value, str) and not value.strip()):
+                                    continue
+                                staged[col] = value
+                            staged_rows += 1
                         self.update_count += 1
                     else:
                         self.skipped_count += 1
@@ -690,6 +701,17 @@ class UpdateStatusWizard:
                     self.skipped_count += 1
                     continue
             
+            apply_error = None
+            try:
+                # Soci whose rows carried only blank values have nothing to write.
+                apply_socio_updates({socio_id: cols for socio_id, cols in staged_updates.items() if cols})
+            except Exception as exc:
+                # The set-based UPDATE is all-or-nothing: no staged row was written.
+                logger.error(f"Error applying staged updates: {exc}")
+                apply_error = exc
+                self.update_count -= staged_rows
+                self.skipped_count += staged_rows
+
             # Complete
             self.progress["value"] = total
             self.progress_text.config(text=f"Completato! {self.update_count} aggiornati, {self.inserted_count} inseriti, {self.skipped_count} saltati")
@@ -700,6 +722,8 @@ class UpdateStatusWizard:
             msg += f"Nuovi soci inseriti: {self.inserted_count}\n"
             if self.skipped_count > 0:
                 msg += f"Soci saltati (non trovati / errori): {self.skipped_count}"
+            if apply_error is not None:
+                msg += f"\n\nErrore: aggiornamenti Quote/Voto non salvati:\n{apply_error}"
 
             # Diagnostic: DB path + record counts (helps when UI shows few records due to different DB)
             try:
@@ -710,7 +734,10 @@ class UpdateStatusWizard:
             except Exception:
                 pass
 
-            messagebox.showinfo(msg_title, msg)
+            if apply_error is not None:
+                messagebox.showerror(msg_title, msg)
+            else:
+                messagebox.showinfo(msg_title, msg)
 
             # In dry-run non chiamiamo callback e non chiudiamo automaticamente
             if not dry_run:
@@ -99,6 +99,13 @@ def isempty(v) -> bool:
     """Check if a value is empty (None or blank string)."""
     return v is None or (isinstance(v, str) and v.strip() == "")
 
+# Lower-cased tokens understood by to_bool01
+_BOOL01_TOKENS = {
+    **dict.fromkeys(("si", "sì", "yes", "y", "true", "vero", "on", "x", "s", "ok", "v", "t", "1"), 1),
+    **dict.fromkeys(("no", "n", "false", "falso", "off", "0"), 0),
+}
+
+
 def to_bool01(val) -> Optional[int]:
     """
     Convert value to 0/1 (False/True).
@@ -111,12 +118,9 @@ def to_bool01(val) -> Optional[int]:
     s = str(val).strip().lower()
     if s == "":
         return None
-    truth = {"si", "sì", "yes", "y", "true", "vero", "on", "x", "s", "ok", "v", "t", "1"}
-    falsy = {"no", "n", "false", "falso", "off", "0"}
-    if s in truth:
-        return 1
-    if s in falsy:
-        return 0
+    flag = _BOOL01_TOKENS.get(s)
+    if flag is not None:
+        return flag
     try:
         return 1 if int(float(s)) != 0 else 0
     except Exception:
@@ -175,28 +175,28 @@ class ExportDialog(tk.Toplevel):
             
             # Write CSV
             with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=selected_fields)
-                writer.writeheader()
+                writer = csv.writer(f)
+                writer.writerow(selected_fields)
 
                 for row in rows:
-                    out_row = {}
+                    out_row = []
                     for field in selected_fields:
                         val = row[field]
                         # If field is None or empty, write empty string
                         if val is None or (isinstance(val, str) and val == ''):
-                            out_row[field] = ''
+                            out_row.append('')
                             continue
 
                         # Map boolean-like fields to Si/No
                         if field in ('attivo', 'voto'):
                             try:
                                 ival = int(val)
-                                out_row[field] = 'Si' if ival == 1 else 'No' if ival == 0 else str(val)
+                                out_row.append('Si' if ival == 1 else 'No' if ival == 0 else str(val))
                             except Exception:
                                 # Fallback: truthy -> Si, falsy -> No
-                                out_row[field] = 'Si' if val else 'No'
+                                out_row.append('Si' if val else 'No')
                         else:
-                            out_row[field] = val
+                            out_row.append(val)
 
                     writer.writerow(out_row)
             
@@ -158,7 +158,7 @@ class LoadingWindow:
             elapsed = time.perf_counter() - self._shown_at
             remaining = self._min_duration - elapsed
             if remaining > 0:
-                time.sleep(remaining)
+                self._wait(remaining)
         try:
             self._cancel_log_pump()
             if self._attached_logger and self._log_handler:
@@ -170,6 +170,18 @@ class LoadingWindow:
             self._root = None
             self._log_handler = None
 
+    def _wait(self, seconds: float):
+        """Wait while keeping the Tk event loop alive (repaints, log feed)."""
+        root = self._root
+        if root is None:
+            return
+        try:
+            done = tk.BooleanVar(master=root, value=False)
+            root.after(max(1, int(seconds * 1000)), lambda: done.set(True))
+            root.wait_variable(done)
+        except tk.TclError:
+            time.sleep(seconds)
+
     def _attach_logger(self, logger_obj: logging.Logger | None):
         if logger_obj is None:
             return
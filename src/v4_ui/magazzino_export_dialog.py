@@ -208,10 +208,10 @@ class MagazzinoExportDialog(tk.Toplevel):
 
     def _export_csv(self, path: str, fields: list[str], rows: list[dict]) -> None:
         with open(path, "w", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=fields, delimiter=";")
-            writer.writeheader()
-            for item in rows:
-                writer.writerow({key: self._extract_field(key, item) for key in fields})
+            writer = csv.writer(handle, delimiter=";")
+            writer.writerow(fields)
+            extract = self._extract_field
+            writer.writerows([extract(key, item) for key in fields] for item in rows)
 
     def _export_xlsx(self, path: str, fields: list[str], rows: list[dict]) -> None:
         try:
@@ -22,6 +22,13 @@ from startup_checks import StartupIssue, format_startup_issues
 
 logger = logging.getLogger("librosoci")
 
+# Source layout: repo root is two levels above v4_ui/ (None when the install
+# path is too shallow for that layout; lookups then skip this candidate)
+try:
+    _REPO_ROOT = Path(__file__).resolve().parents[2]
+except Exception:
+    _REPO_ROOT = None
+
 __all__ = ["App"]
 
 TreeviewAnchor = Literal["nw", "n", "ne", "w", "center", "e", "sw", "s", "se"]
@@ -153,11 +160,8 @@ class App:
     def _read_betatest_guide_text(self) -> str:
         """Load the betatest guide markdown as plain text (best-effort)."""
         candidates: list[Path] = []
-        try:
-            # Source layout: repo root is two levels above v4_ui/
-            candidates.append(Path(__file__).resolve().parents[2] / "docs" / "BETATEST_GUIDE.md")
-        except Exception:
-            pass
+        if _REPO_ROOT is not None:
+            candidates.append(_REPO_ROOT / "docs" / "BETATEST_GUIDE.md")
 
         try:
             if getattr(sys, "frozen", False):
@@ -622,7 +626,7 @@ class App:
 
     def _open_help(self):
         """Apri il file HELP.md con il visualizzatore di default."""
-        help_path = Path(__file__).resolve().parents[2] / "HELP.md"
+        help_path = _REPO_ROOT / "HELP.md" if _REPO_ROOT is not None else Path("HELP.md")
         if not help_path.exists():
             messagebox.showerror("Aiuto", f"File HELP non trovato:\n{help_path}")
             return
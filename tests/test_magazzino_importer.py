@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Tests for magazzino_importer module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from magazzino_importer import (
+    InventoryImportError,
+    apply_mapping,
+    auto_detect_mapping,
+    normalize_inventory_code,
+    read_source_file,
+    sniff_delimiter,
+)
+
+
+class TestMagazzinoImporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="magazzino_import_")
+
+    def tearDown(self):
+        try:
+            shutil.rmtree(self.tmp_dir)
+        except Exception:
+            pass
+
+    def _write(self, name: str, text: str, encoding: str = "utf-8") -> str:
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "w", encoding=encoding, newline="") as handle:
+            handle.write(text)
+        return path
+
+    def test_read_csv_detects_delimiter_and_header_row(self):
+        path = self._write(
+            "inventario.csv",
+            "Inventario sezione;;\r\n"
+            "N. INV;Descrizione;Ubicazione\r\n"
+            "inv-001;Radio HF;Scaffale A\r\n"
+            ";;\r\n"
+            "INV-002; Antenna ;\r\n",
+            encoding="utf-8-sig",
+        )
+        self.assertEqual(sniff_delimiter(path), ";")
+
+        headers, rows = read_source_file(path)
+
+        self.assertEqual(headers, ["N. INV", "Descrizione", "Ubicazione"])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["N. INV"], "inv-001")
+        self.assertEqual(rows[1]["Descrizione"], "Antenna")
+        self.assertIsNone(rows[1]["Ubicazione"])
+
+    def test_read_csv_with_explicit_delimiter(self):
+        path = self._write("inventario.csv", "Numero,Marca\nA1,Yaesu\n")
+        headers, rows = read_source_file(path, delimiter=",")
+        self.assertEqual(headers, ["Numero", "Marca"])
+        self.assertEqual(rows, [{"Numero": "A1", "Marca": "Yaesu"}])
+
+    def test_read_empty_csv_raises(self):
+        path = self._write("vuoto.csv", "")
+        with self.assertRaises(InventoryImportError):
+            read_source_file(path)
+
+    def test_auto_detect_and_apply_mapping(self):
+        headers = ["N. INV", "Descrizione", "Marca", "Qtà", "Colonna extra"]
+        mapping = auto_detect_mapping(headers)
+
+        self.assertEqual(mapping["numero_inventario"], "N. INV")
+        self.assertEqual(mapping["descrizione"], "Descrizione")
+        self.assertEqual(mapping["marca"], "Marca")
+        self.assertEqual(mapping["quantita"], "Qtà")
+        self.assertIsNone(mapping["modello"])
+
+        rows = [{"N. INV": " A1 ", "Descrizione": "Radio", "Marca": None, "Qtà": "2"}]
+        mapped = apply_mapping(rows, mapping)
+        self.assertEqual(mapped[0]["numero_inventario"], "A1")
+        self.assertEqual(mapped[0]["descrizione"], "Radio")
+        self.assertIsNone(mapped[0]["marca"])
+        self.assertIsNone(mapped[0]["modello"])
+
+    def test_normalize_inventory_code(self):
+        self.assertEqual(normalize_inventory_code(" inv-0042 "), "INV-0042")
+        self.assertEqual(normalize_inventory_code(42), "42")
+        self.assertIsNone(normalize_inventory_code("   "))
+        self.assertIsNone(normalize_inventory_code(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,11 @@
 """Tests for magazzino_manager module."""
 
 import os
+import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
@@ -91,12 +93,36 @@ class TestMagazzinoManager(unittest.TestCase):
         self.assertEqual(len(loans), 1)
         with self.assertRaises(ValueError):
             create_loan(self.item_id, socio_id=self.socio_id)
+        listed = list_items()[0]
+        self.assertEqual(listed["active_loan_id"], loan_id)
+        self.assertEqual(listed["active_socio_id"], self.socio_id)
+        self.assertEqual(listed["active_socio_cognome"], "Rossi")
         register_return(loan_id)
         active_after = get_active_loan(self.item_id)
         self.assertIsNone(active_after)
+        self.assertIsNone(list_items()[0]["active_loan_id"])
         loans = list_loans(self.item_id)
         self.assertEqual(loans[0]["data_reso"], today_iso())
 
+    def test_open_loan_unique_per_item(self):
+        create_loan(self.item_id, socio_id=self.socio_id)
+        with self.assertRaises(sqlite3.IntegrityError):
+            with get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO magazzino_loans (item_id, socio_id, data_prestito, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.item_id, self.socio_id, today_iso(), today_iso(), today_iso()),
+                )
+
+    def test_create_loan_maps_unique_violation_to_value_error(self):
+        create_loan(self.item_id, socio_id=self.socio_id)
+        # Simulate a concurrent insert that slipped past the active-loan probe.
+        with mock.patch("magazzino_manager._has_active_loan", return_value=False):
+            with self.assertRaises(ValueError) as ctx:
+                create_loan(self.item_id, socio_id=self.socio_id)
+        self.assertIsInstance(ctx.exception.__cause__, sqlite3.IntegrityError)
+        self.assertEqual(len(list_loans(self.item_id)), 1)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
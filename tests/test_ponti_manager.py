@@ -16,6 +16,7 @@ from ponti_manager import (
     delete_authorization,
     delete_ponte,
     delete_ponte_document,
+    delete_ponte_documents,
     get_ponte,
     list_authorizations,
     list_ponte_documents,
@@ -210,6 +211,21 @@ class TestPontiManager(unittest.TestCase):
         self.assertEqual(len(list_ponte_documents(self.ponte_id)), 0)
         self.assertFalse(stored_path.exists())
 
+    def test_delete_documents_bulk(self):
+        doc_ids = [
+            add_ponte_document(self.ponte_id, self._create_source_file(), tipo="foto")
+            for _ in range(3)
+        ]
+        stored = [Path(doc["document_path"]) for doc in list_ponte_documents(self.ponte_id)]
+        self.assertTrue(all(p.exists() for p in stored))
+
+        deleted = delete_ponte_documents(doc_ids[:2] + [999999])
+        self.assertEqual(deleted, 2)
+        remaining = list_ponte_documents(self.ponte_id)
+        self.assertEqual([doc["id"] for doc in remaining], [doc_ids[2]])
+        self.assertEqual(sum(p.exists() for p in stored), 1)
+        self.assertEqual(delete_ponte_documents([]), 0)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
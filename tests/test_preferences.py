@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Tests for preferences helpers and the cached config loader."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import config_manager
+from preferences import get_role_options, save_custom_role_options
+
+
+class TestPreferences(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="glr_prefs_")
+        self.config_path = os.path.join(self.tmp_dir, "config.json")
+        config_manager.set_config_paths(self.config_path, self.tmp_dir, {"custom_role_options": []}, [])
+        config_manager.invalidate_config_cache()
+
+    def tearDown(self):
+        config_manager.invalidate_config_cache()
+        try:
+            shutil.rmtree(self.tmp_dir)
+        except Exception:
+            pass
+
+    def test_cached_config_is_reused_until_file_changes(self):
+        with open(self.config_path, "w", encoding="utf-8") as handle:
+            json.dump({"custom_role_options": ["Custode"]}, handle)
+
+        first = config_manager.load_config_cached()
+        self.assertIs(config_manager.load_config_cached(), first)
+        self.assertIn("Custode", get_role_options())
+
+        with open(self.config_path, "w", encoding="utf-8") as handle:
+            json.dump({"custom_role_options": ["Archivista"]}, handle)
+        os.utime(self.config_path, ns=(0, os.stat(self.config_path).st_mtime_ns + 1_000_000))
+
+        self.assertIn("Archivista", get_role_options())
+
+    def test_save_invalidates_cache(self):
+        self.assertNotIn("Custode", get_role_options())
+        save_custom_role_options(["Custode", "Socio", ""])
+        options = get_role_options()
+        self.assertIn("Custode", options)
+        self.assertEqual(options.count("Socio"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
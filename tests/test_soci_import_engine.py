@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Tests for soci_import_engine helpers."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import database
+from soci_import_engine import (
+    UPSERT_SUPPORTED,
+    SocioIdIndex,
+    apply_socio_updates,
+    fetch_socio_by_matricola,
+    fetch_socio_id,
+    insert_socio,
+    matricola_upsert_available,
+    upsert_socio_by_matricola,
+)
+
+
+class _TempDbTestCase(unittest.TestCase):
+    """Fresh temporary database for each test."""
+
+    def setUp(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+        self.temp_db.close()
+        self.db_path = self.temp_db.name
+        database.set_db_path(self.db_path)
+        database.init_db()
+
+    def tearDown(self):
+        try:
+            os.unlink(self.db_path)
+        except Exception:
+            pass
+
+
+class TestSocioIdIndex(_TempDbTestCase):
+    def setUp(self):
+        super().setUp()
+        insert_socio({"matricola": "100", "nominativo": "IU2AAA", "nome": "Mario", "cognome": "Rossi"})
+        insert_socio({"nominativo": "iu2bbb", "nome": "Anna", "cognome": "Bianchi"})
+
+    def test_lookup_matches_fetch_socio_id(self):
+        index = SocioIdIndex()
+        cases = [
+            ("100", None),
+            (" 100 ", "IU2ZZZ"),
+            ("999", "IU2BBB"),
+            (None, "iu2aaa"),
+            ("999", None),
+            (None, None),
+        ]
+        for matricola, nominativo in cases:
+            expected = fetch_socio_id(matricola=matricola, nominativo=nominativo)
+            found = index.lookup(matricola=matricola, nominativo=nominativo)
+            self.assertEqual(
+                found["id"] if found else None,
+                expected["id"] if expected else None,
+                (matricola, nominativo),
+            )
+
+    def test_rows_inserted_after_loading_are_found(self):
+        index = SocioIdIndex()
+        payload = {"matricola": "200", "nominativo": "IU2CCC", "nome": "Luca", "cognome": "Verdi"}
+        self.assertIsNone(index.lookup(matricola="200"))
+        insert_socio(payload)
+        index.mark_inserted(payload)
+        self.assertIsNotNone(index.lookup(matricola="200"))
+        self.assertIsNotNone(index.lookup(nominativo="iu2ccc"))
+
+    def test_apply_socio_updates_skips_empty_values(self):
+        mario = fetch_socio_id(matricola="100")["id"]
+        anna = fetch_socio_id(nominativo="IU2BBB")["id"]
+        database.exec_query("UPDATE soci SET q0 = 'AA' WHERE id = ?", (anna,))
+
+        staged = apply_socio_updates({mario: {"voto": 1, "q0": "B1"}, anna: {"voto": 0, "q0": ""}})
+
+        self.assertEqual(staged, 2)
+        rows = {r["id"]: r for r in database.fetch_all("SELECT id, voto, q0 FROM soci")}
+        self.assertEqual((rows[mario]["voto"], rows[mario]["q0"]), (1, "B1"))
+        self.assertEqual((rows[anna]["voto"], rows[anna]["q0"]), (0, "AA"))
+
+
+@unittest.skipUnless(UPSERT_SUPPORTED, "SQLite < 3.35")
+class TestUpsertSocio(_TempDbTestCase):
+    def setUp(self):
+        super().setUp()
+        insert_socio({"matricola": "100", "nome": "Mario", "cognome": "Rossi", "email": "old@example.com", "attivo": 0})
+
+    def test_inserts_new_matricola(self):
+        payload = {"matricola": "200", "nome": "Luca", "cognome": "Verdi"}
+        self.assertTrue(upsert_socio_by_matricola(payload, update_columns=["nome"]))
+        self.assertEqual(fetch_socio_by_matricola("200")["nome"], "Luca")
+
+    def test_only_empty_keeps_filled_values(self):
+        payload = {"matricola": "100", "nome": "Mario", "cognome": "Rossi", "email": "new@example.com",
+                   "telefono": "123", "attivo": 1}
+        updated = upsert_socio_by_matricola(
+            payload, update_columns=["email", "telefono", "attivo"], only_empty=True
+        )
+        self.assertTrue(updated)
+        row = fetch_socio_by_matricola("100")
+        self.assertEqual(row["email"], "old@example.com")
+        self.assertEqual(row["telefono"], "123")
+        self.assertEqual(row["attivo"], 1)
+
+    def test_overwrite_and_no_columns(self):
+        payload = {"matricola": "100", "nome": "Mario", "cognome": "Rossi", "email": "new@example.com"}
+        self.assertTrue(upsert_socio_by_matricola(payload, update_columns=["email"]))
+        self.assertEqual(fetch_socio_by_matricola("100")["email"], "new@example.com")
+        self.assertFalse(upsert_socio_by_matricola(payload, update_columns=[]))
+
+    def test_only_empty_without_blank_columns_is_not_counted(self):
+        payload = {"matricola": "100", "nome": "Mario", "cognome": "Rossi", "email": "new@example.com"}
+        self.assertFalse(upsert_socio_by_matricola(payload, update_columns=["email"], only_empty=True))
+        self.assertEqual(fetch_socio_by_matricola("100")["email"], "old@example.com")
+
+    def test_upsert_needs_matricola_index(self):
+        self.assertTrue(matricola_upsert_available())
+        database.exec_query("DROP INDEX ux_soci_matricola")
+        self.assertFalse(matricola_upsert_available())
+
+
+if __name__ == "__main__":
+    unittest.main()